@@ -1 +1 @@
-from .v1 import resume_router, jobs_router 
\ No newline at end of file
+from .v1 import resume_router, jobs_router, metrics_router 
\ No newline at end of file
@@ -1,2 +1,3 @@
 from .resume import router as resume_router
-from .jobs import router as jobs_router 
\ No newline at end of file
+from .jobs import router as jobs_router
+from .metrics import router as metrics_router 
\ No newline at end of file
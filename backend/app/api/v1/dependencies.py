@@ -0,0 +1,39 @@
+import uuid
+from typing import Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.messages import ERROR_MESSAGES
+from app.database import get_async_db
+from app.services import session_service
+
+
+async def _session_ids(request: Request) -> Tuple[Optional[str], Optional[str]]:
+    """user_id and session_id from the path, the query string or, for JSON requests, the body."""
+    user_id = request.path_params.get("user_id") or request.query_params.get("user_id")
+    session_id = request.path_params.get("session_id") or request.query_params.get("session_id")
+    if (user_id is None or session_id is None) and request.method in ("POST", "PUT", "PATCH"):
+        try:
+            # FastAPI has already read the body for the endpoint, so this reuses the parsed JSON
+            body = await request.json()
+        except ValueError:
+            body = None
+        if isinstance(body, dict):
+            user_id = user_id or body.get("user_id")
+            session_id = session_id or body.get("session_id")
+    return user_id, session_id
+
+
+async def require_valid_session(request: Request, db: AsyncSession = Depends(get_async_db)) -> uuid.UUID:
+    """
+    FastAPI dependency that rejects requests without a valid session with a 400.
+    Reads user_id and session_id wherever the endpoint takes them and returns the session id.
+    """
+    user_id, session_id = await _session_ids(request)
+    try:
+        if user_id and session_id and await session_service.session_validator.avalidate(db, user_id, session_id):
+            return uuid.UUID(str(session_id))
+    except ValueError:
+        pass
+    raise HTTPException(status_code=400, detail=ERROR_MESSAGES.INVALID_OR_EXPIRED_SESSION)
@@ -1,76 +1,94 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.services.job_service import get_jobs_service, get_job_service, create_job_service, Job
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.database import get_async_db, arelease_connection, AsyncSessionLocal
+from app.services.job_service import parse_job_fields, decode_cursor, stream_jobs_page, aget_job, search_stored_jobs
 from app.schemas import ErrorResponse
-from fastapi.responses import JSONResponse
+from app.schemas.job_schema import JobPageResponse, JobSearchResultsResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from app.constants.messages import ERROR_MESSAGES
 from app.services.job_search_service import JobSearchService
-from app.models import SessionIdTable, UserDetails
-from datetime import datetime, UTC
+from app.models import UserDetails
+import asyncio
 import uuid
 import logging
 from app.schemas.resume import JobSearchRequest, JobResponse, JobSearchResponse
 from app.services.job_llm_service import JobLLMService
+from app.services.job_match_service import JobMatchService
+from app.api.v1.dependencies import require_valid_session
 logger = logging.getLogger('custom_logger')
 router = APIRouter()
 
-# --- Pydantic Model for Mock/Example Purposes ---
-class Job(BaseModel):
-    id: int
-    title: str
-    company: str
-    location: str
-    description: str
-    salary: Optional[str] = None
-
-# Mock database (for demonstration; replace with real DB logic as needed)
-jobs_db = []
-
-@router.get("/jobs", response_model=List[Job], responses={500: {"model": ErrorResponse}})
-def get_jobs(db: Session = Depends(get_db)):
+@router.get("/jobs", response_model=JobPageResponse, responses={400: {"model": ErrorResponse}})
+async def get_jobs(
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.JOBS_PAGE_SIZE, ge=1, le=settings.JOBS_PAGE_MAX),
+    fields: Optional[str] = None,
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    country: Optional[str] = None,
+    cmp_name: Optional[str] = None,
+    job_title: Optional[str] = None
+):
+    """
+    Stored jobs, newest posted first, one page at a time. Follow next_cursor for the next page;
+    filters match exact values. Pass fields (comma-separated) to return only those columns.
+    """
     try:
-        return get_jobs_service(db)
-    except Exception as e:
-        return JSONResponse(status_code=500, content=ErrorResponse(detail=str(e)).model_dump())
+        requested = parse_job_fields(fields)
+        decode_cursor(cursor)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content=ErrorResponse(detail=str(e)).model_dump())
+    filters = {"city": city, "state": state, "country": country, "cmp_name": cmp_name, "job_title": job_title}
+    return StreamingResponse(stream_jobs_page(AsyncSessionLocal, requested, filters, limit, cursor),
+                             media_type="application/json")
 
-@router.get("/jobs/{job_id}", response_model=Job, responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}})
-def get_job(job_id: int, db: Session = Depends(get_db)):
+@router.get("/jobs/search", response_model=JobSearchResultsResponse, responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}})
+async def search_local_jobs(
+    q: str,
+    limit: int = Query(settings.JOBS_SEARCH_LIMIT, ge=1, le=settings.JOBS_SEARCH_MAX),
+    fields: Optional[str] = None,
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    country: Optional[str] = None,
+    cmp_name: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Ranked keyword search over the title, qualifications and description of jobs already harvested,
+    best match first. Filters and fields work as on /jobs.
+    """
     try:
-        return get_job_service(job_id, db)
+        filters = {"city": city, "state": state, "country": country, "cmp_name": cmp_name}
+        return {"jobs": await search_stored_jobs(db, q, parse_job_fields(fields), filters, limit)}
     except ValueError as e:
-        return JSONResponse(status_code=404, content=ErrorResponse(detail=str(e)).model_dump())
+        return JSONResponse(status_code=400, content=ErrorResponse(detail=str(e)).model_dump())
     except Exception as e:
-        return JSONResponse(status_code=500, content=ErrorResponse(detail=str(e)).model_dump())
+        logger.error(f"Error searching stored jobs: {str(e)}", exc_info=True)
+        return JSONResponse(status_code=500, content=ErrorResponse(detail=ERROR_MESSAGES.INTERNAL_SERVER_ERROR).model_dump())
 
-@router.post("/jobs", response_model=Job, responses={500: {"model": ErrorResponse}})
-def create_job(job: Job, db: Session = Depends(get_db)):
+@router.get("/jobs/{job_id}", responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}})
+async def get_job(job_id: str, fields: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
     try:
-        return create_job_service(job, db)
+        job = await aget_job(db, job_id, parse_job_fields(fields))
+        if job is None:
+            return JSONResponse(status_code=404, content=ErrorResponse(detail=ERROR_MESSAGES.JOB_NOT_FOUND).model_dump())
+        return job
+    except ValueError as e:
+        return JSONResponse(status_code=400, content=ErrorResponse(detail=str(e)).model_dump())
     except Exception as e:
-        return JSONResponse(status_code=500, content=ErrorResponse(detail=str(e)).model_dump())
+        logger.error(f"Error fetching job: {str(e)}", exc_info=True)
+        return JSONResponse(status_code=500, content=ErrorResponse(detail=ERROR_MESSAGES.INTERNAL_SERVER_ERROR).model_dump())
 
-@router.post("/search-jobs", response_model=List[JobSearchResponse], responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}})
+@router.post("/search-jobs", response_model=List[JobSearchResponse], responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}}, dependencies=[Depends(require_valid_session)])
 async def search_jobs(
     request: JobSearchRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        # Validate session and get user details
-        session = db.query(SessionIdTable).filter(
-            SessionIdTable.user_id == uuid.UUID(request.user_id),
-            SessionIdTable.session_id == uuid.UUID(request.session_id),
-            SessionIdTable.is_valid == True,
-            SessionIdTable.expires_at > datetime.now(UTC)
-        ).first()
-        
-        if not session:
-            raise HTTPException(status_code=400, detail="Invalid or expired session")
-
         # Get user details to check current job title
-        user = db.query(UserDetails).filter(UserDetails.id == uuid.UUID(request.user_id)).first()
+        user = await db.get(UserDetails, uuid.UUID(request.user_id))
         if not user:
             raise HTTPException(status_code=400, detail="User not found")
 
@@ -84,18 +102,38 @@ async def search_jobs(
         logger.info(f"Location: {request.location}")
         logger.info(f"Number of pages: {request.num_pages}")
 
+        # Don't hold a pooled connection while waiting on SerpApi; each saved page checks one out briefly
+        skills = user.skills
+        await arelease_connection(db)
+
         # Initialize job search service
         job_search = JobSearchService()
         
-        # Search for jobs
-        jobs_results = job_search.search_jobs(
+        # Search every requested location concurrently; each page is saved while the next one is in flight.
+        # An AsyncSession runs one operation at a time, so pages finishing together take turns saving.
+        save_lock = asyncio.Lock()
+
+        async def save_page(page_jobs):
+            async with save_lock:
+                await db.run_sync(lambda session: job_search.save_jobs_to_db(page_jobs, session, request.session_id))
+
+        locations = request.locations or [request.location]
+        jobs_results = await job_search.asearch_many(
             request.session_id,
-            job_title,
-            request.location,
-            request.num_pages
+            [(job_title, location) for location in locations],
+            request.num_pages,
+            on_page=save_page
         )
 
-        job_search.save_jobs_to_db(jobs_results, db, request.session_id) 
+        # Overlapping locations and pages can return the same posting; saving gave each one its shared job_id
+        unique_jobs = {}
+        for job in jobs_results:
+            unique_jobs.setdefault(job["job_id"], job)
+        jobs_results = list(unique_jobs.values())
+
+        # Score the whole batch against the user's skills and return best matches first
+        matcher = JobMatchService(skills)
+        jobs_results = await db.run_sync(lambda session: matcher.match_and_save(jobs_results, session, request.user_id))
 
         for job in jobs_results:
             logger.info(f"Job ID: {job.get('job_id')}")
@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+from app.database import pool_stats, async_pool_stats
+from app.services.extraction_cache_service import extraction_cache
+from app.services.extraction_pool import extraction_pool
+from app.services.llm_rate_limiter import llm_rate_limiter
+from app.services.job_search_cache_service import job_search_cache
+from app.services.session_service import session_validator
+
+router = APIRouter()
+
+@router.get("/metrics")
+def get_metrics():
+    """In-process counters for the caches and pools of this worker."""
+    return {
+        "job_search_cache": job_search_cache.stats(),
+        "resume_extraction_cache": extraction_cache.stats(),
+        "extraction_pool": extraction_pool.stats(),
+        "llm_rate_limiter": llm_rate_limiter.stats(),
+        "session_cache": session_validator.stats(),
+        "db_pool": pool_stats(),
+        "db_async_pool": async_pool_stats()
+    }
\ No newline at end of file
@@ -1,16 +1,23 @@
 from fastapi import APIRouter, File, UploadFile, Depends, HTTPException, Form
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import UserDetails, Academics, Accolades, WorkExperience, SessionIdTable
-from app.database import get_db
+from app.database import get_async_db
 from app.resume_parser import ResumeParser
-from app.schemas import UploadResponse, AnalyzeRequest, AnalyzeResponse, ErrorResponse
-from typing import List
+from app.schemas import UploadResponse, AnalyzeRequest, AnalyzeResponse, BulkIngestResponse, ErrorResponse
+from typing import List, Optional
+import hashlib
 import os
+import tempfile
 from datetime import datetime, timedelta, UTC
 import uuid
 import logging
 from sqlalchemy.exc import IntegrityError
 from app.services.resume_service import upload_resume_service, analyze_resume_service
+from app.services.bulk_ingest_service import bulk_ingest_jobs, start_bulk_ingest
+from app.services.upload_service import save_upload_to_file
+from app.services.profile_service import aget_user_profile, parse_profile_fields
+from app.api.v1.dependencies import require_valid_session
+from app.core.config import settings
 from fastapi.responses import JSONResponse
 from app.constants.messages import ERROR_MESSAGES
 from dotenv import load_dotenv
@@ -23,17 +30,20 @@ router = APIRouter()
 UPLOAD_DIR = '/Users/rinikhaneja/Documents/JobSearchResumes'
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Fields returned by /user-details/{user_id}; /user-details/{user_id}/profile returns any profile field
+USER_DETAILS_FIELDS = ("name", "email", "current_job_title", "years_of_exp", "skills", "contact_no")
+
 def get_use_llm_flag():
     return os.getenv('USE_LLM', 'False').lower() == 'true'
 
 @router.post("/upload-resume", response_model=UploadResponse, responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}})
 async def upload_resume(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     use_llm = get_use_llm_flag()
     try:
-        result = upload_resume_service(file, db, use_llm)
+        result = await upload_resume_service(file, db, use_llm)
         print(f"AAAAAResult: {result}")
         return result
     except ValueError as e:
@@ -41,61 +51,105 @@ async def upload_resume(
         return JSONResponse(status_code=400, content=ErrorResponse(detail=str(e)).model_dump())
     except Exception as e:
         logger.error(f"Error uploading file: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         return JSONResponse(status_code=500, content=ErrorResponse(detail=ERROR_MESSAGES.FAILED_TO_UPLOAD_FILE).model_dump())
 
-@router.post("/analyze-resume", response_model=AnalyzeResponse, responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}})
+@router.post("/analyze-resume", response_model=AnalyzeResponse, responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}}, dependencies=[Depends(require_valid_session)])
 async def analyze_resume(
     request: AnalyzeRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     use_llm = get_use_llm_flag()
     try:
-        result = analyze_resume_service(request, db, use_llm)
+        result = await analyze_resume_service(request, db, use_llm)
         return result
     except ValueError as e:
         logger.error(f"Error analyzing resume: {str(e)}", exc_info=True)
         return JSONResponse(status_code=400, content=ErrorResponse(detail=str(e)).model_dump())
     except Exception as e:
         logger.error(f"Error analyzing resume: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         return JSONResponse(status_code=500, content=ErrorResponse(detail=ERROR_MESSAGES.FAILED_TO_ANALYZE_RESUME).model_dump())
 
+@router.post("/resumes/bulk", status_code=202, response_model=BulkIngestResponse, responses={400: {"model": ErrorResponse}})
+async def bulk_ingest_resumes(
+    file: Optional[UploadFile] = File(None),
+    directory: Optional[str] = Form(None)
+):
+    """
+    Start ingesting a zip of resumes, or a directory under BULK_INGEST_DIR, in the background.
+    Poll GET /resumes/bulk/{job_id} for progress. Sending the same zip or directory again resumes its checkpoint.
+    """
+    use_llm = get_use_llm_flag()
+    try:
+        if file is not None:
+            fd, zip_path = tempfile.mkstemp(suffix=".zip")
+            os.close(fd)
+            digest = await save_upload_to_file(file, zip_path, settings.BULK_MAX_UPLOAD_BYTES)
+            job_id = start_bulk_ingest(zip_path, use_llm, checkpoint_key=digest, cleanup_path=zip_path)
+        elif directory:
+            root = os.path.realpath(settings.BULK_INGEST_DIR) if settings.BULK_INGEST_DIR else None
+            source = os.path.realpath(os.path.join(root, directory)) if root else None
+            if not source or not (source == root or source.startswith(root + os.sep)) or not os.path.isdir(source):
+                raise ValueError(ERROR_MESSAGES.BULK_DIRECTORY_NOT_ALLOWED)
+            job_id = start_bulk_ingest(source, use_llm, checkpoint_key=hashlib.sha256(source.encode("utf-8")).hexdigest())
+        else:
+            raise ValueError(ERROR_MESSAGES.BULK_SOURCE_REQUIRED)
+        return {"job_id": job_id, "progress": bulk_ingest_jobs[job_id].progress.to_dict()}
+    except ValueError as e:
+        logger.error(f"Error starting bulk ingest: {str(e)}", exc_info=True)
+        return JSONResponse(status_code=400, content=ErrorResponse(detail=str(e)).model_dump())
+
+@router.get("/resumes/bulk/{job_id}", response_model=BulkIngestResponse, responses={404: {"model": ErrorResponse}})
+async def get_bulk_ingest_progress(job_id: str):
+    service = bulk_ingest_jobs.get(job_id)
+    if service is None:
+        raise HTTPException(status_code=404, detail=ERROR_MESSAGES.BULK_JOB_NOT_FOUND)
+    return {"job_id": job_id, "progress": service.progress.to_dict()}
+
 @router.get("/user-details/{user_id}", responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}})
 async def get_user_details(
     user_id: str,
     session_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        # Validate session
-        session = db.query(SessionIdTable).filter(
-            SessionIdTable.user_id == uuid.UUID(user_id),
-            SessionIdTable.session_id == uuid.UUID(session_id),
-            SessionIdTable.is_valid == True,
-            SessionIdTable.expires_at > datetime.now(UTC)
-        ).first()
-        
-        if not session:
-            raise HTTPException(status_code=404, detail=ERROR_MESSAGES.INVALID_OR_EXPIRED_SESSION)
-
-        # Get user details
-        user = db.query(UserDetails).filter(UserDetails.id == uuid.UUID(user_id)).first()
+        # Session check and user columns come back in one statement
+        user = await aget_user_profile(db, user_id, session_id, USER_DETAILS_FIELDS)
         if not user:
-            raise HTTPException(status_code=404, detail=ERROR_MESSAGES.USER_NOT_FOUND)
-
-        return {
-            "id": str(user.id),
-            "name": user.name,
-            "email": user.email,
-            "current_job_title": user.current_job_title,
-            "years_of_exp": user.years_of_exp,
-            "skills": user.skills,
-            "contact_no": user.contact_no
-        }
+            raise HTTPException(status_code=404, detail=ERROR_MESSAGES.INVALID_OR_EXPIRED_SESSION)
+        return user
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Error fetching user details: {str(e)}", exc_info=True)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching user details: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=ERROR_MESSAGES.INTERNAL_SERVER_ERROR) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=ERROR_MESSAGES.INTERNAL_SERVER_ERROR)
+
+@router.get("/user-details/{user_id}/profile", responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}})
+async def get_user_profile_details(
+    user_id: str,
+    session_id: str,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Full profile of a user: contact details, skills, academics, accolades, work experience and matched jobs.
+    Pass fields (comma-separated, e.g. "name,skills,work_experience") to load and return only those;
+    collections that are not asked for are not queried.
+    """
+    try:
+        profile = await aget_user_profile(db, user_id, session_id, parse_profile_fields(fields))
+        if not profile:
+            raise HTTPException(status_code=404, detail=ERROR_MESSAGES.INVALID_OR_EXPIRED_SESSION)
+        return profile
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.error(f"Error fetching user profile: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching user profile: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=ERROR_MESSAGES.INTERNAL_SERVER_ERROR)
@@ -0,0 +1,52 @@
+"""
+Bulk resume ingestion from the command line.
+
+Usage: python -m app.bulk_ingest <zip-or-directory> [--llm] [--workers N] [--batch-size N] [--checkpoint PATH]
+
+Progress is printed after every database batch. The checkpoint (by default <source>.checkpoint.json)
+records finished files, so rerunning the same command after an interruption skips them.
+"""
+import argparse
+import asyncio
+import json
+import os
+
+from app.logging_config import setup_logging
+from app.services.bulk_ingest_service import BulkIngestService
+from app.services.extraction_pool import extraction_pool
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Onboard a zip file or directory of resumes.")
+    arg_parser.add_argument("source", help="Zip file or directory of PDF/DOCX/TXT resumes")
+    arg_parser.add_argument("--llm", action="store_true", help="Extract with the LLM instead of the rule-based parser")
+    arg_parser.add_argument("--workers", type=int, default=None, help="Files processed concurrently")
+    arg_parser.add_argument("--batch-size", type=int, default=None, help="Resumes written per database batch")
+    arg_parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: <source>.checkpoint.json)")
+    args = arg_parser.parse_args()
+
+    setup_logging()
+    source = os.path.abspath(args.source)
+    service = BulkIngestService(
+        use_llm=args.llm,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        checkpoint_path=args.checkpoint or f"{source.rstrip(os.sep)}.checkpoint.json"
+    )
+
+    def report(progress):
+        summary = progress.to_dict()
+        print(f"[{summary['status']}] seen {summary['seen']}, created {summary['created']}, "
+              f"skipped {summary['skipped']}, failed {summary['failed']} "
+              f"({summary['files_per_minute']} files/min)", flush=True)
+
+    try:
+        progress = asyncio.run(service.run(source, on_progress=report))
+    finally:
+        extraction_pool.shutdown()
+    if progress.errors:
+        print(json.dumps(progress.errors, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,18 @@ class ERROR_MESSAGES:
     JOB_NOT_FOUND = "Job not found"
     FAILED_TO_ANALYZE_RESUME = "Failed to analyze resume"
     FAILED_TO_UPLOAD_FILE = "Failed to upload file"
+    FILE_TOO_LARGE = "File is too large"
+    EMPTY_FILE = "Uploaded file is empty"
+    EXTRACTION_TIMED_OUT = "Timed out reading the resume file"
+    UNPARSEABLE_FILE = "Could not read the resume file"
+    BULK_SOURCE_REQUIRED = "Provide either a zip file or a directory"
+    BULK_DIRECTORY_NOT_ALLOWED = "Directory must be inside the configured bulk ingest directory"
+    BULK_JOB_NOT_FOUND = "Bulk ingest job not found"
+    INVALID_PROFILE_FIELDS = "Unknown profile fields requested"
+    INVALID_JOB_FIELDS = "Unknown job fields requested"
+    INVALID_CURSOR = "Invalid pagination cursor"
+    EMPTY_SEARCH_QUERY = "Search query must contain at least one word"
+    INTERNAL_SERVER_ERROR = "Internal server error"
 
 # Success messages
 class SUCCESS_MESSAGES:
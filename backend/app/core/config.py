@@ -4,5 +4,78 @@ class Settings:
     PROJECT_NAME: str = "Job Search API"
     CORS_ORIGINS = ["http://localhost:3000"]
     UPLOAD_DIR = os.getenv("UPLOAD_DIR", "/Users/rinikhaneja/Documents/JobSearchResumes")
+    # Resume uploads are streamed in chunks of UPLOAD_CHUNK_SIZE and rejected past MAX_UPLOAD_BYTES
+    MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+    UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+    # LLM resume extraction cache: "db" (in-process LRU backed by a table), "memory" or "none"
+    LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "db").lower()
+    LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+    LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+    # Async OpenAI calls: max in-flight requests per process, per-attempt timeout and retry policy
+    OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+    OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "60"))
+    OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "3"))
+    OPENAI_RETRY_BACKOFF_SECONDS = float(os.getenv("OPENAI_RETRY_BACKOFF_SECONDS", "1"))
+    # Client-side pacing of OpenAI calls; set either limit to 0 to disable the limiter
+    OPENAI_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "3500"))
+    OPENAI_TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "90000"))
+    # Batched resume extraction: resumes packed per LLM request (and their total size), and how long the
+    # batcher waits for more concurrent requests before sending a partial batch
+    LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "4"))
+    LLM_BATCH_MAX_CHARS = int(os.getenv("LLM_BATCH_MAX_CHARS", "24000"))
+    LLM_BATCH_MAX_WAIT_SECONDS = float(os.getenv("LLM_BATCH_MAX_WAIT_SECONDS", "0.05"))
+    # Resumes longer than LLM_CHUNK_MAX_CHARS (after cleanup) are extracted section by section and merged.
+    # The completion budget grows with the text sent (512 tokens plus one per 4 characters), capped per request.
+    LLM_CHUNK_MAX_CHARS = int(os.getenv("LLM_CHUNK_MAX_CHARS", "6000"))
+    LLM_EXTRACTION_MAX_TOKENS = int(os.getenv("LLM_EXTRACTION_MAX_TOKENS", "4096"))
+    # Valid user sessions are remembered in-process for this long (never past their expires_at)
+    SESSION_CACHE_TTL_SECONDS = float(os.getenv("SESSION_CACHE_TTL_SECONDS", "30"))
+    SESSION_CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "10000"))
+    # SerpApi async client: endpoint (override to point at a fake server), pool size and request timeout
+    SERPAPI_BASE_URL = os.getenv("SERPAPI_BASE_URL", "https://serpapi.com/search.json")
+    SERPAPI_MAX_CONNECTIONS = int(os.getenv("SERPAPI_MAX_CONNECTIONS", "20"))
+    SERPAPI_TIMEOUT_SECONDS = float(os.getenv("SERPAPI_TIMEOUT_SECONDS", "30"))
+    # SerpApi page cache: "db" (in-process LRU backed by a shared table), "memory" or "none".
+    # Pages younger than FRESH are served as is; up to STALE they are served while refreshed in the background.
+    JOB_SEARCH_CACHE_BACKEND = os.getenv("JOB_SEARCH_CACHE_BACKEND", "db").lower()
+    JOB_SEARCH_CACHE_FRESH_SECONDS = int(os.getenv("JOB_SEARCH_CACHE_FRESH_SECONDS", "900"))
+    JOB_SEARCH_CACHE_STALE_SECONDS = int(os.getenv("JOB_SEARCH_CACHE_STALE_SECONDS", "3600"))
+    JOB_SEARCH_CACHE_MEMORY_ENTRIES = int(os.getenv("JOB_SEARCH_CACHE_MEMORY_ENTRIES", "1024"))
+    # Rows kept in the shared job_search_cache table; older and stale rows are pruned as pages are written
+    JOB_SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("JOB_SEARCH_CACHE_MAX_ENTRIES", "5000"))
+    # save_jobs_to_db switches from INSERT executemany to COPY at this many rows (psycopg2 or asyncpg)
+    JOB_BULK_COPY_THRESHOLD = int(os.getenv("JOB_BULK_COPY_THRESHOLD", "2000"))
+    # Default and largest page size of GET /jobs
+    JOBS_PAGE_SIZE = int(os.getenv("JOBS_PAGE_SIZE", "50"))
+    JOBS_PAGE_MAX = int(os.getenv("JOBS_PAGE_MAX", "500"))
+    # Default and largest number of results of GET /jobs/search, which ranks instead of paging
+    JOBS_SEARCH_LIMIT = int(os.getenv("JOBS_SEARCH_LIMIT", "20"))
+    JOBS_SEARCH_MAX = int(os.getenv("JOBS_SEARCH_MAX", "100"))
+    # Process pool for PDF/DOCX extraction and spaCy parsing; 0 workers runs tasks in a thread instead.
+    # Each worker loads its own spaCy model, so the default stays small.
+    EXTRACTION_POOL_WORKERS = int(os.getenv("EXTRACTION_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+    EXTRACTION_POOL_MAX_PENDING = int(os.getenv("EXTRACTION_POOL_MAX_PENDING", str(4 * EXTRACTION_POOL_WORKERS)))
+    EXTRACTION_TASK_TIMEOUT_SECONDS = float(os.getenv("EXTRACTION_TASK_TIMEOUT_SECONDS", "60"))
+    # Bulk resume ingestion: concurrent files, rows per DB batch, the server-side directory the
+    # /resumes/bulk endpoint may read from (unset disables directory mode) and the zip upload limit
+    BULK_INGEST_WORKERS = int(os.getenv("BULK_INGEST_WORKERS", "8"))
+    BULK_INGEST_BATCH_SIZE = int(os.getenv("BULK_INGEST_BATCH_SIZE", "100"))
+    BULK_INGEST_DIR = os.getenv("BULK_INGEST_DIR")
+    BULK_MAX_UPLOAD_BYTES = int(os.getenv("BULK_MAX_UPLOAD_BYTES", str(2 * 1024 ** 3)))
+    # How long the progress of a finished bulk job can still be polled, and how many finished jobs are kept
+    BULK_INGEST_JOB_TTL_SECONDS = int(os.getenv("BULK_INGEST_JOB_TTL_SECONDS", "3600"))
+    BULK_INGEST_MAX_FINISHED_JOBS = int(os.getenv("BULK_INGEST_MAX_FINISHED_JOBS", "100"))
+    # Database connection pool. Connections are checked before use (pre-ping) and replaced after
+    # DB_POOL_RECYCLE_SECONDS; statements running longer than DB_STATEMENT_TIMEOUT_MS are cancelled (0 disables).
+    # With DB_PGBOUNCER=true PgBouncer does the pooling: the app keeps no idle connections and sets the
+    # statement timeout per transaction, which works in PgBouncer's transaction pooling mode.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+    DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
 
-settings = Settings() 
\ No newline at end of file
+settings = Settings()
\ No newline at end of file
@@ -1,8 +1,15 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 import os
+import threading
+import time
+import uuid
 from dotenv import load_dotenv
+from app.core.config import settings
 
 # Load environment variables
 load_dotenv()
@@ -16,20 +23,203 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 
 # Create database URL
 SQLALCHEMY_DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Same database through asyncpg, for the async routes
+ASYNC_SQLALCHEMY_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+
+class PoolMetrics:
+    """Counters for the connection pool, reported on /metrics next to the pool's own gauges."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waited = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidated = 0
+
+    def record_checkout(self, wait_seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            # Anything slower than a millisecond waited for a free connection or opened a new one
+            if wait_seconds > 0.001:
+                self.waited += 1
+
+    def stats(self, pool) -> dict:
+        gauges = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            gauges.update(size=pool.size(), checked_out=pool.checkedout(), idle=pool.checkedin(),
+                          overflow=max(pool.overflow(), 0))
+        with self._lock:
+            return {
+                **gauges,
+                "checkouts": self.checkouts,
+                "waited": self.waited,
+                "avg_wait_seconds": round(self.total_wait_seconds / self.checkouts, 4) if self.checkouts else 0.0,
+                "max_wait_seconds": round(self.max_wait_seconds, 4),
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidated": self.invalidated
+            }
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class _TimedCheckout:
+    """Pool mixin that records how long each checkout waited for a connection."""
+
+    def _metrics(self) -> PoolMetrics:
+        raise NotImplementedError
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self._metrics().record_checkout(time.perf_counter() - started, timed_out=True)
+            raise
+        self._metrics().record_checkout(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool of the sync engine, reporting to pool_metrics."""
+
+    def _metrics(self) -> PoolMetrics:
+        return pool_metrics
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """Pool of the asyncpg engine, reporting to async_pool_metrics; waiting for a connection awaits instead of blocking."""
+
+    def _metrics(self) -> PoolMetrics:
+        return async_pool_metrics
+
+
+def _engine_options(use_async: bool = False) -> dict:
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if settings.DB_PGBOUNCER:
+        # PgBouncer pools the server connections; startup "options" would be rejected by it
+        options["poolclass"] = NullPool
+        if use_async:
+            # Transaction pooling can hand each transaction a different server connection, where
+            # asyncpg's cached prepared statements do not exist; names must not collide either
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__"
+            }
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if use_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        # Reuse the most recent connection so idle extras age out instead of all staying warm
+        pool_use_lifo=True
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        if use_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def _instrument(engine, metrics: PoolMetrics = None) -> None:
+    """Count connects and invalidations of a (sync, or an async engine's sync_engine) engine into metrics."""
+    @event.listens_for(engine, "connect")
+    def count_connect(dbapi_connection, connection_record):
+        (metrics or pool_metrics).connects += 1
+
+    @event.listens_for(engine, "invalidate")
+    def count_invalidate(dbapi_connection, connection_record, exception):
+        (metrics or pool_metrics).invalidated += 1
+
+    if settings.DB_PGBOUNCER and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        @event.listens_for(engine, "begin")
+        def set_statement_timeout(conn):
+            # SET LOCAL lasts for the transaction, which is exactly what PgBouncer pins to one server connection
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {settings.DB_STATEMENT_TIMEOUT_MS}")
+
 
 # Create SQLAlchemy engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **_engine_options())
+_instrument(engine)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and sessions for the async routes; its pool is separate from the sync engine's.
+# Objects stay usable after commit, since reloading an expired attribute would need an await.
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, **_engine_options(use_async=True))
+_instrument(async_engine.sync_engine, async_pool_metrics)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create Base class
 Base = declarative_base()
 
 # Dependency to get DB session
 def get_db():
+    # A Session only checks out a connection when it first runs a query, so routes that never
+    # touch the database cost no connection
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    # Like get_db, the connection is checked out on the first awaited query
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Session.info key set while the open transaction holds flushed but uncommitted writes
+_FLUSHED_WRITES = "flushed_writes"
+
+@event.listens_for(Session, "after_flush")
+def _note_flushed_writes(session, flush_context):
+    session.info[_FLUSHED_WRITES] = True
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_flushed_writes(session):
+    session.info.pop(_FLUSHED_WRITES, None)
+
+def _check_clean(db: Session) -> None:
+    if db.new or db.dirty or db.deleted or db.info.get(_FLUSHED_WRITES):
+        raise RuntimeError("release_connection called with unsaved changes; commit or roll them back first")
+
+def release_connection(db: Session) -> None:
+    """
+    End the session's read-only transaction so its connection goes back to the pool.
+    Call it before awaiting something slow (LLM, SerpApi) so the connection is not held idle
+    meanwhile; the next query checks out a connection again. The transaction is rolled back,
+    which expires loaded objects, so read what is needed from them first.
+
+    Raises:
+        RuntimeError: If the session has pending or flushed changes, which this would otherwise discard
+    """
+    _check_clean(db)
+    db.rollback()
+
+async def arelease_connection(db: AsyncSession) -> None:
+    """Async variant of release_connection."""
+    _check_clean(db.sync_session)
+    await db.rollback()
+
+def pool_stats() -> dict:
+    return pool_metrics.stats(engine.pool)
+
+def async_pool_stats() -> dict:
+    return async_pool_metrics.stats(async_engine.pool)
@@ -1,12 +1,21 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.logging_config import setup_logging
-from app.api import resume_router, jobs_router
+from app.api import resume_router, jobs_router, metrics_router
+from app.services.job_search_service import close_http_session
+from app.services.extraction_pool import extraction_pool
 
 logger = setup_logging()
 
-app = FastAPI(title=settings.PROJECT_NAME)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await close_http_session()
+    extraction_pool.shutdown()
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -23,6 +32,7 @@ app.add_middleware(
 # Import and include routes
 app.include_router(resume_router)
 app.include_router(jobs_router)
+app.include_router(metrics_router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,3 +1,4 @@
 from .base import Base
 from .user import UserDetails, Academics, Accolades, WorkExperience, SessionIdTable
-from .job import JobsOffered, MatchedJobs 
\ No newline at end of file
+from .job import JobsOffered, SessionJobs, MatchedJobs
+from .cache import ResumeExtractionCache, JobSearchCache
\ No newline at end of file
@@ -1,3 +1,13 @@
+from datetime import datetime, UTC
+
 from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base() 
\ No newline at end of file
+Base = declarative_base()
+
+
+def utc_now() -> datetime:
+    """
+    The current UTC time for DateTime columns without a timezone, which hold naive UTC.
+    asyncpg refuses timezone-aware values for them.
+    """
+    return datetime.now(UTC).replace(tzinfo=None)
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy.sql import func
+from .base import Base
+
+class ResumeExtractionCache(Base):
+    """Persisted LLM resume extraction result, keyed by a hash of the resume text, model and prompt version."""
+    __tablename__ = "resume_extraction_cache"
+    cache_key = Column(String(64), primary_key=True)
+    model = Column(String, nullable=False)
+    prompt_version = Column(String, nullable=False)
+    data = Column(JSON, nullable=False)
+    hit_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    last_accessed_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+class JobSearchCache(Base):
+    """Shared cache of raw SerpApi result pages, keyed by a hash of the normalized title, location and page token."""
+    __tablename__ = "job_search_cache"
+    cache_key = Column(String(64), primary_key=True)
+    job_title = Column(String, nullable=False)
+    location = Column(String, nullable=True)
+    page_token = Column(String, nullable=True)
+    response = Column(JSON, nullable=False)
+    fetched_at = Column(DateTime(timezone=True), nullable=False, index=True)
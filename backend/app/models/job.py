@@ -1,13 +1,32 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Float, Text, JSON, ARRAY, UUID
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Float, Text, JSON, ARRAY, UUID, UniqueConstraint, Index, DDL, event, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
 from .base import Base
 
+# Weighted full-text document of a job for Postgres: title, then qualifications, then description.
+# The GIN index and the /jobs/search query must use exactly this expression for the index to apply.
+JOB_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(job_title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(qualification_required, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+# SQLite keeps the same text in an FTS5 table instead, kept in sync by triggers
+JOB_SEARCH_FTS_TABLE = "jobs_offered_fts"
+
 class JobsOffered(Base):
+    """A unique job posting, shared by every search session that found it (see SessionJobs)."""
     __tablename__ = "jobs_offered"
+    # Keyset pagination of /jobs walks this index backwards: newest posted_date first, jobid breaking ties
+    __table_args__ = (
+        Index("ix_jobs_offered_posted_date_jobid", "posted_date", "jobid"),
+        Index("ix_jobs_offered_search", text(f"({JOB_SEARCH_DOCUMENT})"), postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     jobid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Session that first found the posting
     session_id = Column(UUID(as_uuid=True), ForeignKey("session_id_table.session_id"))
+    # Hash of normalized title, company, location and description; repeated postings upsert onto one row
+    fingerprint = Column(String(64), unique=True, index=True, nullable=True)
     job_title = Column(String, index=True)
     cmp_name = Column(String, index=True)
     city = Column(String, index=True)
@@ -15,15 +34,45 @@ class JobsOffered(Base):
     country = Column(String, index=True)
     description = Column(Text, nullable=True)
     qualification_required = Column(Text, nullable=True)
-    skills_required = Column(ARRAY(String), nullable=True)
+    # Stored as JSON on SQLite, so the table can be created in test databases
+    skills_required = Column(ARRAY(String).with_variant(JSON(), "sqlite"), nullable=True)
     salary_offered = Column(String, nullable=True)
     posted_date = Column(DateTime, default=datetime.utcnow, nullable=True)
     is_active = Column(Boolean, default=True, nullable=True)
-    session = relationship("SessionIdTable", back_populates="jobs")
+    last_seen_at = Column(DateTime(timezone=True), nullable=True)
+    session = relationship("SessionIdTable")
+    sessions = relationship("SessionIdTable", secondary="session_jobs", back_populates="jobs", viewonly=True)
     matches = relationship("MatchedJobs", back_populates="job")
 
+# On SQLite (tests, local runs) /jobs/search reads an FTS5 inverted index filled by these triggers.
+# Updates and deletes find the entry by scanning its jobid, which is fine at test-database sizes.
+_FTS_COLUMNS = "job_title, qualification_required, description"
+for _statement in (
+    f"CREATE VIRTUAL TABLE {JOB_SEARCH_FTS_TABLE} USING fts5(jobid UNINDEXED, {_FTS_COLUMNS}, tokenize='porter unicode61')",
+    f"CREATE TRIGGER {JOB_SEARCH_FTS_TABLE}_insert AFTER INSERT ON jobs_offered BEGIN "
+    f"INSERT INTO {JOB_SEARCH_FTS_TABLE} (jobid, {_FTS_COLUMNS}) "
+    f"VALUES (new.jobid, new.job_title, new.qualification_required, new.description); END",
+    f"CREATE TRIGGER {JOB_SEARCH_FTS_TABLE}_update AFTER UPDATE OF job_title, qualification_required, description "
+    f"ON jobs_offered BEGIN UPDATE {JOB_SEARCH_FTS_TABLE} SET job_title = new.job_title, "
+    f"qualification_required = new.qualification_required, description = new.description "
+    f"WHERE jobid = old.jobid; END",
+    f"CREATE TRIGGER {JOB_SEARCH_FTS_TABLE}_delete AFTER DELETE ON jobs_offered BEGIN "
+    f"DELETE FROM {JOB_SEARCH_FTS_TABLE} WHERE jobid = old.jobid; END",
+):
+    event.listen(JobsOffered.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(JobsOffered.__table__, "before_drop",
+             DDL(f"DROP TABLE IF EXISTS {JOB_SEARCH_FTS_TABLE}").execute_if(dialect="sqlite"))
+
+class SessionJobs(Base):
+    """Links a search session to the shared job rows it returned."""
+    __tablename__ = "session_jobs"
+    session_id = Column(UUID(as_uuid=True), ForeignKey("session_id_table.session_id"), primary_key=True)
+    jobid = Column(UUID(as_uuid=True), ForeignKey("jobs_offered.jobid"), primary_key=True, index=True)
+    found_at = Column(DateTime(timezone=True), nullable=True)
+
 class MatchedJobs(Base):
     __tablename__ = "matched_jobs"
+    __table_args__ = (UniqueConstraint("user_id", "job_id", name="uq_matched_jobs_user_job"),)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("user_details.id"))
     job_id = Column(UUID(as_uuid=True), ForeignKey("jobs_offered.jobid"))
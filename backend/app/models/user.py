@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Float, Enum, JSON, UUID
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Float, Enum, JSON, UUID, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -27,7 +27,8 @@ class UserDetails(Base):
     current_job_title = Column(String, nullable=True)
     years_of_exp = Column(Float, nullable=True)
     skills = Column(JSON, nullable=True)
-    resume_location = Column(String, nullable=False)
+    # Path of the content-addressed resume blob; users with identical files share it
+    resume_location = Column(String, nullable=False, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     is_active = Column(Boolean, default=True)
@@ -65,6 +66,8 @@ class Academics(Base):
 class SessionIdTable(Base):
     """Represents a user session, including session token, validity, and relationship to jobs."""
     __tablename__ = "session_id_table"
+    # Covers the session check (user_id, session_id, is_valid, expires_at) so it is answered from the index alone
+    __table_args__ = (Index("ix_session_id_table_validation", "user_id", "session_id", "is_valid", "expires_at"),)
     session_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("user_details.id"))
     session_token = Column(String, unique=True, index=True)
@@ -72,7 +75,7 @@ class SessionIdTable(Base):
     expires_at = Column(DateTime)
     is_valid = Column(Boolean, default=True)
     user = relationship("UserDetails", back_populates="sessions")
-    jobs = relationship("JobsOffered", back_populates="session")
+    jobs = relationship("JobsOffered", secondary="session_jobs", back_populates="sessions", viewonly=True)
 
 class WorkExperience(Base):
     __tablename__ = "work_experience"
@@ -1,19 +1,222 @@
+import io
 import os
 from typing import Dict, List, Optional
 import docx
 from PyPDF2 import PdfReader
-import spacy
 import magic
 from datetime import datetime
 import re
 import logging
+import threading
 from dateutil import parser as date_parser
-
-# Load spaCy model
-nlp = spacy.load("en_core_web_sm")
+from app.services.resume_store import resume_store
 
 logger = logging.getLogger('custom_logger')
 
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+# The parser only reads doc.ents and doc.sents; everything else in the pipeline is dead weight.
+# NER in en_core_web_sm has its own embedded tok2vec, so the shared one can go too.
+SPACY_EXCLUDED_COMPONENTS = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """
+    Return the process-wide spaCy pipeline, loading it on first use.
+    Only NER is kept from the model; a rule-based sentencizer provides doc.sents.
+    """
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                pipeline = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDED_COMPONENTS)
+                if "sentencizer" not in pipeline.pipe_names:
+                    pipeline.add_pipe("sentencizer", first=True)
+                logger.info(f'spaCy model {SPACY_MODEL} loaded with pipes: {pipeline.pipe_names}')
+                _nlp = pipeline
+    return _nlp
+
+# Names of the derived artifacts kept next to resumes in the blob store; bump the versions when the
+# extraction or pipeline output changes so old artifacts are ignored
+PARSER_TEXT_ARTIFACT = "pypdf2-v1.txt"
+DOCBIN_ARTIFACT_VERSION = "1"
+
+def _docbin_artifact() -> str:
+    import spacy
+    model_name = os.path.basename(SPACY_MODEL.rstrip("/\\"))
+    return f"spacy-{model_name}-{spacy.__version__}-v{DOCBIN_ARTIFACT_VERSION}.docbin"
+
+# Heading lines that start a resume section, e.g. "Work Experience", "EDUCATION:" or "Skills: Python, SQL"
+SECTION_HEADINGS = {
+    "experience": ["work experience", "professional experience", "project experience", "experience",
+                   "employment history", "employment", "work history", "project details"],
+    "education": ["education", "academic background", "academics", "academic qualifications", "qualifications"],
+    "skills": ["technical skills", "core skills", "key skills", "skills"],
+    "certifications": ["certifications", "certificates", "certification", "licenses", "awards",
+                       "accolades", "achievements", "honors"],
+}
+_HEADING_TO_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_SECTION_HEADING_RE = re.compile(
+    r'^[ \t]*(' + '|'.join(re.escape(h) for h in sorted(_HEADING_TO_SECTION, key=len, reverse=True)) + r')[ \t]*(?::|$)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+class KeywordMatcher:
+    """
+    Matches a keyword dictionary against lowercased text on whole-word boundaries
+    ("java" no longer hits "javascript", "intern" no longer hits "international").
+    Each keyword is first screened with a plain substring test, which is cheaper than any
+    combined regex at this dictionary size; only the few hits are confirmed with a precompiled
+    boundary pattern. The pattern starts with the literal keyword so the regex engine can use
+    its fast literal search, and the leading boundary is checked by a lookbehind at the end.
+    """
+    def __init__(self, keywords: List[str]):
+        self.keywords = list(dict.fromkeys(k.lower() for k in keywords))
+        self._patterns = [
+            (keyword, re.compile(re.escape(keyword) + r'(?![a-z0-9])(?<![a-z0-9]' + re.escape(keyword) + r')'))
+            for keyword in self.keywords
+        ]
+
+    def find_all(self, text_lower: str) -> set:
+        """All keywords present in already lowercased text."""
+        return {keyword for keyword, pattern in self._patterns if keyword in text_lower and pattern.search(text_lower)}
+
+    def first(self, text_lower: str) -> Optional[str]:
+        """The present keyword that comes earliest in the dictionary order."""
+        for keyword, pattern in self._patterns:
+            if keyword in text_lower and pattern.search(text_lower):
+                return keyword
+        return None
+
+
+# Common job titles, in priority order for _extract_current_job_title
+JOB_TITLE_KEYWORDS = [
+    "software engineer", "developer", "data scientist", "project manager", "product manager",
+    "consultant", "analyst", "architect", "designer", "qa engineer", "test engineer",
+    "full stack developer", "frontend developer", "backend developer", "devops engineer",
+    "machine learning engineer", "ai engineer", "researcher", "intern", "lead", "manager",
+    "director", "chief", "cto", "ceo", "coo", "founder", "owner", "administrator",
+    "business analyst", "data analyst", "system administrator", "network engineer",
+    "security engineer", "cloud engineer", "solutions architect", "technical lead",
+    "senior engineer", "principal engineer", "staff engineer", "engineering manager"
+]
+
+# Common technical skills
+SKILL_KEYWORDS = {
+    "programming": ["python", "numpy", "pandas", "java", "javascript", "c++", "ruby", "php", "swift", "kotlin"],
+    "databases": ["sql", "mysql", "postgresql", "mongodb", "redis", "oracle", "couchbase", "cassandra", "nosql"],
+    "frameworks": ["django", "flask", "react", "angular", "vue", "spring", "spring boot"],
+    "tools": ["git", "docker", "kubernetes", "jenkins", "aws", "azure", "gcp", "postman", "swagger", "rest", "restful", "rest api", "restful api", "maven", "gradle","grafana","splunk"],
+    "languages": ["english", "spanish", "french", "german", "chinese", "japanese"]
+}
+
+_EMAIL_KEYWORDS = ["email", "e-mail", "mail", "contact"]
+_PHONE_KEYWORDS = [
+    "phone", "phone no", "phone number", "mobile", "mobile no", "mobile number",
+    "cell", "cell no", "cell number", "tel", "tel no", "telephone", "telephone no",
+    "contact", "contact no", "reach me at", "call", "📞", "📱"
+]
+_EMAIL_DOMAIN = r'([A-Za-z0-9.-]+(?:\s*\.\s*[A-Za-z0-9.-]+)*)'
+
+
+class PATTERNS:
+    """Registry of every regex ResumeParser uses, compiled once at import time."""
+    # The leading lookbehinds only let a match start at the beginning of a username run, which avoids
+    # retrying the pattern at every character of every word without changing what is matched.
+    EMAIL_WITH_SPACES = re.compile(r'(?<![A-Za-z0-9._%+-])([A-Za-z0-9._%+-]+)\s*@\s*([A-Za-z0-9.\s-]+)')
+    EMAIL = re.compile(r'(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+    # Tried in keyword order, then separator order, like the original nested loops
+    EMAIL_KEYWORD = [
+        re.compile(f"{re.escape(keyword)}{separator}([A-Za-z0-9._%+-]+)\\s*@\\s*{_EMAIL_DOMAIN}", re.IGNORECASE)
+        for keyword in _EMAIL_KEYWORDS
+        for separator in (r'[:\s]+', r'[\s]*[=]+[\s]*', r'[\s]*[-]+[\s]*')
+    ]
+    EMAIL_CONTACT_SECTION = re.compile(
+        r'(?:contact|contact information|contact details)[^@]*?([A-Za-z0-9._%+-]+)\s*@\s*' + _EMAIL_DOMAIN,
+        re.IGNORECASE
+    )
+    # Searched against lowercased text, which is much faster than an IGNORECASE alternation
+    PHONE_WITH_KEYWORD = re.compile(
+        r'(' + '|'.join(re.escape(k) for k in _PHONE_KEYWORDS) + r')[\s:]*([+\d][\d\s\-().]{7,})'
+    )
+    PHONE = re.compile(r'(\+?\d{1,3}[\s\-]?)?(\(?\d{2,4}\)?[\s\-]?)?\d{2,4}[\s\-]?\d{2,4}[\s\-]?\d{2,4}')
+    PHONE_NON_DIGITS = re.compile(r'[^+\d]')
+    YEARS_OF_EXPERIENCE = [
+        re.compile(r'(\d+(?:\.\d+)?)(\s*\+)?\s*years? of experience'),
+        re.compile(r'(\d+(?:\.\d+)?)(\s*\+)?\s*yrs? of experience'),
+        re.compile(r'(\d+(?:\.\d+)?)(\s*\+)?\s*years? experience'),
+        re.compile(r'(\d+(?:\.\d+)?)(\s*\+)?\s*yrs? experience')
+    ]
+    EXPERIENCE_SECTION = re.compile(
+        r'(project experience|professional experience|experience|project details)(.*?)(?=(\n[A-Z][^\n]*:|\Z))',
+        re.IGNORECASE | re.DOTALL
+    )
+    DATE_RANGE = re.compile(
+        r'([A-Za-z]+ \d{4})\s*[-–]\s*([A-Za-z]+ \d{4}|Present|Till Date|Till Now|Current)', re.IGNORECASE
+    )
+    ONGOING = re.compile(r'present|till date|till now|current', re.IGNORECASE)
+    YEAR = re.compile(r'\b(?:19|20)\d{2}\b')
+    URL = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+    SKILLS = KeywordMatcher([keyword for keywords in SKILL_KEYWORDS.values() for keyword in keywords])
+    JOB_TITLES = KeywordMatcher(JOB_TITLE_KEYWORDS)
+
+
+class ResumeSections:
+    """
+    The resume split into sections in a single pass over doc.sents.
+    Each sentence is stored once as (text, lowercase text) so extractors never re-lowercase it.
+    """
+    def __init__(self, doc):
+        self.text = doc.text
+        self.text_lower = self.text.lower()
+        self.sentences = []
+        self._by_section = {section: [] for section in SECTION_HEADINGS}
+
+        # Heading offsets come from one regex scan, then sentences and headings are walked together.
+        # A sentence that runs across a heading line is cut there, so each piece lands in its own section.
+        headings = [(match.start(), _HEADING_TO_SECTION[match.group(1).lower()])
+                    for match in _SECTION_HEADING_RE.finditer(self.text)]
+        next_heading = 0
+        current_section = None
+        for sent in doc.sents:
+            cut, end = sent.start_char, sent.end_char
+            while next_heading < len(headings) and headings[next_heading][0] <= cut:
+                current_section = headings[next_heading][1]
+                next_heading += 1
+            while next_heading < len(headings) and headings[next_heading][0] < end:
+                heading_start, section = headings[next_heading]
+                self._add(self.text[cut:heading_start], current_section)
+                cut, current_section = heading_start, section
+                next_heading += 1
+            self._add(self.text[cut:end], current_section)
+
+    def _add(self, sent_text: str, section: Optional[str]) -> None:
+        sent_text = sent_text.strip()
+        if not sent_text:
+            return
+        entry = (sent_text, sent_text.lower())
+        self.sentences.append(entry)
+        if section:
+            self._by_section[section].append(entry)
+
+    def has_section(self, section: str) -> bool:
+        return bool(self._by_section.get(section))
+
+    def get(self, section: str) -> List[tuple]:
+        """Sentences of a section, or every sentence when the resume has no such heading."""
+        return self._by_section.get(section) or self.sentences
+
+    def section_text(self, section: str) -> str:
+        return "\n".join(text for text, _ in self._by_section.get(section, []))
+
+
+def parse_resume_file(file_path: str, data: Optional[bytes] = None) -> Dict:
+    """Module-level entry point so parsing can be submitted to the extraction process pool."""
+    return ResumeParser().parse_resume(file_path, data)
+
 class ResumeParser:
     """
     Parses resume files (PDF, DOCX) to extract structured information such as name, contact info, skills, experience, education, and accolades.
@@ -21,59 +224,81 @@ class ResumeParser:
     """
     def __init__(self):
         logger.info('ResumeParser instantiated')
-        self.nlp = spacy.load("en_core_web_sm")
-        logger.debug('spaCy model loaded')
-        
-    def extract_text_from_file(self, file_path: str) -> str:
+
+    @property
+    def nlp(self):
+        return get_nlp()
+
+    def _load_text(self, file_path: str, data: Optional[bytes] = None) -> str:
+        """Extracted text of the resume, reused from the blob store's artifacts when available."""
+        def build():
+            return self.extract_text_from_file(file_path, data).encode("utf-8")
+        return resume_store.get_or_build_artifact(file_path, PARSER_TEXT_ARTIFACT, build).decode("utf-8")
+
+    def _load_doc(self, file_path: str, text: str):
+        """spaCy doc of the resume text, reused from a stored DocBin so NER only runs once per file."""
+        from spacy.tokens import DocBin
+
+        def build():
+            doc_bin = DocBin(store_user_data=False)
+            doc_bin.add(self.nlp(text))
+            return doc_bin.to_bytes()
+        return next(DocBin().from_bytes(resume_store.get_or_build_artifact(file_path, _docbin_artifact(), build))
+                    .get_docs(self.nlp.vocab))
+
+    def extract_text_from_file(self, file_path: str, data: Optional[bytes] = None) -> str:
+        """Extract text from a PDF or DOCX resume, parsing data in memory instead of reading file_path when given."""
         logger.info(f'extract_text_from_file called with file_path: {file_path}')
         mime = magic.Magic(mime=True)
-        file_type = mime.from_file(file_path)
+        file_type = mime.from_buffer(bytes(data[:2048])) if data is not None else mime.from_file(file_path)
         logger.debug(f'Detected file type: {file_type}')
+        source = io.BytesIO(data) if data is not None else file_path
         if file_type == "application/pdf":
-            text = self._extract_from_pdf(file_path)
+            text = self._extract_from_pdf(source)
         elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            text = self._extract_from_docx(file_path)
+            text = self._extract_from_docx(source)
         else:
             logger.error(f'Unsupported file type: {file_type}')
             raise ValueError(f"Unsupported file type: {file_type}")
         logger.debug(f'Extracted text (first 500 chars): {text[:500]}')
         return text
 
-    def _extract_from_pdf(self, file_path: str) -> str:
-        logger.info(f'_extract_from_pdf called with file_path: {file_path}')
-        with open(file_path, 'rb') as file:
-            pdf = PdfReader(file)
-            text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                logger.debug(f'Extracted page text (first 200 chars): {page_text[:200] if page_text else "None"}')
-                text += page_text
+    def _extract_from_pdf(self, source) -> str:
+        logger.info('_extract_from_pdf called')
+        pdf = PdfReader(source)
+        text = ""
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            logger.debug(f'Extracted page text (first 200 chars): {page_text[:200] if page_text else "None"}')
+            text += page_text
         return text
 
-    def _extract_from_docx(self, file_path: str) -> str:
-        logger.info(f'_extract_from_docx called with file_path: {file_path}')
-        doc = docx.Document(file_path)
+    def _extract_from_docx(self, source) -> str:
+        logger.info('_extract_from_docx called')
+        doc = docx.Document(source)
         text = ""
         for paragraph in doc.paragraphs:
             logger.debug(f'Extracted paragraph: {paragraph.text[:200]}')
             text += paragraph.text + "\n"
         return text
 
-    def parse_resume(self, file_path: str) -> Dict:
+    def parse_resume(self, file_path: str, data: Optional[bytes] = None) -> Dict:
         logger.info(f'parse_resume called with file_path: {file_path}')
-        text = self.extract_text_from_file(file_path)
-        doc = self.nlp(text)
+        text = self._load_text(file_path, data)
+        doc = self._load_doc(file_path, text)
         logger.debug('spaCy doc created')
+        sections = ResumeSections(doc)
+        work_experience = self._extract_experience(sections)
         result = {
             "name": self._extract_name(doc),
             "phone_number": self._extract_phone(text),
             "email": self._extract_email(text),
-            "current_job_title": self._extract_current_job_title(doc),
-            "years_of_experience": self._calculate_years_of_experience(doc),
-            "skills": self._extract_skills(doc),
-            "work_experience": self._extract_experience(doc),
-            "education": self._extract_education(doc),
-            "accolades": self._extract_accolades(doc)
+            "current_job_title": self._extract_current_job_title(sections, work_experience),
+            "years_of_experience": self._calculate_years_of_experience(sections),
+            "skills": self._extract_skills(sections),
+            "work_experience": work_experience,
+            "education": self._extract_education(sections),
+            "accolades": self._extract_accolades(sections)
         }
         logger.info(f'Parsed resume result: {result}')
         return result
@@ -106,97 +331,70 @@ class ResumeParser:
 
     def _extract_email(self, text: str) -> Optional[str]:
         """Extract email address using regex and additional heuristics."""
-        print(f"DEBUG: Attempting to extract email from text:\n{text[:500]}...")  # Print first 500 chars
+        logger.debug(f"Attempting to extract email from text: {text[:500]}...")
 
         # Try to find email with potential spaces anywhere in the address
-        email_with_spaces = re.search(
-            r'([A-Za-z0-9._%+-]+)\s*@\s*([A-Za-z0-9.\s-]+)', text
-        )
+        email_with_spaces = PATTERNS.EMAIL_WITH_SPACES.search(text)
         if email_with_spaces:
             username = email_with_spaces.group(1).replace(" ", "")
             domain = email_with_spaces.group(2).replace(" ", "")
             email = f"{username}@{domain}"
-            print(f"DEBUG: Found email with spaces: {email}")
+            logger.debug(f"Found email with spaces: {email}")
             return email
 
         # Standard email pattern (remove spaces from the text first)
         text_no_spaces = text.replace(" ", "")
-        email_pattern = r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}'
-        match = re.search(email_pattern, text_no_spaces)
+        match = PATTERNS.EMAIL.search(text_no_spaces)
         if match:
-            print(f"DEBUG: Found email using standard pattern: {match.group(0)}")
+            logger.debug(f"Found email using standard pattern: {match.group(0)}")
             return match.group(0)
 
-        # Try keyword-based patterns (as in your code)
-        email_keywords = ["email", "e-mail", "mail", "contact"]
-        for keyword in email_keywords:
-            patterns = [
-                f"{keyword}[:\\s]+([A-Za-z0-9._%+-]+)\\s*@\\s*([A-Za-z0-9.-]+(?:\\s*\\.\\s*[A-Za-z0-9.-]+)*)",
-                f"{keyword}[\\s]*[=]+[\\s]*([A-Za-z0-9._%+-]+)\\s*@\\s*([A-Za-z0-9.-]+(?:\\s*\\.\\s*[A-Za-z0-9.-]+)*)",
-                f"{keyword}[\\s]*[-]+[\\s]*([A-Za-z0-9._%+-]+)\\s*@\\s*([A-Za-z0-9.-]+(?:\\s*\\.\\s*[A-Za-z0-9.-]+)*)"
-            ]
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    username = match.group(1).replace(" ", "")
-                    domain = match.group(2).replace(" ", "")
-                    email = f"{username}@{domain}"
-                    print(f"DEBUG: Found email using pattern '{pattern}': {email}")
-                    return email
+        # Try keyword-based patterns
+        for pattern in PATTERNS.EMAIL_KEYWORD:
+            match = pattern.search(text)
+            if match:
+                username = match.group(1).replace(" ", "")
+                domain = match.group(2).replace(" ", "")
+                email = f"{username}@{domain}"
+                logger.debug(f"Found email using pattern '{pattern.pattern}': {email}")
+                return email
 
         # Try to find email in contact information section
-        contact_section = re.search(
-            r'(?:contact|contact information|contact details)[^@]*?([A-Za-z0-9._%+-]+)\s*@\s*([A-Za-z0-9.-]+(?:\s*\.\s*[A-Za-z0-9.-]+)*)',
-            text, re.IGNORECASE
-        )
+        contact_section = PATTERNS.EMAIL_CONTACT_SECTION.search(text)
         if contact_section:
             username = contact_section.group(1).replace(" ", "")
             domain = contact_section.group(2).replace(" ", "")
             email = f"{username}@{domain}"
-            print(f"DEBUG: Found email in contact section: {email}")
+            logger.debug(f"Found email in contact section: {email}")
             return email
 
-        print("DEBUG: No email found in text")
+        logger.debug("No email found in text")
         return None
 
     def _extract_phone(self, text: str) -> Optional[str]:
         """Extract phone number."""
-        # List of keywords to look for before the phone number
-        phone_keywords = [
-            "phone", "phone no", "phone number", "mobile", "mobile no", "mobile number",
-            "cell", "cell no", "cell number", "tel", "tel no", "telephone", "telephone no",
-            "contact", "contact no", "reach me at", "call", "📞", "📱"
-        ]
-        # Build a regex pattern to match keywords followed by a phone number
-        keyword_pattern = r'(' + '|'.join([re.escape(k) for k in phone_keywords]) + r')[\s:]*([+\d][\d\s\-().]{7,})'
-        match = re.search(keyword_pattern, text, re.IGNORECASE)
+        # Keywords followed by a phone number
+        match = PATTERNS.PHONE_WITH_KEYWORD.search(text.lower())
         if match:
             # Clean up the phone number (remove spaces, dashes, parentheses, etc.)
-            phone = re.sub(r'[^+\d]', '', match.group(2))
+            phone = PATTERNS.PHONE_NON_DIGITS.sub('', match.group(2))
             return phone
         # Fallback: generic phone number pattern (allowing spaces, dashes, parentheses)
-        phone_pattern = r'(\+?\d{1,3}[\s\-]?)?(\(?\d{2,4}\)?[\s\-]?)?\d{2,4}[\s\-]?\d{2,4}[\s\-]?\d{2,4}'
-        match = re.search(phone_pattern, text)
+        match = PATTERNS.PHONE.search(text)
         if match:
-            phone = re.sub(r'[^+\d]', '', match.group(0))
+            phone = PATTERNS.PHONE_NON_DIGITS.sub('', match.group(0))
             return phone
         return None
     
 
-    def _calculate_years_of_experience(self, doc) -> float:
+    def _calculate_years_of_experience(self, sections: ResumeSections) -> float:
         """Calculate total years of experience from text and experience sections."""
-        text = doc.text
+        text = sections.text
 
         # Step 1: Regex for "X years of experience"
-        text_lower = text.lower()
-        patterns = [
-            r'(\d+(?:\.\d+)?)(\s*\+)?\s*years? of experience',
-            r'(\d+(?:\.\d+)?)(\s*\+)?\s*yrs? of experience',
-            r'(\d+(?:\.\d+)?)(\s*\+)?\s*years? experience',
-            r'(\d+(?:\.\d+)?)(\s*\+)?\s*yrs? experience'
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text_lower)
+        text_lower = sections.text_lower
+        for pattern in PATTERNS.YEARS_OF_EXPERIENCE:
+            match = pattern.search(text_lower)
             if match:
                 years = float(match.group(1))
                 if match.group(2):
@@ -204,23 +402,19 @@ class ResumeParser:
                 return years
 
         # Step 2 & 3: Only consider "Experience" sections for date ranges and structured experience
-        experience_section_pattern = re.compile(
-            r'(project experience|professional experience|experience|project details)(.*?)(?=(\n[A-Z][^\n]*:|\Z))',
-            re.IGNORECASE | re.DOTALL
-        )
-        experience_sections = experience_section_pattern.findall(text)
+        if sections.has_section("experience"):
+            experience_sections = [(None, sections.section_text("experience"), None)]
+        else:
+            experience_sections = PATTERNS.EXPERIENCE_SECTION.findall(text)
         total_months = 0
 
         for _, section_text, _ in experience_sections:
             # Step 2: Extract date ranges in this section
-            date_range_pattern = re.compile(
-                r'([A-Za-z]+ \d{4})\s*[-–]\s*([A-Za-z]+ \d{4}|Present|Till Date|Till Now|Current)', re.IGNORECASE
-            )
-            matches = date_range_pattern.findall(section_text)
+            matches = PATTERNS.DATE_RANGE.findall(section_text)
             for start_str, end_str in matches:
                 try:
                     start_date = date_parser.parse(start_str)
-                    if re.search(r'present|till date|till now|current', end_str, re.IGNORECASE):
+                    if PATTERNS.ONGOING.search(end_str):
                         end_date = datetime.now()
                     else:
                         end_date = date_parser.parse(end_str)
@@ -228,7 +422,7 @@ class ResumeParser:
                     if months > 0:
                         total_months += months
                 except Exception as e:
-                    print(f"DEBUG: Failed to parse date range '{start_str} - {end_str}': {e}")
+                    logger.debug(f"Failed to parse date range '{start_str} - {end_str}': {e}")
 
             # Step 3: Structured experience (joining_year, end_year) in this section
             # (If your _extract_experience method can be limited to this section, use it here.
@@ -238,28 +432,14 @@ class ResumeParser:
         total_years = total_months / 12.0
         return round(total_years, 1)
 
-    def _extract_current_job_title(self, doc) -> Optional[str]:
+    def _extract_current_job_title(self, sections: ResumeSections, experience: List[Dict]) -> Optional[str]:
         """Extract current job title."""
-        # List of common job titles
-        job_title_keywords = [
-            "software engineer", "developer", "data scientist", "project manager", "product manager",
-            "consultant", "analyst", "architect", "designer", "qa engineer", "test engineer",
-            "full stack developer", "frontend developer", "backend developer", "devops engineer",
-            "machine learning engineer", "ai engineer", "researcher", "intern", "lead", "manager",
-            "director", "chief", "cto", "ceo", "coo", "founder", "owner", "administrator",
-            "business analyst", "data analyst", "system administrator", "network engineer",
-            "security engineer", "cloud engineer", "solutions architect", "technical lead",
-            "senior engineer", "principal engineer", "staff engineer", "engineering manager"
-        ]
-        
         # First try to find job title from keywords in the text
-        text = doc.text.lower()
-        for title in job_title_keywords:
-            if title in text:
-                return title.title()
+        title = PATTERNS.JOB_TITLES.first(sections.text_lower)
+        if title:
+            return title.title()
         
-        # If no keyword match found, look for current position in work experience
-        experience = self._extract_experience(doc)
+        # If no keyword match found, look for current position in the already extracted work experience
         for exp in experience:
             if (exp.get("end_year") is None and exp.get("position")) or \
                (exp.get("end_year") and str(exp.get("end_year")).strip().lower() == "present"):
@@ -268,29 +448,13 @@ class ResumeParser:
         return None
 
 
-    def _extract_skills(self, doc) -> List[str]:
+    def _extract_skills(self, sections: ResumeSections) -> List[str]:
         """Extract skills using predefined skill list and NLP."""
-        # Common technical skills
-        skill_keywords = {
-            "programming": ["python", "Numbpy", "pandas" "java", "javascript", "c++", "ruby", "php", "swift", "kotlin"],
-            "databases": ["sql", "mysql", "postgresql", "mongodb", "redis", "oracle", "Couchbase", "Cassandra", "NoSql"],
-            "frameworks": ["django", "flask", "react", "angular", "vue", "spring", "spring boot"],
-            "tools": ["git", "docker", "kubernetes", "jenkins", "aws", "azure", "gcp", "postman", "swagger", "rest", "restful", "rest api", "restful api", "maven", "gradle","grafana","splunk"],
-            "languages": ["english", "spanish", "french", "german", "chinese", "japanese"]
-        }
-        
-        skills = set()
-        text_lower = doc.text.lower()
-        
-        for category, keyword_list in skill_keywords.items():
-            for keyword in keyword_list:
-                if keyword in text_lower:
-                    skills.add(keyword)
-        
-        return list(skills)
+        # Skills are scanned across the whole resume, since they are often mentioned under experience
+        return list(PATTERNS.SKILLS.find_all(sections.text_lower))
 
-    def _extract_education(self, doc) -> List[Dict]:
-        """Extract education information."""
+    def _extract_education(self, sections: ResumeSections) -> List[Dict]:
+        """Extract education information from the Education section."""
         education = []
         education_keywords = ["university", "college", "institute", "bachelor", "master", "phd", "b.tech", "m.tech", "b.s.", "m.s."]
         
@@ -302,18 +466,17 @@ class ResumeParser:
         }
         
         # Simple extraction - can be improved with more sophisticated NLP
-        for sent in doc.sents:
-            if any(keyword in sent.text.lower() for keyword in education_keywords):
+        for sent_text, sent_lower in sections.get("education"):
+            if any(keyword in sent_lower for keyword in education_keywords):
                 # Try to extract year using regex
-                year_pattern = r'\b(19|20)\d{2}\b'
-                years = re.findall(year_pattern, sent.text)
+                years = PATTERNS.YEAR.findall(sent_text)
                 
                 # Try to extract degree
                 degree = None
                 degree_type = None
                 for degree_type, patterns in degree_patterns.items():
                     for pattern in patterns:
-                        if pattern in sent.text.lower():
+                        if pattern in sent_lower:
                             degree = pattern
                             degree_type = degree_type
                             break
@@ -321,11 +484,11 @@ class ResumeParser:
                         break
                 
                 # Extract institution name
-                institution = sent.text
-                if "in" in sent.text.lower():
-                    institution = sent.text.split("in")[-1].strip()
-                elif "at" in sent.text.lower():
-                    institution = sent.text.split("at")[-1].strip()
+                institution = sent_text
+                if "in" in sent_lower:
+                    institution = sent_text.split("in")[-1].strip()
+                elif "at" in sent_lower:
+                    institution = sent_text.split("at")[-1].strip()
                 
                 education.append({
                     "institution": institution,
@@ -336,24 +499,23 @@ class ResumeParser:
         
         return education
 
-    def _extract_experience(self, doc) -> List[Dict]:
-        """Extract work experience information."""
+    def _extract_experience(self, sections: ResumeSections) -> List[Dict]:
+        """Extract work experience information from the Experience section."""
         experience = []
         experience_keywords = ["experience", "worked", "job", "position", "role", "company", "employed"]
         
         # Simple extraction - can be improved with more sophisticated NLP
-        for sent in doc.sents:
-            if any(keyword in sent.text.lower() for keyword in experience_keywords):
+        for sent_text, sent_lower in sections.get("experience"):
+            if any(keyword in sent_lower for keyword in experience_keywords):
                 # Try to extract years using regex
-                year_pattern = r'\b(19|20)\d{2}\b'
-                years = re.findall(year_pattern, sent.text)
+                years = PATTERNS.YEAR.findall(sent_text)
                 
                 # Try to extract company name
                 company_keywords = ["at", "with", "in", "for"]
                 company = None
                 for keyword in company_keywords:
-                    if keyword in sent.text.lower():
-                        parts = sent.text.lower().split(keyword)
+                    if keyword in sent_lower:
+                        parts = sent_lower.split(keyword)
                         if len(parts) > 1:
                             company = parts[1].strip().split()[0]
                             break
@@ -362,8 +524,8 @@ class ResumeParser:
                 position_keywords = ["as", "position of", "role of"]
                 position = None
                 for keyword in position_keywords:
-                    if keyword in sent.text.lower():
-                        parts = sent.text.lower().split(keyword)
+                    if keyword in sent_lower:
+                        parts = sent_lower.split(keyword)
                         if len(parts) > 1:
                             position = parts[1].strip().split()[0]
                             break
@@ -373,26 +535,24 @@ class ResumeParser:
                     "position": position,
                     "joining_year": int(years[0]) if years else None,
                     "end_year": int(years[1]) if len(years) > 1 else None,
-                    "description": sent.text
+                    "description": sent_text
                 })
         
         return experience
 
 
-    def _extract_accolades(self, doc) -> List[Dict]:
-        """Extract accolades and certifications."""
+    def _extract_accolades(self, sections: ResumeSections) -> List[Dict]:
+        """Extract accolades and certifications from the Certifications section."""
         accolades = []
         accolade_keywords = ["certified", "certification", "award", "achievement", "accomplishment"]
         
-        for sent in doc.sents:
-            if any(keyword in sent.text.lower() for keyword in accolade_keywords):
+        for sent_text, sent_lower in sections.get("certifications"):
+            if any(keyword in sent_lower for keyword in accolade_keywords):
                 # Try to extract years using regex
-                year_pattern = r'\b(19|20)\d{2}\b'
-                years = re.findall(year_pattern, sent.text)
+                years = PATTERNS.YEAR.findall(sent_text)
                 
                 # Try to extract URL if present
-                url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-                urls = re.findall(url_pattern, sent.text)
+                urls = PATTERNS.URL.findall(sent_text)
                 
                 accolades.append({
                     "url": urls[0] if urls else "",
@@ -400,4 +560,4 @@ class ResumeParser:
                     "end_year": int(years[1]) if len(years) > 1 else None
                 })
         
-        return accolades 
\ No newline at end of file
+        return accolades
\ No newline at end of file
@@ -1 +1 @@
-from .resume import UploadResponse, AnalyzeRequest, AnalyzeResponse, ErrorResponse 
\ No newline at end of file
+from .resume import UploadResponse, AnalyzeRequest, AnalyzeResponse, BulkIngestResponse, ErrorResponse 
\ No newline at end of file
@@ -0,0 +1,14 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+
+
+class JobPageResponse(BaseModel):
+    """One page of GET /jobs. Each job holds "jobid" plus the requested fields."""
+    jobs: List[Dict[str, Any]]
+    # Pass as cursor to get the next page; null on the last page
+    next_cursor: Optional[str] = None
+
+
+class JobSearchResultsResponse(BaseModel):
+    """GET /jobs/search: best match first; each job holds "jobid", the requested fields and "rank"."""
+    jobs: List[Dict[str, Any]]
@@ -19,6 +19,10 @@ class AnalyzeResponse(BaseModel):
     session_id: str
     extracted_info: dict
 
+class BulkIngestResponse(BaseModel):
+    job_id: str
+    progress: dict
+
 class ErrorResponse(BaseModel):
     detail: str 
 
@@ -27,6 +31,7 @@ class JobSearchRequest(BaseModel):
     session_id: str
     job_title: Optional[str] = None
     location: str
+    locations: Optional[List[str]] = None  # Searched concurrently instead of location when given
     num_pages: int = 3
 
 class JobResponse(BaseModel):
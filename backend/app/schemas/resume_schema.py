@@ -2,6 +2,9 @@ from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 
+# Bump when the extraction instructions change, so cached LLM results from the old prompt are not reused
+PROMPT_VERSION = "1"
+
 RESUME_SCHEMA = {
     "$schema": "https://json-schema.org/draft/2020-12/schema",
     "title": "ResumeData",
@@ -0,0 +1,384 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, UTC
+from typing import Awaitable, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.models import UserDetails, Academics, Accolades, WorkExperience, SessionIdTable
+from app.resume_parser import parse_resume_file
+from app.services.extraction_pool import extraction_pool
+from app.services.profile_sync_service import profile_from_llm, profile_from_parser
+from app.services.resume_llm_service import ResumeLLMService, ResumeExtractionBatcher, aextract_text_from_file
+from app.services.resume_store import ResumeBlobStore, resume_store
+
+logger = logging.getLogger('custom_logger')
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+
+@contextmanager
+def open_resume_source(source: str) -> Iterator[List[Tuple[str, Callable[[], bytes]]]]:
+    """
+    List every resume in a zip file or directory tree as (name, read) pairs, in a stable order.
+    Files with other extensions, and files larger than MAX_UPLOAD_BYTES, are left out.
+    A zip stays open, and its members readable, until the block exits.
+    """
+    max_bytes = settings.MAX_UPLOAD_BYTES
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            files = []
+            for info in sorted(archive.infolist(), key=lambda i: i.filename):
+                if info.is_dir() or not info.filename.lower().endswith(RESUME_EXTENSIONS):
+                    continue
+                if info.file_size > max_bytes:
+                    logger.warning(f"Skipping {info.filename}: larger than {max_bytes} bytes")
+                    continue
+                # Cap the read too, the header's size may lie
+                files.append((info.filename, lambda info=info: archive.open(info).read(max_bytes)))
+            yield files
+        return
+
+    if not os.path.isdir(source):
+        raise ValueError(f"Not a zip file or directory: {source}")
+    files = []
+    for root, dirs, filenames in os.walk(source):
+        dirs.sort()
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(RESUME_EXTENSIONS):
+                continue
+            path = os.path.join(root, filename)
+            if os.path.getsize(path) > max_bytes:
+                logger.warning(f"Skipping {path}: larger than {max_bytes} bytes")
+                continue
+
+            def read(path=path):
+                with open(path, "rb") as f:
+                    return f.read()
+            files.append((os.path.relpath(path, source), read))
+    yield files
+
+
+class BulkIngestProgress:
+    """Counters of a bulk ingestion run, safe to report while it is in flight."""
+
+    def __init__(self):
+        self.status = "running"
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.seen = 0
+        self.created = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors: List[Dict[str, str]] = []
+
+    def record_error(self, name: str, error: Exception) -> None:
+        self.failed += 1
+        # Keep the report small for runs with many bad files
+        if len(self.errors) < 50:
+            self.errors.append({"file": name, "error": str(error)})
+
+    def to_dict(self) -> dict:
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        processed = self.created + self.skipped + self.failed
+        return {
+            "status": self.status,
+            "seen": self.seen,
+            "processed": processed,
+            "created": self.created,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 1),
+            "files_per_minute": round(processed * 60 / elapsed, 1) if elapsed > 0 else None,
+            "errors": self.errors
+        }
+
+
+class BatchResult(NamedTuple):
+    """What _write_batch did; applied to the progress counters on the event loop."""
+    committed: set
+    skipped: int
+    errors: List[Tuple[str, Exception]]
+
+
+class BulkIngestService:
+    """
+    Onboards a batch of resumes from a zip file or directory.
+
+    Files are stored in the resume blob store and parsed by `workers` concurrent tasks (the rule-based
+    parser in the extraction process pool, or the LLM). Parsed resumes are written in batches of
+    `batch_size`: one executemany per table creates the users, their sessions and their education,
+    accolade and work experience rows. Resumes whose email is already registered are skipped.
+    After every batch the names of the finished files are saved to the checkpoint file, so a rerun
+    with the same checkpoint picks up where the last one stopped.
+    """
+
+    def __init__(self, session_factory=None, use_llm: bool = False, workers: int = None, batch_size: int = None,
+                 checkpoint_path: Optional[str] = None, store: ResumeBlobStore = None,
+                 extract: Callable[[str, bytes], Awaitable[dict]] = None):
+        self._session_factory = session_factory
+        self.use_llm = use_llm
+        self.workers = workers or settings.BULK_INGEST_WORKERS
+        self.batch_size = batch_size or settings.BULK_INGEST_BATCH_SIZE
+        self.checkpoint_path = checkpoint_path
+        self.store = store or resume_store
+        self._llm_service = ResumeLLMService(api_key=os.getenv("OPENAI_API_KEY")) if use_llm else None
+        # Concurrent workers' LLM extractions are packed into batched requests
+        self._llm_batcher = ResumeExtractionBatcher(self._llm_service) if use_llm else None
+        self._extract = extract or (self._extract_with_llm if use_llm else self._extract_with_parser)
+        self.progress = BulkIngestProgress()
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    async def run(self, source: str, on_progress: Callable[[BulkIngestProgress], None] = None) -> BulkIngestProgress:
+        done = self._load_checkpoint()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 2)
+        batch: List[dict] = []
+        batch_lock = asyncio.Lock()
+
+        async def flush():
+            if not batch:
+                return
+            records = list(batch)
+            batch.clear()
+            result = await asyncio.to_thread(self._write_batch, records)
+            # The counters are only touched on the event loop, never from the writer thread
+            self.progress.created += len(result.committed)
+            self.progress.skipped += result.skipped
+            for name, error in result.errors:
+                self.progress.record_error(name, error)
+            # Blobs of skipped and conflicting resumes are not referenced by any user
+            unused = []
+            for record in records:
+                if record.get("resume_location"):
+                    if record["file"] in result.committed:
+                        self.store.settle(record["resume_location"])
+                    else:
+                        unused.append(record["resume_location"])
+            if unused:
+                await asyncio.to_thread(self._release_blobs, unused)
+            # Failed files stay out of the checkpoint so a rerun tries them again
+            done.update(record["file"] for record in records if not record.get("failed"))
+            await asyncio.to_thread(self._save_checkpoint, done)
+            if on_progress:
+                on_progress(self.progress)
+
+        async def worker():
+            while (item := await queue.get()) is not None:
+                name, read = item
+                try:
+                    record = await self._process(name, read)
+                except Exception as e:
+                    logger.warning(f"Bulk ingest failed for {name}: {e}")
+                    self.progress.record_error(name, e)
+                    record = {"file": name, "failed": True}
+                async with batch_lock:
+                    batch.append(record)
+                    if len(batch) >= self.batch_size:
+                        await flush()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(self.workers)]
+        try:
+            with open_resume_source(source) as files:
+                for name, read in files:
+                    self.progress.seen += 1
+                    if name in done:
+                        self.progress.skipped += 1
+                        continue
+                    await queue.put((name, read))
+                for _ in tasks:
+                    await queue.put(None)
+                await asyncio.gather(*tasks)
+            async with batch_lock:
+                await flush()
+            self.progress.status = "completed"
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            self.progress.status = "failed"
+            raise
+        finally:
+            self.progress.finished_at = time.time()
+            if on_progress:
+                on_progress(self.progress)
+        return self.progress
+
+    async def _process(self, name: str, read: Callable[[], bytes]) -> dict:
+        data = await asyncio.to_thread(read)
+        stored = await asyncio.to_thread(
+            self.store.put, data, hashlib.sha256(data).hexdigest(), os.path.splitext(name)[1]
+        )
+        try:
+            record = await self._extract(stored.path, stored.data)
+            if not record.get("name") or not record.get("email"):
+                raise ValueError("Name and email are required")
+        except Exception:
+            await asyncio.to_thread(self._release_blobs, [stored.path])
+            raise
+        return {"file": name, "resume_location": stored.path, **record}
+
+    async def _extract_with_parser(self, path: str, data: bytes) -> dict:
+        info = await extraction_pool.run(parse_resume_file, path, data)
+        return profile_from_parser(info)
+
+    async def _extract_with_llm(self, path: str, data: bytes) -> dict:
+        text = await aextract_text_from_file(path, data)
+        info = await self._llm_batcher.extract(text)
+        return profile_from_llm(info, self._llm_service)
+
+    def _release_blobs(self, paths: List[str]) -> None:
+        with self._session() as db:
+            for path in paths:
+                self.store.release(path, db)
+
+    def _write_batch(self, records: List[dict]) -> BatchResult:
+        """
+        Insert a batch of parsed resumes, one executemany per table; per-record fallback on conflicts.
+        Runs in a worker thread, so it reports what happened instead of updating self.progress.
+        """
+        records = [record for record in records if not record.get("failed")]
+        committed, skipped, errors = set(), 0, []
+        if not records:
+            return BatchResult(committed, skipped, errors)
+        with self._session() as db:
+            emails = {record["email"] for record in records}
+            existing = set(db.scalars(select(UserDetails.email).where(UserDetails.email.in_(emails))))
+            fresh = []
+            for record in records:
+                if record["email"] in existing:
+                    skipped += 1
+                    continue
+                existing.add(record["email"])
+                fresh.append(record)
+            if not fresh:
+                return BatchResult(committed, skipped, errors)
+            try:
+                self._insert_records(db, fresh)
+                db.commit()
+                return BatchResult({record["file"] for record in fresh}, skipped, errors)
+            except IntegrityError as e:
+                db.rollback()
+                logger.warning(f"Bulk ingest batch conflicted, inserting one by one: {e}")
+            for record in fresh:
+                try:
+                    self._insert_records(db, [record])
+                    db.commit()
+                    committed.add(record["file"])
+                except IntegrityError as e:
+                    db.rollback()
+                    errors.append((record["file"], e))
+        return BatchResult(committed, skipped, errors)
+
+    @staticmethod
+    def _insert_records(db, records: List[dict]) -> None:
+        now = datetime.now(UTC)
+        users, sessions, academics, accolades, work_experience = [], [], [], [], []
+        for record in records:
+            user_id = uuid.uuid4()
+            users.append({
+                "id": user_id,
+                "name": record["name"],
+                "email": record["email"],
+                "contact_no": record.get("contact_no"),
+                "current_job_title": record.get("current_job_title"),
+                "years_of_exp": record.get("years_of_exp"),
+                "skills": record.get("skills"),
+                "resume_location": record["resume_location"],
+                "created_at": now,
+                "updated_at": now,
+                "is_active": True,
+                "parsed_date": now
+            })
+            sessions.append({
+                "session_id": uuid.uuid4(),
+                "user_id": user_id,
+                "session_token": str(uuid.uuid4()),
+                "created_at": now,
+                "expires_at": now + timedelta(days=1),
+                "is_valid": True
+            })
+            academics.extend({"id": uuid.uuid4(), "user_id": user_id, **row} for row in record["academics"])
+            accolades.extend({"id": uuid.uuid4(), "user_id": user_id, **row} for row in record["accolades"])
+            work_experience.extend({"id": uuid.uuid4(), "user_id": user_id, **row} for row in record["work_experience"])
+
+        db.execute(insert(UserDetails), users)
+        db.execute(insert(SessionIdTable), sessions)
+        for model, rows in ((Academics, academics), (Accolades, accolades), (WorkExperience, work_experience)):
+            if rows:
+                db.execute(insert(model), rows)
+
+    def _load_checkpoint(self) -> set:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return set()
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            return set(json.load(f).get("done", []))
+
+    def _save_checkpoint(self, done: set) -> None:
+        if not self.checkpoint_path:
+            return
+        partial_path = f"{self.checkpoint_path}.part"
+        with open(partial_path, "w", encoding="utf-8") as f:
+            json.dump({"done": sorted(done), "progress": self.progress.to_dict()}, f)
+        os.replace(partial_path, self.checkpoint_path)
+
+
+# Bulk jobs started through the API, by job id; progress is kept in memory by the worker that runs them.
+# Finished jobs stay pollable for BULK_INGEST_JOB_TTL_SECONDS, and at most BULK_INGEST_MAX_FINISHED_JOBS are kept.
+bulk_ingest_jobs: Dict[str, BulkIngestService] = {}
+_bulk_ingest_tasks: Dict[str, asyncio.Task] = {}
+
+
+def evict_finished_jobs(now: float = None) -> int:
+    """Forget finished bulk jobs past their TTL, then the oldest ones over the cap. Returns how many were dropped."""
+    now = time.time() if now is None else now
+    finished = sorted(
+        ((service.progress.finished_at, job_id) for job_id, service in bulk_ingest_jobs.items()
+         if service.progress.finished_at is not None and job_id not in _bulk_ingest_tasks),
+        reverse=True
+    )
+    expired = [job_id for index, (finished_at, job_id) in enumerate(finished)
+               if now - finished_at > settings.BULK_INGEST_JOB_TTL_SECONDS
+               or index >= settings.BULK_INGEST_MAX_FINISHED_JOBS]
+    for job_id in expired:
+        del bulk_ingest_jobs[job_id]
+    return len(expired)
+
+
+def start_bulk_ingest(source: str, use_llm: bool, checkpoint_key: str, cleanup_path: Optional[str] = None) -> str:
+    """
+    Run a bulk ingestion in the background and return its job id.
+    The checkpoint is keyed by checkpoint_key, so ingesting the same source again resumes the previous run.
+    """
+    checkpoint_dir = os.path.join(settings.UPLOAD_DIR, "bulk")
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    service = BulkIngestService(use_llm=use_llm, checkpoint_path=os.path.join(checkpoint_dir, f"{checkpoint_key}.json"))
+    evict_finished_jobs()
+    job_id = str(uuid.uuid4())
+    bulk_ingest_jobs[job_id] = service
+
+    async def run():
+        try:
+            await service.run(source)
+        except Exception as e:
+            logger.error(f"Bulk ingest job {job_id} failed: {e}", exc_info=True)
+        finally:
+            _bulk_ingest_tasks.pop(job_id, None)
+            evict_finished_jobs()
+            if cleanup_path and os.path.exists(cleanup_path):
+                os.remove(cleanup_path)
+
+    _bulk_ingest_tasks[job_id] = asyncio.create_task(run())
+    return job_id
@@ -0,0 +1,134 @@
+import copy
+import hashlib
+import logging
+from datetime import datetime, timedelta, UTC
+from typing import Optional
+
+from sqlalchemy import delete, select
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.cache import ResumeExtractionCache
+
+logger = logging.getLogger('custom_logger')
+
+
+class ExtractionCacheService:
+    """
+    Two-tier cache for LLM resume extraction results.
+
+    Results are keyed by a SHA-256 of the extracted resume text, the model name and the prompt/schema
+    version, so the same resume is only sent to the LLM once per model and prompt. Lookups hit an
+    in-process LRU first and then the resume_extraction_cache table. The table uses its own short-lived
+    session, so a cache failure never touches the caller's transaction; it is logged and treated as a miss.
+    """
+
+    def __init__(self, backend: str = "db", ttl_seconds: int = 30 * 24 * 3600,
+                 max_entries: int = 10000, memory_entries: int = 256, session_factory=None):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory = TTLCache(max_entries=memory_entries if backend != "none" else 0, ttl_seconds=ttl_seconds)
+        self._session_factory = session_factory
+        self._writes_since_prune = 0
+
+    @staticmethod
+    def make_key(resume_text: str, model: str, prompt_version: str) -> str:
+        digest = hashlib.sha256()
+        for part in (model, prompt_version, resume_text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a copy of the cached extraction for key, or None."""
+        if self.backend == "none":
+            return None
+        data = self.memory.get(key)
+        if data is None and self.backend == "db":
+            data = self._get_from_db(key)
+            if data is not None:
+                self.memory.set(key, data)
+        if data is not None:
+            logger.info(f"Resume extraction cache hit: {key[:12]}")
+            return copy.deepcopy(data)
+        return None
+
+    def set(self, key: str, data: dict, model: str, prompt_version: str) -> None:
+        if self.backend == "none":
+            return
+        self.memory.set(key, copy.deepcopy(data))
+        if self.backend == "db":
+            self._set_in_db(key, data, model, prompt_version)
+
+    def _get_from_db(self, key: str) -> Optional[dict]:
+        try:
+            with self._session() as db:
+                row = db.get(ResumeExtractionCache, key)
+                if row is None:
+                    return None
+                now = datetime.now(UTC)
+                created_at = row.created_at if row.created_at.tzinfo else row.created_at.replace(tzinfo=UTC)
+                if created_at + timedelta(seconds=self.ttl_seconds) <= now:
+                    db.delete(row)
+                    db.commit()
+                    return None
+                row.hit_count = (row.hit_count or 0) + 1
+                row.last_accessed_at = now
+                data = row.data
+                db.commit()
+                return data
+        except Exception as e:
+            logger.warning(f"Resume extraction cache read failed: {e}")
+            return None
+
+    def _set_in_db(self, key: str, data: dict, model: str, prompt_version: str) -> None:
+        try:
+            with self._session() as db:
+                now = datetime.now(UTC)
+                db.merge(ResumeExtractionCache(
+                    cache_key=key,
+                    model=model,
+                    prompt_version=prompt_version,
+                    data=data,
+                    hit_count=0,
+                    created_at=now,
+                    last_accessed_at=now
+                ))
+                db.commit()
+                self._writes_since_prune += 1
+                # Pruning scans the table, so only do it every so often
+                if self._writes_since_prune >= 100:
+                    self._writes_since_prune = 0
+                    self.prune(db)
+        except Exception as e:
+            logger.warning(f"Resume extraction cache write failed: {e}")
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, **self.memory.stats()}
+
+    def prune(self, db) -> None:
+        """Delete expired rows, then the least recently used rows beyond max_entries."""
+        cutoff = datetime.now(UTC) - timedelta(seconds=self.ttl_seconds)
+        db.execute(delete(ResumeExtractionCache).where(ResumeExtractionCache.created_at < cutoff))
+        keep = (
+            select(ResumeExtractionCache.cache_key)
+            .order_by(ResumeExtractionCache.last_accessed_at.desc())
+            .limit(self.max_entries)
+        )
+        db.execute(delete(ResumeExtractionCache).where(ResumeExtractionCache.cache_key.not_in(keep)))
+        db.commit()
+
+
+extraction_cache = ExtractionCacheService(
+    backend=settings.LLM_CACHE_BACKEND,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    memory_entries=settings.LLM_CACHE_MEMORY_ENTRIES
+)
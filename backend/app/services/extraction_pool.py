@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.constants.messages import ERROR_MESSAGES
+from app.core.config import settings
+
+logger = logging.getLogger('custom_logger')
+
+
+def _init_worker(preload_nlp: bool) -> None:
+    """Load the spaCy pipeline once per worker instead of once per task."""
+    if not preload_nlp:
+        return
+    try:
+        from app.resume_parser import get_nlp
+        get_nlp()
+    except Exception as e:
+        # Tasks that need the model will fail with the real error; text extraction still works
+        logger.warning(f"Extraction worker could not preload spaCy: {e}")
+
+
+class ExtractionPool:
+    """
+    Process pool for CPU-bound resume work (PDF/DOCX text extraction, spaCy parsing).
+
+    Tasks run in "spawn"ed worker processes that preload spaCy, so the event loop stays free and
+    extraction uses every core. At most max_pending tasks are submitted at once; further callers
+    wait for a slot. A task that runs past task_timeout, or a worker that dies (e.g. on a malformed
+    PDF), tears the pool down and a fresh one is started on the next submit. Tasks that were caught
+    in someone else's crash are retried once, so only the file that keeps crashing fails.
+    With max_workers=0 tasks run in a thread instead, which keeps tests and local runs simple.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, task_timeout: float, preload_nlp: bool = True):
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, 1)
+        self.task_timeout = task_timeout
+        self.preload_nlp = preload_nlp
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.preload_nlp,)
+            )
+            logger.info(f"Extraction pool started with {self.max_workers} workers")
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        return self._semaphore
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        """Kill the workers of a timed-out or broken pool; the next submit starts a new one."""
+        if self._executor is not executor:
+            return
+        self._executor = None
+        self.restarts += 1
+        # A hung worker never returns, so shutdown() alone would leave it running
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run fn(*args) in a worker process and return its result. fn must be a module-level function.
+
+        Raises:
+            ValueError: If the task timed out or keeps crashing its worker
+        """
+        async with self._get_semaphore():
+            self.pending += 1
+            try:
+                if self.max_workers <= 0:
+                    result = await asyncio.wait_for(asyncio.to_thread(fn, *args), self.task_timeout)
+                else:
+                    result = await self._run_in_pool(fn, *args)
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.pending -= 1
+            self.completed += 1
+            return result
+
+    async def _run_in_pool(self, fn: Callable[..., Any], *args) -> Any:
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(executor, fn, *args), self.task_timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                logger.error(f"Extraction task {fn.__name__} timed out after {self.task_timeout}s")
+                self._discard(executor)
+                raise ValueError(ERROR_MESSAGES.EXTRACTION_TIMED_OUT)
+            except BrokenProcessPool:
+                self.crashes += 1
+                logger.error(f"Extraction worker crashed running {fn.__name__} (attempt {attempt + 1})")
+                self._discard(executor)
+        raise ValueError(ERROR_MESSAGES.UNPARSEABLE_FILE)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "restarts": self.restarts
+        }
+
+
+extraction_pool = ExtractionPool(
+    max_workers=settings.EXTRACTION_POOL_WORKERS,
+    max_pending=settings.EXTRACTION_POOL_MAX_PENDING,
+    task_timeout=settings.EXTRACTION_TASK_TIMEOUT_SECONDS
+)
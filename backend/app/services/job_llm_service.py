@@ -48,7 +48,7 @@ class JobLLMService:
                 "requirements": requirements,  # Now a list
                 "posted_date": job.get("posted_date"),
                 "application_url": job.get("application_url"),
-                "match_score": None,  # Optional field
+                "match_score": job.get("match_score"),  # Set by JobMatchService when ranked
                 "skills_match": job.get("skills_required") if isinstance(job.get("skills_required"), list) else []
             }
             mapped_jobs.append(mapped_job)
@@ -0,0 +1,164 @@
+import re
+import uuid
+from typing import List, Dict, Any, Optional
+import logging
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.base import utc_now
+from app.models.job import MatchedJobs
+
+logger = logging.getLogger('custom_logger')
+
+_NORMALIZE_RE = re.compile(r'[^a-z0-9+#.]+')
+
+
+def normalize_skill(skill: Any) -> str:
+    """Lowercase a skill and collapse punctuation/whitespace so 'Node.js ' and 'node.js' share a term."""
+    if not isinstance(skill, str):
+        return ""
+    return _NORMALIZE_RE.sub(" ", skill.lower()).strip(" .")
+
+
+class JobMatchService:
+    """
+    Scores a batch of jobs against a user's skills using sparse skill vectors.
+
+    Every job in the batch is mapped onto a vocabulary shared with the user's skills, so
+    all scores come out of a single sparse matrix-vector product instead of per-pair loops.
+    Usage: JobMatchService(user.skills).rank_jobs(jobs) or .match_and_save(jobs, db, user_id).
+    """
+
+    def __init__(self, user_skills: Optional[List[str]]):
+        self.user_terms = sorted({t for t in (normalize_skill(s) for s in (user_skills or [])) if t})
+        # User skills also match inside longer requirement phrases ("5+ years of Python")
+        if self.user_terms:
+            alternation = "|".join(re.escape(t) for t in sorted(self.user_terms, key=len, reverse=True))
+            self._user_term_re = re.compile(r'(?<![a-z0-9])(' + alternation + r')(?![a-z0-9])')
+        else:
+            self._user_term_re = None
+
+    def _job_terms(self, job: Dict[str, Any]) -> set:
+        """Collect the normalized skill terms of a single job."""
+        skills = job.get("skills_required")
+        if not isinstance(skills, list):
+            skills = []
+        terms = {t for t in (normalize_skill(s) for s in skills) if t}
+        if self._user_term_re is not None and terms:
+            terms.update(self._user_term_re.findall(" | ".join(terms)))
+        return terms
+
+    def vectorize(self, jobs: List[Dict[str, Any]]):
+        """
+        Build the binary job-by-skill matrix and the user vector over a shared vocabulary.
+
+        Returns:
+            tuple: (jobs_matrix as CSR, user_vector as ndarray, vocabulary list)
+        """
+        vocab: Dict[str, int] = {term: i for i, term in enumerate(self.user_terms)}
+        indptr = [0]
+        indices: List[int] = []
+        for job in jobs:
+            for term in self._job_terms(job):
+                col = vocab.get(term)
+                if col is None:
+                    col = vocab[term] = len(vocab)
+                indices.append(col)
+            indptr.append(len(indices))
+
+        jobs_matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int32)),
+            shape=(len(jobs), len(vocab)),
+        )
+        user_vector = np.zeros(len(vocab), dtype=np.float32)
+        user_vector[:len(self.user_terms)] = 1.0
+        vocabulary = [None] * len(vocab)
+        for term, col in vocab.items():
+            vocabulary[col] = term
+        return jobs_matrix, user_vector, vocabulary
+
+    def score_jobs(self, jobs: List[Dict[str, Any]]):
+        """
+        Score all jobs at once using cosine similarity between binary skill vectors.
+
+        Returns:
+            tuple: (scores as ndarray in the 0-100 range, list of matched skills per job)
+        """
+        if not jobs:
+            return np.zeros(0, dtype=np.float32), []
+        jobs_matrix, user_vector, vocabulary = self.vectorize(jobs)
+        overlap = jobs_matrix @ user_vector
+        job_norms = np.sqrt(np.diff(jobs_matrix.indptr)).astype(np.float32)
+        denominator = job_norms * np.float32(np.sqrt(len(self.user_terms)))
+        scores = np.divide(overlap, denominator, out=np.zeros_like(overlap), where=denominator > 0)
+        scores = np.round(scores * 100.0, 1)
+
+        # Matched terms are the user-vocabulary columns (first len(user_terms)) present in each row
+        matched_matrix = jobs_matrix[:, :len(self.user_terms)].tocsr()
+        matched_on = [
+            [vocabulary[c] for c in sorted(matched_matrix.indices[matched_matrix.indptr[i]:matched_matrix.indptr[i + 1]])]
+            for i in range(len(jobs))
+        ]
+        return scores, matched_on
+
+    def rank_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Set match_score/matched_on on each job and return the jobs sorted best match first."""
+        scores, matched_on = self.score_jobs(jobs)
+        for job, score, matched in zip(jobs, scores.tolist(), matched_on):
+            job["match_score"] = score
+            job["matched_on"] = matched
+        order = np.argsort(-scores, kind="stable")
+        return [jobs[i] for i in order]
+
+    def save_matches_to_db(self, jobs: List[Dict[str, Any]], db: Session, user_id: str) -> None:
+        """
+        Upsert one MatchedJobs row per scored job in a single executemany.
+        Jobs are shared across searches, so re-matching a job the user already has updates that row.
+
+        Args:
+            jobs (List[Dict]): Jobs already scored by rank_jobs
+            db (Session): Database session
+            user_id (str): The user the jobs were matched for
+        """
+        if not jobs:
+            return
+        try:
+            matched_at = utc_now()
+            rows = {}
+            for job in jobs:
+                job_id = uuid.UUID(str(job["job_id"]))
+                rows.setdefault(job_id, {
+                    "id": uuid.uuid4(),
+                    "user_id": uuid.UUID(str(user_id)),
+                    "job_id": job_id,
+                    "match_score": job.get("match_score"),
+                    "matched_at": matched_at,
+                    "status": "matched",
+                    "matched_on": job.get("matched_on") or [],
+                    "match_details": {
+                        "method": "skill_cosine",
+                        "matched_count": len(job.get("matched_on") or []),
+                        "user_skill_count": len(self.user_terms),
+                    },
+                })
+            stmt = pg_insert(MatchedJobs)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_matched_jobs_user_job",
+                set_={column: stmt.excluded[column] for column in ("match_score", "matched_at", "matched_on", "match_details")}
+            )
+            db.execute(stmt, list(rows.values()))
+            db.commit()
+            logger.info(f"Saved {len(rows)} job matches for user_id: {user_id}")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error saving job matches: {str(e)}")
+            raise ValueError(f"Failed to save job matches: {str(e)}")
+
+    def match_and_save(self, jobs: List[Dict[str, Any]], db: Session, user_id: str) -> List[Dict[str, Any]]:
+        """Rank the jobs for the user, persist the matches and return the ranked jobs."""
+        ranked = self.rank_jobs(jobs)
+        self.save_matches_to_db(ranked, db, user_id)
+        return ranked
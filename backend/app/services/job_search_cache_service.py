@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import datetime, timedelta, UTC
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import delete, select
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.cache import JobSearchCache
+
+logger = logging.getLogger('custom_logger')
+
+
+def normalize_query_part(value: Optional[str]) -> str:
+    """Lowercase and collapse whitespace so 'Software  Engineer' and 'software engineer' share an entry."""
+    return " ".join((value or "").lower().split())
+
+
+class JobSearchCacheService:
+    """
+    TTL'd, size-bounded cache of raw SerpApi result pages with stale-while-revalidate.
+
+    Pages are keyed by normalized job title, location and page token. Lookups hit an in-process LRU
+    first and then, with the "db" backend, the job_search_cache table shared by all workers. A page
+    younger than fresh_seconds is returned as is. Up to stale_seconds it is still returned, while a
+    single background refresh per key fetches a new copy. Older pages are misses. Every
+    prune_every writes to the table, rows older than stale_seconds are deleted and only the newest
+    max_entries are kept.
+    """
+
+    def __init__(self, backend: str = "db", fresh_seconds: int = 900, stale_seconds: int = 3600,
+                 memory_entries: int = 1024, max_entries: int = 5000, prune_every: int = 100,
+                 session_factory=None):
+        self.backend = backend
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = max(stale_seconds, fresh_seconds)
+        self.memory = TTLCache(max_entries=memory_entries if backend != "none" else 0, ttl_seconds=self.stale_seconds)
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._session_factory = session_factory
+        self._writes_since_prune = 0
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.pruned_rows = 0
+        self.last_pruned_at: Optional[float] = None
+
+    @staticmethod
+    def make_key(job_title: str, location: Optional[str], page_token: Optional[str]) -> str:
+        parts = (normalize_query_part(job_title), normalize_query_part(location), page_token or "")
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    async def get_or_fetch(self, job_title: str, location: Optional[str], page_token: Optional[str],
+                           fetch: Callable[[], Awaitable[dict]]) -> dict:
+        """Return the cached page for the query, calling fetch() on a miss or to revalidate a stale page."""
+        if self.backend == "none":
+            self.misses += 1
+            return await fetch()
+
+        key = self.make_key(job_title, location, page_token)
+        entry = self.memory.get(key)
+        if entry is None and self.backend == "db":
+            entry = await asyncio.to_thread(self._get_from_db, key)
+            if entry is not None:
+                self._remember(key, *entry)
+
+        if entry is not None:
+            response, fetched_at = entry
+            age = time.time() - fetched_at
+            if age < self.fresh_seconds:
+                self.hits += 1
+                return response
+            if age < self.stale_seconds:
+                self.stale_hits += 1
+                self._schedule_refresh(key, job_title, location, page_token, fetch)
+                return response
+
+        self.misses += 1
+        response = await fetch()
+        await self._store(key, job_title, location, page_token, response)
+        return response
+
+    def _remember(self, key: str, response: dict, fetched_at: float) -> None:
+        remaining = self.stale_seconds - (time.time() - fetched_at)
+        if remaining > 0:
+            self.memory.set(key, (response, fetched_at), ttl_seconds=remaining)
+
+    async def _store(self, key: str, job_title: str, location: Optional[str], page_token: Optional[str],
+                     response: dict) -> None:
+        # SerpApi errors (bad key, quota) are returned as a page body and must not be cached
+        if "error" in response:
+            return
+        fetched_at = time.time()
+        self._remember(key, response, fetched_at)
+        if self.backend == "db":
+            await asyncio.to_thread(self._set_in_db, key, job_title, location, page_token, response, fetched_at)
+
+    def _schedule_refresh(self, key: str, job_title: str, location: Optional[str], page_token: Optional[str],
+                          fetch: Callable[[], Awaitable[dict]]) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                response = await fetch()
+                await self._store(key, job_title, location, page_token, response)
+                self.refreshes += 1
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Background refresh of cached job search page failed: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def _get_from_db(self, key: str):
+        try:
+            with self._session() as db:
+                row = db.get(JobSearchCache, key)
+                if row is None:
+                    return None
+                fetched_at = row.fetched_at if row.fetched_at.tzinfo else row.fetched_at.replace(tzinfo=UTC)
+                return row.response, fetched_at.timestamp()
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Job search cache read failed: {e}")
+            return None
+
+    def _set_in_db(self, key: str, job_title: str, location: Optional[str], page_token: Optional[str],
+                   response: dict, fetched_at: float) -> None:
+        try:
+            with self._session() as db:
+                db.merge(JobSearchCache(
+                    cache_key=key,
+                    job_title=normalize_query_part(job_title),
+                    location=normalize_query_part(location),
+                    page_token=page_token,
+                    response=response,
+                    fetched_at=datetime.fromtimestamp(fetched_at, UTC)
+                ))
+                db.commit()
+                self._writes_since_prune += 1
+                # Pruning scans the table, so only do it every so often
+                if self._writes_since_prune >= self.prune_every:
+                    self._writes_since_prune = 0
+                    self.prune(db)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Job search cache write failed: {e}")
+
+    def prune(self, db) -> int:
+        """Delete rows past the stale window, then the oldest rows beyond max_entries. Returns the rows deleted."""
+        cutoff = datetime.now(UTC) - timedelta(seconds=self.stale_seconds)
+        deleted = db.execute(delete(JobSearchCache).where(JobSearchCache.fetched_at < cutoff)).rowcount
+        keep = select(JobSearchCache.cache_key).order_by(JobSearchCache.fetched_at.desc()).limit(self.max_entries)
+        deleted += db.execute(delete(JobSearchCache).where(JobSearchCache.cache_key.not_in(keep))).rowcount
+        db.commit()
+        self.pruned_rows += deleted
+        self.last_pruned_at = time.time()
+        return deleted
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 3) if lookups else None,
+            "refreshes": self.refreshes,
+            "refreshes_in_flight": len(self._refreshing),
+            "errors": self.errors,
+            "memory_entries": len(self.memory),
+            "db_pruned_rows": self.pruned_rows,
+            "db_last_pruned_at": self.last_pruned_at
+        }
+
+
+job_search_cache = JobSearchCacheService(
+    backend=settings.JOB_SEARCH_CACHE_BACKEND,
+    fresh_seconds=settings.JOB_SEARCH_CACHE_FRESH_SECONDS,
+    stale_seconds=settings.JOB_SEARCH_CACHE_STALE_SECONDS,
+    memory_entries=settings.JOB_SEARCH_CACHE_MEMORY_ENTRIES,
+    max_entries=settings.JOB_SEARCH_CACHE_MAX_ENTRIES
+)
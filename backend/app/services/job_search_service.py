@@ -1,26 +1,60 @@
 import os
 import json
 import uuid
+import asyncio
+import hashlib
+import io
 from datetime import datetime, UTC
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, AsyncIterator, Callable, Awaitable
+import aiohttp
 import requests
 from dotenv import load_dotenv
 from serpapi import GoogleSearch
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from app.models.job import JobsOffered
+from sqlalchemy.util import await_only
+from app.core.config import settings
+from app.models.job import JobsOffered, SessionJobs
+from app.services.job_search_cache_service import JobSearchCacheService, job_search_cache
 import re
 import logging
 
 logger = logging.getLogger('custom_logger')
 load_dotenv()
 
+_http_session: Optional[aiohttp.ClientSession] = None
+_http_session_loop = None
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Shared keep-alive connection pool for SerpApi calls, created lazily on the running event loop.
+    Closed by close_http_session() on application shutdown.
+    """
+    global _http_session, _http_session_loop
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=settings.SERPAPI_MAX_CONNECTIONS, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=settings.SERPAPI_TIMEOUT_SECONDS)
+        )
+        _http_session_loop = loop
+    return _http_session
+
+async def close_http_session() -> None:
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
 class JobSearchService:
   
-    def __init__(self):
+    def __init__(self, cache: JobSearchCacheService = None):
         """Initialize the JobSearchService with API key from environment variables."""
         self.api_key = os.getenv("SERPAPI_API_KEY")
         if not self.api_key:
             raise ValueError("SERPAPI_API_KEY not found in environment variables")
+        self.cache = cache or job_search_cache
         
     def search_jobs(self, session_id: str, job_title: str, 
                    location: str = "United States",
@@ -59,24 +93,7 @@ class JobSearchService:
                 
                 jobs_results = results.get("jobs_results", [])
                 logger.info(f"Found {len(jobs_results)} jobs in this page")
-                for job in jobs_results:
-                    # Extract and standardize job data
-                    standardized_job = {
-                        "job_id": str(uuid.uuid4()),
-                        "session_id": session_id,
-                        "job_title": job.get("title"),
-                        "cmp_name": job.get("company_name"),
-                        "city": self._extract_location(job.get("location"), "city"),
-                        "state": self._extract_location(job.get("location"), "state"),
-                        "country": self._extract_location(job.get("location"), "country"),
-                        "description": job.get("description"),
-                        "qualification_required": self._extract_qualifications(job),
-                        "skills_required": self._extract_skills(job),
-                        "salary_offered": job.get("salary"),
-                        "posted_date": self._parse_date(job.get("posted_at")),
-                        "is_active": True
-                    }
-                    all_jobs.append(standardized_job)
+                all_jobs.extend(self._standardize_jobs(jobs_results, session_id))
                 
                 next_page_token = results.get("next_page_token")
                 if not next_page_token:
@@ -88,6 +105,118 @@ class JobSearchService:
             logger.error(f"Error searching jobs: {str(e)}")
             raise ValueError(f"Failed to search jobs: {str(e)}")
     
+    async def aiter_job_pages(self, session_id: str, job_title: str,
+                              location: str = "United States",
+                              num_pages: int = 3) -> AsyncIterator[List[Dict]]:
+        """
+        Async variant of search_jobs that yields standardized jobs one page at a time.
+
+        Page N+1 depends on page N's next_page_token, so pages cannot be fetched in parallel; instead the
+        next page request is started as soon as the token is known, before page N is parsed and handed to
+        the caller. Parsing and any DB writes the caller does per page overlap with that network round-trip.
+
+        Args:
+            session_id (str): The session ID from the application context
+            job_title (str): The job title to search for
+            location (str): Location to search in (default: "United States")
+            num_pages (int): Number of pages to fetch (default: 3)
+
+        Yields:
+            List[Dict]: The standardized jobs of one page
+        """
+        params = {
+            "engine": "google_jobs",
+            "q": job_title,
+            "location": location,
+            "api_key": self.api_key,
+        }
+        next_fetch = asyncio.create_task(self._fetch_page(params))
+        try:
+            for page in range(num_pages):
+                results = await next_fetch
+                next_fetch = None
+                if "error" in results:
+                    logger.error(f"SerpApi error: {results['error']}")
+                    break
+                next_page_token = results.get("next_page_token")
+                if next_page_token and page + 1 < num_pages:
+                    next_fetch = asyncio.create_task(self._fetch_page({**params, "next_page_token": next_page_token}))
+                    # Let the task send its request now; otherwise it only starts once the caller's
+                    # page handling first yields to the loop
+                    await asyncio.sleep(0)
+
+                jobs_results = results.get("jobs_results", [])
+                logger.info(f"Found {len(jobs_results)} jobs in this page")
+                yield self._standardize_jobs(jobs_results, session_id)
+
+                if next_fetch is None:
+                    break  # No more pages
+        except Exception as e:
+            logger.error(f"Error searching jobs: {str(e)}")
+            raise ValueError(f"Failed to search jobs: {str(e)}")
+        finally:
+            if next_fetch is not None and not next_fetch.done():
+                next_fetch.cancel()
+
+    async def asearch_jobs(self, session_id: str, job_title: str,
+                           location: str = "United States",
+                           num_pages: int = 3,
+                           on_page: Optional[Callable[[List[Dict]], Awaitable[None]]] = None) -> List[Dict]:
+        """
+        Async variant of search_jobs returning all pages at once.
+        on_page, if given, is awaited with each page's jobs while the next page is being fetched.
+        """
+        all_jobs = []
+        async for page_jobs in self.aiter_job_pages(session_id, job_title, location, num_pages):
+            if on_page is not None:
+                await on_page(page_jobs)
+            all_jobs.extend(page_jobs)
+        return all_jobs
+
+    async def asearch_many(self, session_id: str, queries: List[Tuple[str, str]],
+                           num_pages: int = 3,
+                           on_page: Optional[Callable[[List[Dict]], Awaitable[None]]] = None) -> List[Dict]:
+        """
+        Run several (job_title, location) searches concurrently over the shared connection pool.
+
+        Returns:
+            List[Dict]: The jobs of every query, in query order
+        """
+        results = await asyncio.gather(*(
+            self.asearch_jobs(session_id, job_title, location, num_pages, on_page)
+            for job_title, location in queries
+        ))
+        return [job for jobs in results for job in jobs]
+
+    async def _fetch_page(self, params: Dict) -> Dict:
+        """Fetch one SerpApi results page over the shared keep-alive pool, going through the page cache."""
+        async def fetch():
+            async with get_http_session().get(settings.SERPAPI_BASE_URL, params=params) as response:
+                return await response.json(content_type=None)
+
+        return await self.cache.get_or_fetch(params["q"], params.get("location"), params.get("next_page_token"), fetch)
+
+    def _standardize_jobs(self, jobs_results: List[Dict], session_id: str) -> List[Dict]:
+        """Extract and standardize the job data of one SerpApi results page."""
+        return [
+            {
+                "job_id": str(uuid.uuid4()),
+                "session_id": session_id,
+                "job_title": job.get("title"),
+                "cmp_name": job.get("company_name"),
+                "city": self._extract_location(job.get("location"), "city"),
+                "state": self._extract_location(job.get("location"), "state"),
+                "country": self._extract_location(job.get("location"), "country"),
+                "description": job.get("description"),
+                "qualification_required": self._extract_qualifications(job),
+                "skills_required": self._extract_skills(job),
+                "salary_offered": job.get("salary"),
+                "posted_date": self._parse_date(job.get("posted_at")),
+                "is_active": True
+            }
+            for job in jobs_results
+        ]
+
     def _extract_location(self, location: str, part: str) -> Optional[str]:
         """Extract city, state, or country from location string."""
         if not location:
@@ -158,41 +287,193 @@ class JobSearchService:
         except Exception:
             return None
     
-    def save_jobs_to_db(self, jobs: List[Dict], db: Session, session_id: str) -> None:
+    def _job_rows(self, jobs: List[Dict], fingerprints: List[str], session_id: str) -> List[Dict]:
         """
-        Save job listings to the database.
-        
+        Turn standardized jobs into jobs_offered column dicts, one per distinct fingerprint, sorted by
+        fingerprint. Postings repeated within the batch collapse onto the first occurrence's row.
+        """
+        session_uuid = uuid.UUID(str(session_id))
+        seen_at = datetime.now(UTC)
+        rows: Dict[str, Dict] = {}
+        for job, fingerprint in zip(jobs, fingerprints):
+            if fingerprint in rows:
+                continue
+            rows[fingerprint] = {
+                "jobid": uuid.UUID(str(job.get("job_id") or uuid.uuid4())),
+                "session_id": session_uuid,
+                "fingerprint": fingerprint,
+                "job_title": job["job_title"],
+                "cmp_name": job["cmp_name"],
+                "city": job["city"],
+                "state": job["state"],
+                "country": job["country"],
+                "description": job["description"],
+                "qualification_required": job["qualification_required"],
+                "skills_required": job["skills_required"],
+                "salary_offered": job["salary_offered"],
+                # posted_date is a naive UTC column
+                "posted_date": job["posted_date"].replace(tzinfo=None) if job["posted_date"] else None,
+                "is_active": job["is_active"],
+                "last_seen_at": seen_at
+            }
+        # Concurrent saves of overlapping postings then lock their rows in the same order and cannot deadlock
+        return [rows[fingerprint] for fingerprint in sorted(rows)]
+
+    def save_jobs_to_db(self, jobs: List[Dict], db: Session, session_id: str,
+                        method: Optional[str] = None) -> List[str]:
+        """
+        Upsert job listings by fingerprint and link them to the search session.
+
+        A posting that is already stored (same normalized title, company, location and description)
+        keeps its row; only its mutable fields and last_seen_at are refreshed. Batches below
+        settings.JOB_BULK_COPY_THRESHOLD go through a single INSERT ... ON CONFLICT executemany;
+        larger ones are COPYed into a temporary table and upserted from there.
+        Each job's job_id is replaced with the id of the shared row, so later matches point at it.
+
         Args:
             jobs (List[Dict]): List of job listings
             db (Session): Database session
+            session_id (str): Search session the jobs belong to
+            method (str, optional): Force "insert" or "copy" instead of choosing by batch size
+
+        Returns:
+            List[str]: The stored jobid of each job, in input order
         """
+        if not jobs:
+            return []
+        if method is None:
+            method = "copy" if len(jobs) >= settings.JOB_BULK_COPY_THRESHOLD else "insert"
+        if method == "copy" and db.get_bind().dialect.driver not in _COPY_DRIVERS:
+            method = "insert"
+
         try:
-            for job in jobs:
-                db_job = JobsOffered(
-                    jobid=str(uuid.uuid4()),
-                    session_id=session_id,
-                    job_title=job["job_title"],
-                    cmp_name=job["cmp_name"],
-                    city=job["city"],
-                    state=job["state"],
-                    country=job["country"],
-                    description=job["description"],
-                    qualification_required=job["qualification_required"],
-                    skills_required=job["skills_required"],
-                    salary_offered=job["salary_offered"],
-                    posted_date=job["posted_date"],
-                    is_active=job["is_active"]
-                )
-                db.add(db_job)
-            
+            fingerprints = [job_fingerprint(job) for job in jobs]
+            rows = self._job_rows(jobs, fingerprints, session_id)
+            if method == "copy":
+                stored = self._copy_jobs(rows, db)
+            else:
+                stmt = pg_insert(JobsOffered)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[JobsOffered.fingerprint],
+                    set_={column: stmt.excluded[column] for column in _REFRESHED_COLUMNS}
+                ).returning(JobsOffered.fingerprint, JobsOffered.jobid)
+                stored = {fingerprint: jobid for fingerprint, jobid in db.execute(stmt, rows)}
+
+            db.execute(
+                pg_insert(SessionJobs).on_conflict_do_nothing(),
+                [{"session_id": rows[0]["session_id"], "jobid": jobid, "found_at": rows[0]["last_seen_at"]}
+                 for jobid in sorted(stored.values())]
+            )
             db.commit()
-            logger.info(f"Successfully saved {len(jobs)} jobs to database")
-            
+
+            job_ids = []
+            for job, fingerprint in zip(jobs, fingerprints):
+                job["job_id"] = str(stored[fingerprint])
+                job_ids.append(job["job_id"])
+            logger.info(f"Saved {len(jobs)} jobs as {len(stored)} unique postings via {method}")
+            return job_ids
+
         except Exception as e:
             db.rollback()
             logger.error(f"Error saving jobs to database: {str(e)}")
             raise ValueError(f"Failed to save jobs to database: {str(e)}")
 
+    @staticmethod
+    def _copy_jobs(rows: List[Dict], db: Session) -> Dict[str, uuid.UUID]:
+        """
+        Stream rows with COPY ... FROM STDIN into a transaction-scoped staging table, then upsert them
+        into jobs_offered in one statement. Returns the stored jobid per fingerprint.
+        """
+        columns = list(rows[0].keys())
+        buffer = _copy_buffer(rows, columns)
+
+        table = JobsOffered.__tablename__
+        column_list = ", ".join(columns)
+        db.execute(text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {table}_staging (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+        ))
+        dbapi_connection = db.connection().connection
+        if db.get_bind().dialect.driver == "asyncpg":
+            # Called through AsyncSession.run_sync: the greenlet awaits asyncpg's own COPY on this connection
+            await_only(dbapi_connection.driver_connection.copy_to_table(
+                f"{table}_staging", source=buffer.getvalue().encode("utf-8"), columns=columns,
+                format="csv", null="\\N"
+            ))
+        else:
+            with dbapi_connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {table}_staging ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                    buffer
+                )
+        result = db.execute(text(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {table}_staging ORDER BY fingerprint "
+            f"ON CONFLICT (fingerprint) DO UPDATE SET "
+            + ", ".join(f"{column} = EXCLUDED.{column}" for column in _REFRESHED_COLUMNS)
+            + " RETURNING fingerprint, jobid"
+        ))
+        return {fingerprint: jobid for fingerprint, jobid in result}
+
+
+# Drivers save_jobs_to_db can COPY through; asyncpg is reached via AsyncSession.run_sync
+_COPY_DRIVERS = ("psycopg2", "asyncpg")
+
+# Columns refreshed when a posting that is already stored shows up in a new search
+_REFRESHED_COLUMNS = ("qualification_required", "skills_required", "salary_offered", "is_active", "last_seen_at")
+
+_FINGERPRINT_NORMALIZE_RE = re.compile(r'[\W_]+')
+
+
+def _normalize_fingerprint_part(value) -> str:
+    """Lowercase and drop punctuation so 'Google, Inc.' and 'google inc' compare equal."""
+    return _FINGERPRINT_NORMALIZE_RE.sub(" ", str(value or "").lower()).strip()
+
+
+def job_fingerprint(job: Dict) -> str:
+    """
+    Canonical identity of a posting: SHA-256 over the normalized title, company, city, state,
+    country and a hash of the normalized description.
+    """
+    description_hash = hashlib.sha256(_normalize_fingerprint_part(job.get("description")).encode("utf-8")).hexdigest()
+    parts = [_normalize_fingerprint_part(job.get(field))
+             for field in ("job_title", "cmp_name", "city", "state", "country")]
+    parts.append(description_hash)
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def _copy_value(value) -> str:
+    """
+    Render a Python value as one COPY csv field. NULL is an unquoted \\N and every other value is quoted,
+    so a string that reads \\N is not taken for NULL. Arrays use the Postgres literal syntax.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        rendered = "t" if value else "f"
+    elif isinstance(value, datetime):
+        rendered = value.isoformat()
+    elif isinstance(value, list):
+        items = []
+        for item in value:
+            if item is None:
+                items.append("NULL")
+            else:
+                escaped = str(item).replace("\\", "\\\\").replace('"', '\\"')
+                items.append(f'"{escaped}"')
+        rendered = "{" + ",".join(items) + "}"
+    else:
+        rendered = str(value)
+    return '"' + rendered.replace('"', '""') + '"'
+
+
+def _copy_buffer(rows: List[Dict], columns: List[str]) -> io.StringIO:
+    """The COPY ... WITH (FORMAT csv, NULL '\\N') input for rows, one line per row in columns order."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(_copy_value(row[column]) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
 
 # Example usage:
 # job_search = JobSearchService()
@@ -1,80 +1,202 @@
-from app.models import JobsOffered
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from pydantic import BaseModel
+import base64
+import binascii
+import json
+import re
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import column, func, literal_column, select, table, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
 from app.constants.messages import ERROR_MESSAGES
-import logging
-
-logger = logging.getLogger('custom_logger')
-
-# --- Pydantic Model for Mock/Example Purposes ---
-class Job(BaseModel):
-    """Pydantic model representing a job posting."""
-    id: int
-    title: str
-    company: str
-    location: str
-    description: str
-    salary: Optional[str] = None
-
-# Mock database (for demonstration; replace with real DB logic as needed)
-jobs_db = []
-
-def get_jobs_service(db: Session = None):
-    """Retrieve all jobs from the database or mock DB."""
-    logger.info("get_jobs_service called")
-    try:
-        # If you want to use the real DB, uncomment the next line and remove the mock logic
-        # jobs = db.query(JobsOffered).all()
-        # return jobs
-        logger.debug(f"Returning jobs_db: {jobs_db}")
-        return jobs_db
-    except Exception as e:
-        logger.error(f"Exception in get_jobs_service: {e}", exc_info=True)
-        raise
-
-def get_job_service(job_id: int, db: Session = None):
-    """Retrieve a single job by its ID from the database or mock DB."""
-    logger.info(f"get_job_service called with job_id: {job_id}")
+from app.models import JobsOffered
+from app.models.job import JOB_SEARCH_DOCUMENT, JOB_SEARCH_FTS_TABLE
+
+# Job columns a client can ask for; "jobid" is always returned
+JOB_FIELDS = ("job_title", "cmp_name", "city", "state", "country", "description", "qualification_required",
+              "skills_required", "salary_offered", "posted_date", "is_active", "last_seen_at")
+# Returned when no fields are given; the long text columns have to be asked for
+JOB_DEFAULT_FIELDS = ("job_title", "cmp_name", "city", "state", "country", "skills_required", "salary_offered",
+                      "posted_date", "is_active")
+# Indexed columns /jobs can filter on, by exact value
+JOB_FILTERS = ("city", "state", "country", "cmp_name", "job_title")
+# Rows serialized per chunk of the streamed response
+_STREAM_BATCH = 100
+# FTS5 column weights for bm25 (jobid, job_title, qualification_required, description), mirroring the
+# A/B/C weights of the Postgres search document
+_FTS_WEIGHTS = ("0.0", "3.0", "2.0", "1.0")
+_SEARCH_TERM_RE = re.compile(r'\w+')
+
+
+def parse_job_fields(fields: Optional[str]) -> List[str]:
+    """
+    Turn a comma-separated field list (e.g. "job_title,city,posted_date") into job fields.
+    No list means JOB_DEFAULT_FIELDS.
+
+    Raises:
+        ValueError: If a requested field does not exist
+    """
+    if not fields:
+        return list(JOB_DEFAULT_FIELDS)
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip() and field.strip() != "jobid"))
+    unknown = [field for field in requested if field not in JOB_FIELDS]
+    if unknown:
+        raise ValueError(f"{ERROR_MESSAGES.INVALID_JOB_FIELDS}: {', '.join(unknown)}")
+    return requested
+
+
+def encode_cursor(posted_date: Optional[datetime], jobid: uuid.UUID) -> str:
+    """Opaque cursor pointing just past the job with this (posted_date, jobid)."""
+    payload = json.dumps([posted_date.isoformat() if posted_date else None, str(jobid)])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[Optional[datetime], uuid.UUID]]:
+    """
+    Raises:
+        ValueError: If the cursor was not made by encode_cursor
+    """
+    if not cursor:
+        return None
     try:
-        job = next((job for job in jobs_db if job["id"] == job_id), None)
-        logger.debug(f"Job found: {job}")
-        if job is None:
-            logger.error("Job not found")
-            raise ValueError(ERROR_MESSAGES.JOB_NOT_FOUND)
-        return job
-    except Exception as e:
-        logger.error(f"Exception in get_job_service: {e}", exc_info=True)
-        raise
-
-def create_job_service(job: Job, db: Session = None):
-    """Create a new job entry in the database or mock DB."""
-    logger.info(f"create_job_service called with job: {job}")
+        posted_date, jobid = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return (datetime.fromisoformat(posted_date) if posted_date else None), uuid.UUID(jobid)
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError(ERROR_MESSAGES.INVALID_CURSOR)
+
+
+def _jobs_page_query(fields: Iterable[str], filters: Dict[str, str], after, limit: int, dated: bool):
+    """
+    One keyset page in /jobs order: dated jobs newest first, then undated ones, each by jobid descending.
+    The two groups are separate queries so both are served by ix_jobs_offered_posted_date_jobid
+    (NULLS LAST ordering cannot use a plain index), and neither gets slower the deeper the page.
+    """
+    columns = [JobsOffered.jobid, JobsOffered.posted_date] + [getattr(JobsOffered, field) for field in fields
+                                                              if field != "posted_date"]
+    stmt = select(*columns).where(*(getattr(JobsOffered, column) == value for column, value in filters.items()))
+    if dated:
+        stmt = stmt.where(JobsOffered.posted_date.is_not(None))
+        if after is not None:
+            stmt = stmt.where(tuple_(JobsOffered.posted_date, JobsOffered.jobid) < tuple_(*after))
+        stmt = stmt.order_by(JobsOffered.posted_date.desc(), JobsOffered.jobid.desc())
+    else:
+        stmt = stmt.where(JobsOffered.posted_date.is_(None))
+        if after is not None and after[0] is None:
+            stmt = stmt.where(JobsOffered.jobid < after[1])
+        stmt = stmt.order_by(JobsOffered.jobid.desc())
+    return stmt.limit(limit)
+
+
+def _json_value(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def stream_jobs_page(sessions: async_sessionmaker, fields: List[str], filters: Dict[str, str],
+                           limit: int, cursor: Optional[str] = None) -> AsyncIterator[bytes]:
+    """
+    Stream one page of jobs as the JSON object {"jobs": [...], "next_cursor": ...}, writing rows as they
+    arrive from the database instead of building the page in memory.
+
+    The generator opens its own session from sessions, since a streamed response outlives the request's
+    dependencies. Validate fields and cursor (parse_job_fields, decode_cursor) before starting the response.
+    """
+    after = decode_cursor(cursor)
+    filters = {column: filters[column] for column in JOB_FILTERS if filters.get(column) is not None}
+    yield b'{"jobs":['
+    written, last = 0, None
+    async with sessions() as db:
+        phases = (False,) if after is not None and after[0] is None else (True, False)
+        for dated in phases:
+            # One row more than the page tells whether there is a next page
+            wanted = limit + 1 - written
+            result = await db.stream(_jobs_page_query(fields, filters, after, wanted, dated))
+            async for rows in result.partitions(_STREAM_BATCH):
+                page_rows = rows[:limit - written]
+                if page_rows:
+                    chunk = ",".join(json.dumps({"jobid": str(row.jobid),
+                                                 **{field: _json_value(getattr(row, field)) for field in fields}})
+                                     for row in page_rows)
+                    yield (b"," if written else b"") + chunk.encode("utf-8")
+                    written += len(page_rows)
+                    last = page_rows[-1]
+                if len(rows) > len(page_rows):
+                    await result.close()
+                    next_cursor = encode_cursor(last.posted_date, last.jobid)
+                    yield f'],"next_cursor":{json.dumps(next_cursor)}}}'.encode("utf-8")
+                    return
+    yield b'],"next_cursor":null}'
+
+
+async def aget_job(db: AsyncSession, job_id: str, fields: List[str]) -> Optional[Dict]:
+    """Load one job's requested fields. Returns None if no job has this id."""
     try:
-        jobs_db.append(job.model_dump())
-        logger.debug(f"Job appended to jobs_db: {job}")
-        return job
-    except Exception as e:
-        logger.error(f"Exception in create_job_service: {e}", exc_info=True)
-        raise
-
-def get_jobs_service(db: Session):
-    # Placeholder: return all jobs
-    jobs = db.query(JobsOffered).all()
+        jobid = uuid.UUID(job_id)
+    except ValueError:
+        return None
+    columns = [JobsOffered.jobid] + [getattr(JobsOffered, field) for field in fields]
+    row = (await db.execute(select(*columns).where(JobsOffered.jobid == jobid))).first()
+    if row is None:
+        return None
+    return {"jobid": str(row.jobid), **{field: _json_value(getattr(row, field)) for field in fields}}
+
+
+def _search_terms(query: Optional[str]) -> List[str]:
+    """
+    Raises:
+        ValueError: If the query has no word to search for
+    """
+    terms = _SEARCH_TERM_RE.findall(query or "")
+    if not terms:
+        raise ValueError(ERROR_MESSAGES.EMPTY_SEARCH_QUERY)
+    return terms
+
+
+def _search_query(dialect: str, query: str, fields: List[str], filters: Dict[str, str], limit: int):
+    """
+    Ranked keyword query, best match first, with the score labelled "rank" (higher is better).
+    Postgres matches the GIN-indexed JOB_SEARCH_DOCUMENT with websearch_to_tsquery (quotes, "or" and
+    "-word" work); SQLite matches every word of the query in the FTS5 table.
+    """
+    columns = [JobsOffered.jobid] + [getattr(JobsOffered, field) for field in fields]
+    conditions = [getattr(JobsOffered, name) == value for name, value in filters.items()]
+    if dialect == "postgresql":
+        document = literal_column(f"({JOB_SEARCH_DOCUMENT})")
+        tsquery = func.websearch_to_tsquery(literal_column("'english'"), query)
+        rank = func.ts_rank_cd(document, tsquery).label("rank")
+        stmt = select(*columns, rank).where(document.op("@@")(tsquery), *conditions)
+    else:
+        fts = table(JOB_SEARCH_FTS_TABLE, column("jobid"))
+        match = " ".join(f'"{term}"' for term in _search_terms(query))
+        # bm25 is lower for better matches
+        rank = (-func.bm25(literal_column(JOB_SEARCH_FTS_TABLE), *map(literal_column, _FTS_WEIGHTS))).label("rank")
+        stmt = (
+            select(*columns, rank)
+            .join_from(fts, JobsOffered, JobsOffered.jobid == fts.c.jobid)
+            .where(literal_column(JOB_SEARCH_FTS_TABLE).op("MATCH")(match), *conditions)
+        )
+    return stmt.order_by(rank.desc(), JobsOffered.jobid).limit(limit)
+
+
+async def search_stored_jobs(db: AsyncSession, query: str, fields: List[str], filters: Dict[str, str],
+                             limit: int) -> List[Dict]:
+    """
+    Keyword search over the title, qualifications and description of jobs already stored, using the
+    database's full-text index, so repeated searches don't go back to SerpApi.
+    :return: Up to limit jobs, best match first, each with "jobid", the requested fields and "rank".
+
+    Raises:
+        ValueError: If the query has no word to search for
+    """
+    _search_terms(query)
+    filters = {name: filters[name] for name in JOB_FILTERS if filters.get(name) is not None}
+    stmt = _search_query(db.get_bind().dialect.name, query, fields, filters, limit)
     return [
-        {
-            "jobid": str(job.jobid),
-            "job_title": job.job_title,
-            "cmp_name": job.cmp_name,
-            "city": job.city,
-            "state": job.state,
-            "country": job.country,
-            "description": job.description,
-            "qualification_required": job.qualification_required,
-            "skills_required": job.skills_required,
-            "salary_offered": job.salary_offered,
-            "posted_date": job.posted_date.isoformat() if job.posted_date else None,
-            "is_active": job.is_active
-        }
-        for job in jobs
-    ] 
\ No newline at end of file
+        {"jobid": str(row.jobid), **{field: _json_value(getattr(row, field)) for field in fields},
+         "rank": round(row.rank, 6)}
+        for row in await db.execute(stmt)
+    ]
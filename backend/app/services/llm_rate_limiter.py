@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+from typing import Mapping, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger('custom_logger')
+
+_DURATION_PART_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def estimate_tokens(messages: list, max_tokens: int = 0) -> int:
+    """
+    Rough token cost of a chat completion: about 4 characters per prompt token, a few tokens of
+    overhead per message, plus the completion budget, which OpenAI counts against the limit up front.
+    """
+    prompt_chars = sum(len(message.get("content") or "") for message in messages)
+    return prompt_chars // 4 + 4 * len(messages) + (max_tokens or 0)
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse rate-limit reset headers such as "20ms", "1.5s" or "6m0s" (or a bare number of seconds)."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucketRateLimiter:
+    """
+    Client-side pacing for OpenAI calls, shared by every caller in the process.
+
+    Two token buckets refill continuously: one for requests per minute and one for tokens per minute.
+    A call takes one request and its estimated tokens; when either bucket is short it waits. Waiters
+    are served first come, first served (one queue for coroutines, one for threads), so a big prompt
+    cannot be starved by a stream of small ones. After a 429 the limiter pauses until the reset time
+    the API reported and halves its refill rate; each successful call then wins back a little of it.
+    Estimates are corrected with the real usage reported in each response.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, min_rate_factor: float = 0.25):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.min_rate_factor = min_rate_factor
+        self.rate_factor = 1.0
+        self._state_lock = threading.Lock()
+        self._thread_queue = threading.Lock()
+        self._async_queue: Optional[asyncio.Lock] = None
+        self._async_queue_loop = None
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self.queue_depth = 0
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.rate_limited = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests_per_minute > 0 and self.tokens_per_minute > 0
+
+    def _get_async_queue(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._async_queue is None or self._async_queue_loop is not loop:
+            self._async_queue = asyncio.Lock()
+            self._async_queue_loop = loop
+        return self._async_queue
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.requests_per_minute,
+                             self._requests + elapsed * self.requests_per_minute * self.rate_factor / 60)
+        self._tokens = min(self.tokens_per_minute,
+                           self._tokens + elapsed * self.tokens_per_minute * self.rate_factor / 60)
+
+    def _try_take(self, tokens: int) -> float:
+        """Take capacity for one call if available; otherwise return how long to wait before trying again."""
+        with self._state_lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+            # A call bigger than the whole bucket only waits for a full bucket
+            needed = min(tokens, self.tokens_per_minute)
+            if self._requests >= 1 and self._tokens >= needed:
+                self._requests -= 1
+                self._tokens -= needed
+                return 0.0
+            request_wait = max(0.0, 1 - self._requests) * 60 / (self.requests_per_minute * self.rate_factor)
+            token_wait = max(0.0, needed - self._tokens) * 60 / (self.tokens_per_minute * self.rate_factor)
+            return max(request_wait, token_wait, 0.001)
+
+    def _record_wait(self, waited: float) -> None:
+        self.acquired += 1
+        if waited > 0.001:
+            self.waited += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait until a call of about `tokens` tokens may be sent. Returns the time spent waiting."""
+        if not self.enabled:
+            return 0.0
+        started = time.monotonic()
+        self.queue_depth += 1
+        try:
+            async with self._get_async_queue():
+                while (wait := self._try_take(tokens)) > 0:
+                    await asyncio.sleep(wait)
+        finally:
+            self.queue_depth -= 1
+        waited = time.monotonic() - started
+        self._record_wait(waited)
+        return waited
+
+    def acquire_sync(self, tokens: int) -> float:
+        """Blocking variant of acquire for the synchronous OpenAI client."""
+        if not self.enabled:
+            return 0.0
+        started = time.monotonic()
+        self.queue_depth += 1
+        try:
+            with self._thread_queue:
+                while (wait := self._try_take(tokens)) > 0:
+                    time.sleep(wait)
+        finally:
+            self.queue_depth -= 1
+        waited = time.monotonic() - started
+        self._record_wait(waited)
+        return waited
+
+    def on_success(self, estimated_tokens: int, response=None) -> None:
+        """Settle the estimate against the response's real usage and recover some of the refill rate."""
+        usage = getattr(response, "usage", None) if response is not None else None
+        total_tokens = usage.get("total_tokens") if isinstance(usage, Mapping) else None
+        with self._state_lock:
+            if isinstance(total_tokens, int):
+                self._tokens = min(self.tokens_per_minute, self._tokens + estimated_tokens - total_tokens)
+            self.rate_factor = min(1.0, self.rate_factor + 0.05)
+
+    def on_rate_limited(self, headers: Optional[Mapping] = None) -> None:
+        """Back off after a 429, honouring the retry/reset times the API sent."""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        pause = (
+            parse_reset_duration(headers.get("retry-after"))
+            or max(filter(None, (parse_reset_duration(headers.get("x-ratelimit-reset-requests")),
+                                 parse_reset_duration(headers.get("x-ratelimit-reset-tokens")))), default=None)
+            or 1.0
+        )
+        with self._state_lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + pause)
+            self.rate_factor = max(self.min_rate_factor, self.rate_factor / 2)
+            for header, attribute in (("x-ratelimit-remaining-requests", "_requests"),
+                                      ("x-ratelimit-remaining-tokens", "_tokens")):
+                try:
+                    remaining = float(headers[header])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                setattr(self, attribute, min(getattr(self, attribute), remaining))
+            self.rate_limited += 1
+        logger.warning(f"OpenAI rate limit hit, pausing {pause:.2f}s at {self.rate_factor:.2f}x rate")
+
+    def stats(self) -> dict:
+        with self._state_lock:
+            self._refill(time.monotonic())
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "rate_factor": round(self.rate_factor, 2),
+                "available_requests": int(self._requests),
+                "available_tokens": int(self._tokens),
+                "paused_for_seconds": round(max(0.0, self._paused_until - time.monotonic()), 2),
+                "queue_depth": self.queue_depth,
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "avg_wait_seconds": round(self.total_wait_seconds / self.acquired, 3) if self.acquired else 0.0,
+                "max_wait_seconds": round(self.max_wait_seconds, 3),
+                "rate_limited": self.rate_limited
+            }
+
+
+llm_rate_limiter = TokenBucketRateLimiter(
+    requests_per_minute=settings.OPENAI_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.OPENAI_TOKENS_PER_MINUTE
+)
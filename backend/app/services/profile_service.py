@@ -0,0 +1,127 @@
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only, selectinload
+
+from app.constants.messages import ERROR_MESSAGES
+from app.models import UserDetails, Academics, Accolades, WorkExperience, SessionIdTable, JobsOffered, MatchedJobs
+from app.models.base import utc_now
+
+# Profile fields a client can ask for, and the columns each child collection returns
+PROFILE_SCALAR_FIELDS = ("name", "email", "contact_no", "current_job_title", "years_of_exp", "skills", "parsed_date")
+PROFILE_COLLECTION_COLUMNS = {
+    "academics": (Academics, ("school_name", "degree", "school_year", "school_gpa", "school_type")),
+    "accolades": (Accolades, ("acco_url", "acco_start_year", "acco_end_year")),
+    "work_experience": (WorkExperience, ("company", "position", "joining_year", "end_year", "description")),
+    "matched_jobs": (MatchedJobs, ("job_id", "match_score", "status", "matched_at")),
+}
+PROFILE_FIELDS = PROFILE_SCALAR_FIELDS + tuple(PROFILE_COLLECTION_COLUMNS)
+# Job columns shown with each matched job; the description and requirements are left for the jobs endpoints
+_MATCHED_JOB_COLUMNS = ("job_title", "cmp_name", "city", "state", "country")
+
+
+def parse_profile_fields(fields: Optional[str]) -> List[str]:
+    """
+    Turn a comma-separated field list (e.g. "name,skills,work_experience") into profile fields.
+    No list means every field.
+
+    Raises:
+        ValueError: If a requested field does not exist
+    """
+    if not fields:
+        return list(PROFILE_FIELDS)
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in requested if field not in PROFILE_FIELDS]
+    if unknown:
+        raise ValueError(f"{ERROR_MESSAGES.INVALID_PROFILE_FIELDS}: {', '.join(unknown)}")
+    return requested
+
+
+def _profile_query(user_id: uuid.UUID, session_id: uuid.UUID, fields: Iterable[str]):
+    """
+    One statement that checks the session and loads the user's requested columns; each requested
+    collection adds one selectin query (WHERE user_id IN ...) instead of a lazy load per access.
+    """
+    fields = list(fields)
+    options = [load_only(UserDetails.id, *(getattr(UserDetails, field) for field in fields
+                                           if field in PROFILE_SCALAR_FIELDS))]
+    for field, (model, columns) in PROFILE_COLLECTION_COLUMNS.items():
+        if field not in fields:
+            continue
+        loader = selectinload(getattr(UserDetails, field)).load_only(*(getattr(model, column) for column in columns))
+        if model is MatchedJobs:
+            loader = loader.selectinload(MatchedJobs.job).load_only(
+                *(getattr(JobsOffered, column) for column in _MATCHED_JOB_COLUMNS)
+            )
+        options.append(loader)
+    return (
+        select(UserDetails)
+        .join(SessionIdTable, SessionIdTable.user_id == UserDetails.id)
+        .where(
+            UserDetails.id == user_id,
+            SessionIdTable.session_id == session_id,
+            SessionIdTable.is_valid == True,
+            SessionIdTable.expires_at > utc_now()
+        )
+        .options(*options)
+    )
+
+
+def _serialize_row(row, columns: Iterable[str]) -> Dict:
+    data = {"id": str(row.id)}
+    for column in columns:
+        value = getattr(row, column)
+        data[column] = str(value) if isinstance(value, uuid.UUID) else value
+    return data
+
+
+def _serialize_matched_job(match: MatchedJobs) -> Dict:
+    data = _serialize_row(match, PROFILE_COLLECTION_COLUMNS["matched_jobs"][1])
+    job = match.job
+    data["job"] = None if job is None else {
+        "job_title": job.job_title,
+        "company": job.cmp_name,
+        "location": ", ".join(part for part in (job.city, job.state, job.country) if part)
+    }
+    return data
+
+
+def _serialize_profile(user: UserDetails, fields: List[str]) -> Dict:
+    profile = {"id": str(user.id)}
+    for field in fields:
+        if field in PROFILE_SCALAR_FIELDS:
+            profile[field] = getattr(user, field)
+        elif field == "matched_jobs":
+            profile[field] = [_serialize_matched_job(match) for match in user.matched_jobs]
+        else:
+            profile[field] = [_serialize_row(row, PROFILE_COLLECTION_COLUMNS[field][1]) for row in getattr(user, field)]
+    return profile
+
+
+def get_user_profile(db: Session, user_id: str, session_id: str, fields: Iterable[str]) -> Optional[Dict]:
+    """
+    Load the requested profile fields of a user whose session is valid, in a single round trip
+    plus one query per requested collection.
+    :return: The profile with "id" and the requested fields, or None if the session is invalid or expired.
+
+    Raises:
+        ValueError: If user_id or session_id is not a UUID
+    """
+    fields = list(fields)
+    user = db.scalars(_profile_query(uuid.UUID(user_id), uuid.UUID(session_id), fields)).first()
+    return None if user is None else _serialize_profile(user, fields)
+
+
+async def aget_user_profile(db: AsyncSession, user_id: str, session_id: str, fields: Iterable[str]) -> Optional[Dict]:
+    """
+    Async variant of get_user_profile. Every field it returns is loaded by the query up front,
+    so serializing never needs a lazy load.
+
+    Raises:
+        ValueError: If user_id or session_id is not a UUID
+    """
+    fields = list(fields)
+    user = (await db.scalars(_profile_query(uuid.UUID(user_id), uuid.UUID(session_id), fields))).first()
+    return None if user is None else _serialize_profile(user, fields)
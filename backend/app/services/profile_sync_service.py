@@ -0,0 +1,152 @@
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, UTC
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.models import UserDetails, Academics, Accolades, WorkExperience
+from app.models.user import map_degree_type
+
+logger = logging.getLogger('custom_logger')
+
+# Columns a resume analysis writes, per child table, and the subset that identifies "the same" entry
+# across analyses (a corrected end year updates the row instead of replacing it)
+SYNCED_COLUMNS = {
+    Academics: ("school_name", "degree", "school_year", "school_type"),
+    Accolades: ("acco_url", "acco_start_year", "acco_end_year"),
+    WorkExperience: ("company", "position", "joining_year", "end_year", "description"),
+}
+IDENTITY_COLUMNS = {
+    Academics: ("school_name", "degree"),
+    Accolades: ("acco_url",),
+    WorkExperience: ("company", "position", "joining_year"),
+}
+PROFILE_USER_COLUMNS = ("contact_no", "current_job_title", "years_of_exp", "skills")
+_PROFILE_CHILDREN = (("academics", Academics), ("accolades", Accolades), ("work_experience", WorkExperience))
+
+
+def profile_from_parser(info: dict) -> dict:
+    """Map ResumeParser output to profile columns: user fields plus academics, accolades and work_experience rows."""
+    return {
+        "name": info.get("name"),
+        "email": info.get("email"),
+        "contact_no": info.get("phone_number"),
+        "current_job_title": info.get("current_job_title"),
+        "years_of_exp": info.get("years_of_experience"),
+        "skills": info.get("skills"),
+        "academics": [
+            {"school_name": edu.get("institution"), "degree": edu.get("degree"), "school_year": edu.get("year"),
+             "school_type": map_degree_type(edu.get("degree_type"))}
+            for edu in info.get("education", [])
+        ],
+        "accolades": [
+            {"acco_url": acc.get("url"), "acco_start_year": acc.get("start_year"), "acco_end_year": acc.get("end_year")}
+            for acc in info.get("accolades", [])
+        ],
+        "work_experience": [
+            {"company": exp.get("company"), "position": exp.get("position"), "joining_year": exp.get("joining_year"),
+             "end_year": exp.get("end_year"), "description": exp.get("description")}
+            for exp in info.get("work_experience", [])
+        ]
+    }
+
+
+def profile_from_llm(info: dict, llm_service) -> dict:
+    """Map a validated LLM extraction to profile columns, like profile_from_parser."""
+    work_experience = info.get("work_experience") or []
+    return {
+        "name": info.get("name"),
+        "email": info.get("email"),
+        "contact_no": info.get("phone"),
+        "current_job_title": work_experience[0].get("title") if work_experience else None,
+        "years_of_exp": info.get("years_of_experience"),
+        "skills": info.get("skills", []),
+        "academics": [
+            {"school_name": edu.get("school", ""), "degree": edu.get("degree", ""), "school_year": edu.get("year"),
+             "school_type": llm_service._map_degree_type((edu.get("degree") or "").lower())}
+            for edu in info.get("education", [])
+        ],
+        "accolades": [],
+        "work_experience": [
+            {"company": exp.get("company", ""), "position": exp.get("title", ""), "joining_year": exp.get("start_year"),
+             "end_year": exp.get("end_year"), "description": exp.get("description", "")}
+            for exp in work_experience
+        ]
+    }
+
+
+def sync_child_rows(db: Session, model, user_id: uuid.UUID, rows: List[dict]) -> Dict[str, int]:
+    """
+    Make the user's rows of a child table match rows, touching only what differs.
+
+    Stored rows equal to a new row are kept as they are. A stored row with the same identity columns
+    as a new row is updated in place, only in the columns that changed. What is left over is deleted
+    or inserted. Changes are queued on the session; the caller flushes and commits them together.
+    :return: Counts of inserted, updated and deleted rows.
+    """
+    columns = SYNCED_COLUMNS[model]
+    identity = IDENTITY_COLUMNS[model]
+    counts = {"inserted": 0, "updated": 0, "deleted": 0}
+
+    stored = defaultdict(list)
+    for obj in db.query(model).filter(model.user_id == user_id).all():
+        stored[tuple(getattr(obj, column) for column in columns)].append(obj)
+    unmatched = []
+    for row in rows:
+        same = stored.get(tuple(row.get(column) for column in columns))
+        if same:
+            same.pop()
+        else:
+            unmatched.append(row)
+
+    by_identity = defaultdict(list)
+    for objs in stored.values():
+        for obj in objs:
+            by_identity[tuple(getattr(obj, column) for column in identity)].append(obj)
+    for row in unmatched:
+        candidates = by_identity.get(tuple(row.get(column) for column in identity))
+        if candidates:
+            obj = candidates.pop()
+            for column in columns:
+                if getattr(obj, column) != row.get(column):
+                    setattr(obj, column, row.get(column))
+            counts["updated"] += 1
+        else:
+            db.add(model(user_id=user_id, **{column: row.get(column) for column in columns}))
+            counts["inserted"] += 1
+
+    for objs in by_identity.values():
+        for obj in objs:
+            db.delete(obj)
+            counts["deleted"] += 1
+    return counts
+
+
+def save_profile(db: Session, user: UserDetails, profile: dict) -> Dict[str, int]:
+    """
+    Store a fresh resume analysis for user in one transaction, writing only what changed.
+
+    User columns are assigned only when their value differs and child rows are synced with
+    sync_child_rows; parsed_date moves only when something changed, so re-analysing an unchanged
+    resume writes nothing.
+    :return: Counts of inserted, updated and deleted child rows, plus the number of changed user columns.
+    """
+    counts = {"inserted": 0, "updated": 0, "deleted": 0, "user_columns": 0}
+    try:
+        for column in PROFILE_USER_COLUMNS:
+            if getattr(user, column) != profile.get(column):
+                setattr(user, column, profile.get(column))
+                counts["user_columns"] += 1
+        for key, model in _PROFILE_CHILDREN:
+            for change, count in sync_child_rows(db, model, user.id, profile.get(key) or []).items():
+                counts[change] += count
+        if any(counts.values()) or user.parsed_date is None:
+            user.parsed_date = datetime.now(UTC)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    logger.info(f"Analysis saved for user_id {user.id}: {counts}")
+    return counts
@@ -1,28 +1,73 @@
 import openai
 import json
+import copy
+import asyncio
+import io
+import random
+import time
 from dotenv import load_dotenv
 load_dotenv()
 import os
 import logging
 from sqlalchemy.orm import Session
 from app.models import UserDetails, Academics, Accolades, WorkExperience, SessionIdTable
+from app.models.base import utc_now
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
-from datetime import datetime, UTC
 import uuid
-from app.schemas.resume_schema import RESUME_SCHEMA, get_schema_prompt
+import hashlib
+from app.schemas.resume_schema import RESUME_SCHEMA, PROMPT_VERSION, get_schema_prompt
 from jsonschema import validate, ValidationError
 import pdfplumber
 from docx import Document
 from app.constants.messages import ERROR_MESSAGES
+from app.core.config import settings
+from typing import Dict, List, Set, Union
+from app.services.extraction_cache_service import ExtractionCacheService, extraction_cache
+from app.services.resume_store import resume_store
+from app.services.extraction_pool import extraction_pool
+from app.services.llm_rate_limiter import estimate_tokens, llm_rate_limiter
+from app.services.profile_sync_service import profile_from_llm, save_profile
+from app.services.resume_text_preprocessor import (
+    PAGE_BREAK, PREPROCESSOR_VERSION, chunk_resume_text, merge_resume_chunks, preprocess_resume_text
+)
 
 logger = logging.getLogger('custom_logger')
 api_key = os.getenv("OPENAI_API_KEY")
 
+# Errors worth retrying: rate limits, timeouts and transient server/connection failures
+_RETRYABLE_LLM_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.APIConnectionError,
+    openai.error.Timeout,
+    openai.error.ServiceUnavailableError,
+    openai.error.TryAgain,
+    asyncio.TimeoutError,
+)
+
+# Resume text below this size is not split any further when its extraction gets cut off
+_MIN_CHUNK_CHARS = 1000
+
+class TruncatedLLMResponse(ValueError):
+    """The completion stopped at max_tokens, so the JSON it holds is cut off."""
+
+_llm_semaphore = None
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    """Process-wide cap on in-flight async LLM calls, created on first use."""
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+    return _llm_semaphore
+
 class ResumeLLMService:
-    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo"):
+    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo", cache: ExtractionCacheService = None):
         openai.api_key = api_key
         self.model = model
+        self.cache = cache or extraction_cache
+        # Schema and text cleanup edits change the prompt too, so they invalidate cached results without a manual bump
+        schema_digest = hashlib.sha256(get_schema_prompt().encode("utf-8")).hexdigest()[:8]
+        self.prompt_version = f"{PROMPT_VERSION}-{schema_digest}-p{PREPROCESSOR_VERSION}"
 
     def _calculate_total_experience(self, work_experience):
         """
@@ -63,10 +108,177 @@ class ResumeLLMService:
         months = total_months % 12
         return float(f"{years}.{months}")
 
-    def extract_resume_data(self, resume_text: str) -> dict:
-        prompt = (
-            "Extract information from the resume below and return it as a JSON object that strictly follows this schema:\n"
-            f"{get_schema_prompt()}\n\n"
+    def extract_resume_data(self, resume_text: str, use_cache: bool = True) -> dict:
+        """
+        Extract structured resume data, reusing a cached result for identical text, model and prompt version.
+        The text is cleaned up first (see preprocess_resume_text); long resumes are extracted in chunks.
+        :param resume_text: The full text of the resume.
+        :param use_cache: Set to False to force a fresh LLM call.
+        :return: The validated resume data.
+        """
+        resume_text = preprocess_resume_text(resume_text)
+        cache_key = None
+        if use_cache:
+            cache_key = ExtractionCacheService.make_key(resume_text, self.model, self.prompt_version)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        parsed_json = self._request_resume_data(resume_text)
+        if cache_key:
+            self.cache.set(cache_key, parsed_json, self.model, self.prompt_version)
+        return parsed_json
+
+    async def aextract_resume_data(self, resume_text: str, use_cache: bool = True) -> dict:
+        """
+        Async variant of extract_resume_data that does not block the event loop during the LLM call.
+        :param resume_text: The full text of the resume.
+        :param use_cache: Set to False to force a fresh LLM call.
+        :return: The validated resume data.
+        """
+        resume_text = preprocess_resume_text(resume_text)
+        cache_key = None
+        if use_cache:
+            cache_key = ExtractionCacheService.make_key(resume_text, self.model, self.prompt_version)
+            # The cache may hit the database, so keep it off the event loop
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                return cached
+        parsed_json = await self._arequest_resume_data(resume_text)
+        if cache_key:
+            await asyncio.to_thread(self.cache.set, cache_key, parsed_json, self.model, self.prompt_version)
+        return parsed_json
+
+    async def aextract_resume_batch(self, resume_texts: List[str], use_cache: bool = True) -> List[Union[dict, Exception]]:
+        """
+        Extract several resumes with as few LLM calls as possible.
+        Cache misses are packed into requests of up to LLM_BATCH_SIZE resumes (and LLM_BATCH_MAX_CHARS
+        characters), so the instructions and schema are sent once per request instead of once per resume.
+        A resume whose part of a batched answer is missing or invalid is retried on its own.
+        Resumes too long for one request are extracted on their own, in chunks.
+        :param resume_texts: The full text of each resume.
+        :param use_cache: Set to False to force fresh LLM calls.
+        :return: One validated result per resume, in input order, or the exception that resume failed with.
+        """
+        resume_texts = [preprocess_resume_text(text) for text in resume_texts]
+        results: List[Union[dict, Exception, None]] = [None] * len(resume_texts)
+        keys = [ExtractionCacheService.make_key(text, self.model, self.prompt_version) for text in resume_texts]
+        misses: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            if key in misses:
+                misses[key].append(i)
+                continue
+            cached = await asyncio.to_thread(self.cache.get, key) if use_cache else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                misses[key] = [i]
+
+        groups, group, group_chars = [], [], 0
+        for key, indices in misses.items():
+            text = resume_texts[indices[0]]
+            if len(text) > settings.LLM_CHUNK_MAX_CHARS:
+                groups.append([key])
+                continue
+            if group and (len(group) >= settings.LLM_BATCH_SIZE or group_chars + len(text) > settings.LLM_BATCH_MAX_CHARS):
+                groups.append(group)
+                group, group_chars = [], 0
+            group.append(key)
+            group_chars += len(text)
+        if group:
+            groups.append(group)
+
+        async def run_group(group_keys: List[str]) -> None:
+            texts = [resume_texts[misses[key][0]] for key in group_keys]
+            for key, result in zip(group_keys, await self._aextract_group(texts)):
+                if use_cache and not isinstance(result, Exception):
+                    await asyncio.to_thread(self.cache.set, key, result, self.model, self.prompt_version)
+                for i in misses[key]:
+                    results[i] = copy.deepcopy(result) if i != misses[key][0] else result
+
+        await asyncio.gather(*(run_group(group_keys) for group_keys in groups))
+        return results
+
+    async def _aextract_group(self, resume_texts: List[str]) -> List[Union[dict, Exception]]:
+        """Extract one packed group of resumes, falling back to single requests for parts that fail."""
+        items: List = [None] * len(resume_texts)
+        if len(resume_texts) > 1:
+            try:
+                response = await self._acreate_chat_completion(
+                    messages=self._build_batch_extraction_messages(resume_texts),
+                    max_tokens=min(settings.LLM_EXTRACTION_MAX_TOKENS,
+                                   sum(self._extraction_max_tokens(text) for text in resume_texts)),
+                    temperature=0.1,
+                )
+                items = self._split_batch_response(self._completion_content(response), len(resume_texts))
+            except ValueError as e:
+                logger.warning(f"Batched extraction of {len(resume_texts)} resumes failed, retrying one by one: {e}")
+            except Exception as e:
+                return [e] * len(resume_texts)
+
+        async def finish(text: str, item) -> Union[dict, Exception]:
+            if item is not None:
+                try:
+                    return self._validate_extraction(item)
+                except ValueError as e:
+                    logger.warning(f"Resume in batched extraction failed validation, retrying alone: {e}")
+            try:
+                return await self.aextract_resume_data(text, use_cache=False)
+            except Exception as e:
+                return e
+
+        return list(await asyncio.gather(*(finish(text, item) for text, item in zip(resume_texts, items))))
+
+    async def _acreate_chat_completion(self, **kwargs):
+        """
+        Call openai.ChatCompletion.acreate paced by the shared rate limiter, with bounded concurrency,
+        a per-attempt timeout and exponential backoff with jitter on rate limits, timeouts and transient API errors.
+        """
+        estimated_tokens = estimate_tokens(kwargs["messages"], kwargs.get("max_tokens"))
+        max_retries = settings.OPENAI_MAX_RETRIES
+        for attempt in range(max_retries + 1):
+            try:
+                await llm_rate_limiter.acquire(estimated_tokens)
+                async with _get_llm_semaphore():
+                    response = await asyncio.wait_for(
+                        openai.ChatCompletion.acreate(model=self.model, **kwargs),
+                        timeout=settings.OPENAI_TIMEOUT_SECONDS
+                    )
+                llm_rate_limiter.on_success(estimated_tokens, response)
+                return response
+            except _RETRYABLE_LLM_ERRORS as e:
+                if isinstance(e, openai.error.RateLimitError):
+                    llm_rate_limiter.on_rate_limited(e.headers)
+                if attempt >= max_retries:
+                    logger.error(f"LLM call failed after {attempt + 1} attempts: {e}")
+                    raise
+                delay = settings.OPENAI_RETRY_BACKOFF_SECONDS * (2 ** attempt) * (1 + random.random() / 2)
+                logger.warning(f"LLM call failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    def _create_chat_completion(self, **kwargs):
+        """Blocking counterpart of _acreate_chat_completion for the synchronous methods."""
+        estimated_tokens = estimate_tokens(kwargs["messages"], kwargs.get("max_tokens"))
+        max_retries = settings.OPENAI_MAX_RETRIES
+        for attempt in range(max_retries + 1):
+            try:
+                llm_rate_limiter.acquire_sync(estimated_tokens)
+                response = openai.ChatCompletion.create(
+                    model=self.model, request_timeout=settings.OPENAI_TIMEOUT_SECONDS, **kwargs
+                )
+                llm_rate_limiter.on_success(estimated_tokens, response)
+                return response
+            except _RETRYABLE_LLM_ERRORS as e:
+                if isinstance(e, openai.error.RateLimitError):
+                    llm_rate_limiter.on_rate_limited(e.headers)
+                if attempt >= max_retries:
+                    logger.error(f"LLM call failed after {attempt + 1} attempts: {e}")
+                    raise
+                delay = settings.OPENAI_RETRY_BACKOFF_SECONDS * (2 ** attempt) * (1 + random.random() / 2)
+                logger.warning(f"LLM call failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _extraction_rules(self) -> str:
+        return (
             "Rules:\n"
             "1. Email must be a valid email format\n"
             "2. Phone number should be in a standard format\n\n"
@@ -85,32 +297,163 @@ class ResumeLLMService:
             "15. Do not wrap the JSON in triple backticks or any other formatting.\n"
             "16. Do not include trailing commas or comments.\n"
     "17. If a field is missing, use null or an empty array as appropriate.\n"
+        )
+
+    def _build_extraction_messages(self, resume_text: str) -> list:
+        prompt = (
+            "Extract information from the resume below and return it as a JSON object that strictly follows this schema:\n"
+            f"{get_schema_prompt()}\n\n"
+            f"{self._extraction_rules()}"
             f"Resume:\n{resume_text}\n\n"
             "JSON:"
         )
-        response = openai.ChatCompletion.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an expert resume parser. Always return valid JSON that strictly follows the provided schema."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=512,
-            temperature=0.1,
+        return [
+            {"role": "system", "content": "You are an expert resume parser. Always return valid JSON that strictly follows the provided schema."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _build_chunk_extraction_messages(self, chunk: str) -> list:
+        """Prompt for one part of a resume that is extracted part by part and merged afterwards."""
+        prompt = (
+            "The text below is one part of a longer resume. Extract the information this part contains and "
+            "return it as a JSON object that strictly follows this schema:\n"
+            f"{get_schema_prompt()}\n\n"
+            f"{self._extraction_rules()}"
+            "Use null or an empty array for every field this part does not mention.\n\n"
+            f"Resume part:\n{chunk}\n\n"
+            "JSON:"
+        )
+        return [
+            {"role": "system", "content": "You are an expert resume parser. Always return valid JSON that strictly follows the provided schema."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _build_batch_extraction_messages(self, resume_texts: List[str]) -> list:
+        """One prompt for several resumes: the schema and rules are sent once, the resumes are numbered."""
+        resumes = "".join(
+            f"### Resume {i} ###\n{text}\n\n" for i, text in enumerate(resume_texts, start=1)
+        )
+        prompt = (
+            f"Extract information from each of the {len(resume_texts)} resumes below. Each resume must become a JSON "
+            "object that strictly follows this schema:\n"
+            f"{get_schema_prompt()}\n\n"
+            f"{self._extraction_rules()}"
+            f"Return a single JSON object of the form {{\"resumes\": [...]}} holding exactly {len(resume_texts)} "
+            "objects, one per resume, in the order the resumes are numbered. Never merge or skip resumes.\n\n"
+            f"{resumes}"
+            "JSON:"
+        )
+        return [
+            {"role": "system", "content": "You are an expert resume parser. Always return valid JSON that strictly follows the provided schema."},
+            {"role": "user", "content": prompt}
+        ]
+
+    @staticmethod
+    def _extraction_max_tokens(text: str) -> int:
+        """Completion budget for extracting text: the JSON is rarely longer than the text it comes from."""
+        return min(settings.LLM_EXTRACTION_MAX_TOKENS, 512 + len(text) // 4)
+
+    @staticmethod
+    def _completion_content(response) -> str:
+        choice = response.choices[0]
+        if getattr(choice, "finish_reason", None) == "length":
+            raise TruncatedLLMResponse("LLM response was cut off at max_tokens")
+        return choice.message['content'].strip()
+
+    def _extraction_request(self, chunk: str, whole: bool) -> dict:
+        messages = self._build_extraction_messages(chunk) if whole else self._build_chunk_extraction_messages(chunk)
+        return dict(messages=messages, max_tokens=self._extraction_max_tokens(chunk), temperature=0.1)
+
+    def _merge_extraction_parts(self, parts: List[dict]) -> dict:
+        return self._validate_extraction(parts[0] if len(parts) == 1 else merge_resume_chunks(parts))
+
+    def _request_resume_data(self, resume_text: str) -> dict:
+        return self._merge_extraction_parts(
+            self._request_resume_parts(resume_text, settings.LLM_CHUNK_MAX_CHARS, whole=True)
+        )
+
+    def _request_resume_parts(self, text: str, max_chars: int, whole: bool) -> List[dict]:
+        """
+        Extract text in chunks of at most max_chars, one request per chunk.
+        A chunk whose answer is cut off at max_tokens is split in half and extracted again.
+        """
+        chunks = chunk_resume_text(text, max_chars)
+        parts = []
+        for chunk in chunks:
+            try:
+                response = self._create_chat_completion(**self._extraction_request(chunk, whole and len(chunks) == 1))
+                parts.append(self._load_extraction_json(self._completion_content(response)))
+            except TruncatedLLMResponse:
+                if len(chunk) < _MIN_CHUNK_CHARS:
+                    raise
+                logger.warning(f"Extraction of {len(chunk)} characters was truncated, splitting it")
+                parts.extend(self._request_resume_parts(chunk, len(chunk) // 2, whole=False))
+        return parts
+
+    async def _arequest_resume_data(self, resume_text: str) -> dict:
+        return self._merge_extraction_parts(
+            await self._arequest_resume_parts(resume_text, settings.LLM_CHUNK_MAX_CHARS, whole=True)
         )
-        content = response.choices[0].message['content'].strip()
-        logger.error(f"Raw LLM output: {content}")
+
+    async def _arequest_resume_parts(self, text: str, max_chars: int, whole: bool) -> List[dict]:
+        """Async _request_resume_parts; the chunks of a resume are extracted concurrently."""
+        chunks = chunk_resume_text(text, max_chars)
+
+        async def extract(chunk: str) -> List[dict]:
+            try:
+                response = await self._acreate_chat_completion(**self._extraction_request(chunk, whole and len(chunks) == 1))
+                return [self._load_extraction_json(self._completion_content(response))]
+            except TruncatedLLMResponse:
+                if len(chunk) < _MIN_CHUNK_CHARS:
+                    raise
+                logger.warning(f"Extraction of {len(chunk)} characters was truncated, splitting it")
+                return await self._arequest_resume_parts(chunk, len(chunk) // 2, whole=False)
+
+        return [part for parts in await asyncio.gather(*(extract(chunk) for chunk in chunks)) for part in parts]
+
+    @staticmethod
+    def _clean_llm_json(content: str) -> str:
+        """Strip markdown fences and any text around the outermost JSON object."""
+        if content.startswith("```json"):
+            content = content[7:-3].strip()
+        elif content.startswith("```"):
+            content = content[3:-3].strip()
+
+        if content.count('{') > 0 and content.count('}') > 0:
+            content = content[content.find('{'):content.rfind('}')+1]
+        return content
+
+    def _load_extraction_json(self, content: str):
+        """Clean and parse the raw LLM output for a resume extraction."""
+        logger.debug(f"Raw LLM output: {content}")
         try:
-            # Clean up the response content
-            if content.startswith("```json"):
-                content = content[7:-3].strip()
-            elif content.startswith("```"):
-                content = content[3:-3].strip()
-            
-            if content.count('{') > 0 and content.count('}') > 0:
-                content = content[content.find('{'):content.rfind('}')+1]
-            # Parse JSON
-            parsed_json = json.loads(content)
-            
+            return json.loads(self._clean_llm_json(content))
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse LLM response as JSON: {e}\nResponse: {content}")
+            raise ValueError(f"Failed to parse LLM response as JSON: {e}\nResponse: {content}")
+
+    def _parse_extraction_response(self, content: str) -> dict:
+        """Clean, parse and validate the raw LLM output for a resume extraction."""
+        return self._validate_extraction(self._load_extraction_json(content))
+
+    def _split_batch_response(self, content: str, count: int) -> list:
+        """Parse a batched extraction response into its per-resume objects, in prompt order."""
+        logger.debug(f"Raw batched LLM output: {content}")
+        try:
+            parsed = json.loads(self._clean_llm_json(content))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse batched LLM response as JSON: {e}")
+        items = parsed.get("resumes") if isinstance(parsed, dict) else parsed
+        if not isinstance(items, list) or len(items) != count:
+            raise ValueError(f"Batched LLM response does not hold {count} resumes")
+        return items
+
+    def _validate_extraction(self, parsed_json) -> dict:
+        """Validate one extracted resume against the schema and derive years_of_experience."""
+        try:
+            if not isinstance(parsed_json, dict):
+                raise ValueError("Extracted resume must be a JSON object")
+
             # Validate against schema
             try:
                 validate(instance=parsed_json, schema=RESUME_SCHEMA)
@@ -159,11 +502,8 @@ class ResumeLLMService:
             logger.info(json.dumps(parsed_json, indent=2))
             return parsed_json
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse LLM response as JSON: {e}\nResponse: {content}")
-            raise ValueError(f"Failed to parse LLM response as JSON: {e}\nResponse: {content}")
         except Exception as e:
-            logger.error(f"Error processing resume data: {e}\nResponse: {content}")
+            logger.error(f"Error processing resume data: {e}\nResponse: {parsed_json}")
             raise ValueError(f"Error processing resume data: {e}")
 
     def save_initial_data(self, data: dict, db: Session, resume_location: str) -> UserDetails:
@@ -186,8 +526,8 @@ class ResumeLLMService:
                 name=name,
                 email=email,
                 resume_location=resume_location,
-                created_at=datetime.now(UTC),
-                updated_at=datetime.now(UTC)
+                created_at=utc_now(),
+                updated_at=utc_now()
             )
             db.add(user)
             try:
@@ -200,8 +540,8 @@ class ResumeLLMService:
             session = SessionIdTable(
                 user_id=user.id,
                 session_token=str(uuid.uuid4()),
-                created_at=datetime.now(UTC),
-                expires_at=datetime.now(UTC) + timedelta(days=1),
+                created_at=utc_now(),
+                expires_at=utc_now() + timedelta(days=1),
                 is_valid=True
             )
             db.add(session)
@@ -226,55 +566,14 @@ class ResumeLLMService:
     def save_analysis_data(self, data: dict, db: Session, user_id: uuid.UUID) -> None:
         """
         Save detailed resume data during analysis.
-        Matches the analysis step in resume_service.py
+        Matches the analysis step in resume_service.py; only rows that changed since the last analysis are written.
         """
+        user = db.query(UserDetails).filter(UserDetails.id == user_id).first()
+        if not user:
+            raise ValueError("User not found")
         try:
-            user = db.query(UserDetails).filter(UserDetails.id == user_id).first()
-            if not user:
-                raise ValueError("User not found")
-
-            # Update basic user info
-            user.contact_no = data.get('phone')
-            user.current_job_title = data.get('work_experience', [{}])[0].get('title') if data.get('work_experience') else None
-            user.years_of_exp = data.get('years_of_experience')
-            user.skills = data.get('skills', [])
-            user.parsed_date = datetime.now(UTC)
-
-            # Clear existing related records
-            db.query(Academics).filter(Academics.user_id == user.id).delete()
-            db.query(Accolades).filter(Accolades.user_id == user.id).delete()
-            db.query(WorkExperience).filter(WorkExperience.user_id == user.id).delete()
-
-            # Add education records
-            for edu in data.get('education', []):
-                academic = Academics(
-                    id=uuid.uuid4(),
-                    user_id=user.id,
-                    school_name=edu.get('school', ''),
-                    degree=edu.get('degree', ''),
-                    school_year=edu.get('year'),
-                    school_type=self._map_degree_type(edu.get('degree', '').lower())
-                )
-                db.add(academic)
-
-            # Add work experience records
-            for exp in data.get('work_experience', []):
-                work = WorkExperience(
-                    id=uuid.uuid4(),
-                    user_id=user.id,
-                    company=exp.get('company', ''),
-                    position=exp.get('title', ''),
-                    joining_year=exp.get('start_year'),
-                    end_year=exp.get('end_year'),
-                    description=exp.get('description', '')
-                )
-                db.add(work)
-
-            db.commit()
-            logger.info(f"Analysis data saved for user_id: {user_id}")
-
+            save_profile(db, user, profile_from_llm(data, self))
         except Exception as e:
-            db.rollback()
             logger.error(f"Failed to save analysis data: {str(e)}")
             raise
 
@@ -297,31 +596,123 @@ class ResumeLLMService:
         :param question: The question to ask about the resume.
         :return: The LLM's answer as a string.
         """
-        prompt = (
-            f"Here is a resume:\n\n{resume_text}\n\n"
-            f"Question: {question}\n"
-            "Answer:"
+        response = self._create_chat_completion(
+            messages=self._build_question_messages(resume_text, question),
+            max_tokens=256,
+            temperature=0.2,
         )
-        response = openai.ChatCompletion.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are an expert resume assistant."},
-                {"role": "user", "content": prompt}
-            ],
+        return response.choices[0].message['content'].strip()
+
+    async def aask_question(self, resume_text: str, question: str) -> str:
+        """
+        Async variant of ask_question.
+        :param resume_text: The full text of the resume.
+        :param question: The question to ask about the resume.
+        :return: The LLM's answer as a string.
+        """
+        response = await self._acreate_chat_completion(
+            messages=self._build_question_messages(resume_text, question),
             max_tokens=256,
             temperature=0.2,
         )
         return response.choices[0].message['content'].strip()
 
-def extract_text_from_file(file_path):
+    def _build_question_messages(self, resume_text: str, question: str) -> list:
+        prompt = (
+            f"Here is a resume:\n\n{preprocess_resume_text(resume_text)}\n\n"
+            f"Question: {question}\n"
+            "Answer:"
+        )
+        return [
+            {"role": "system", "content": "You are an expert resume assistant."},
+            {"role": "user", "content": prompt}
+        ]
+
+class ResumeExtractionBatcher:
+    """
+    Collects concurrent extraction requests and sends them to the LLM in batches.
+
+    Callers await extract(text) as if it were aextract_resume_data. Requests arriving within
+    max_wait_seconds of each other are grouped (up to max_batch) into one aextract_resume_batch call,
+    which suits bulk ingestion where many workers extract at the same time.
+    """
+
+    def __init__(self, service: ResumeLLMService, max_batch: int = None, max_wait_seconds: float = None):
+        self.service = service
+        self.max_batch = max_batch or settings.LLM_BATCH_SIZE
+        self.max_wait_seconds = settings.LLM_BATCH_MAX_WAIT_SECONDS if max_wait_seconds is None else max_wait_seconds
+        self._pending: List[tuple] = []
+        self._flush_handle = None
+        # The loop only keeps weak references to tasks; hold in-flight batches until they finish
+        self._running: Set[asyncio.Task] = set()
+
+    async def extract(self, resume_text: str) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((resume_text, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.max_wait_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if pending:
+            task = asyncio.create_task(self._run(pending))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, pending: List[tuple]) -> None:
+        try:
+            results = await self.service.aextract_resume_batch([text for text, _ in pending])
+        except Exception as e:
+            results = [e] * len(pending)
+        for (_, future), result in zip(pending, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+# Bump when extraction output changes so stored text artifacts are rebuilt
+TEXT_EXTRACTOR_ARTIFACT = "pdfplumber-v2.txt"
+
+def extract_text_from_file(file_path, data: bytes = None):
+    """
+    Extract plain text from a PDF, DOCX or text resume.
+    When data holds the file's bytes (e.g. straight from an upload) it is parsed in memory and the file is not read.
+    Text of resumes in the blob store is kept as an artifact next to the file, so each file is only parsed once.
+    """
+    def build():
+        return _extract_text(file_path, data).encode("utf-8")
+    return resume_store.get_or_build_artifact(file_path, TEXT_EXTRACTOR_ARTIFACT, build).decode("utf-8")
+
+async def aextract_text_from_file(file_path, data: bytes = None):
+    """Async extract_text_from_file: stored text is read inline, extraction itself runs in the extraction process pool."""
+    cached = resume_store.read_artifact(file_path, TEXT_EXTRACTOR_ARTIFACT)
+    if cached is not None:
+        return cached.decode("utf-8")
+    text = await extraction_pool.run(_extract_text, file_path, data)
+    resume_store.write_artifact(file_path, TEXT_EXTRACTOR_ARTIFACT, text.encode("utf-8"))
+    return text
+
+def _extract_text(file_path, data: bytes = None):
     ext = os.path.splitext(file_path)[1].lower()
+    source = io.BytesIO(data) if data is not None else file_path
     if ext == ".pdf":
-        with pdfplumber.open(file_path) as pdf:
-            return "\n".join(page.extract_text() or "" for page in pdf.pages)
+        with pdfplumber.open(source) as pdf:
+            # Pages are separated by a form feed so preprocess_resume_text can spot running headers and footers
+            return PAGE_BREAK.join(page.extract_text() or "" for page in pdf.pages)
     elif ext in [".docx"]:
-        doc = Document(file_path)
+        doc = Document(source)
         return "\n".join([para.text for para in doc.paragraphs])
     else:  # fallback for .txt
+        if data is not None:
+            return bytes(data).decode("utf-8")
         with open(file_path, "r", encoding="utf-8") as f:
             return f.read()
 
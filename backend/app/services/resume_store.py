@@ -0,0 +1,200 @@
+import glob
+import logging
+import os
+import threading
+import uuid
+from typing import Callable, Dict, NamedTuple, Optional, Set
+
+from fastapi import UploadFile
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import UserDetails
+from app.services.upload_service import read_upload
+
+logger = logging.getLogger('custom_logger')
+
+
+class StoredResume(NamedTuple):
+    """A resume blob in the store, with the bytes kept for text extraction."""
+    path: str
+    sha256: str
+    size: int
+    data: bytes
+    created: bool
+
+
+class ResumeBlobStore:
+    """
+    Content-addressed store for resume files.
+
+    Each file lives at <root>/<sha[:2]>/<sha[2:4]>/<sha><ext>, so identical uploads share one blob and
+    two users uploading "resume.pdf" no longer overwrite each other. New blobs are written to
+    <root>/tmp and renamed into place, so a reader never sees a partial file. A blob is referenced by
+    the UserDetails rows whose resume_location points at it and is deleted when the last one goes.
+
+    Every put() also claims the blob until the caller either settle()s it (its UserDetails row is
+    committed) or release()s it (the upload failed). release() never deletes a blob another upload
+    of the same content still claims, so a failing upload cannot pull the file from under a
+    concurrent one that has not committed its row yet.
+
+    Derived artifacts (extracted text, spaCy DocBins) sit next to their blob as
+    <blob>.<artifact>, where the artifact name carries the extractor and its version. Since the blob
+    name is the file hash, an artifact is valid for as long as its name matches.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.tmp_dir = os.path.join(root, "tmp")
+        # Uploads in flight per blob path; claims and deletions are decided under one lock
+        self._claims: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # release() calls checking the database per blob path, and the paths put() again meanwhile.
+        # The reference query runs without the lock: it may run on the event loop (AsyncSession.run_sync),
+        # where a put() or settle() from another request would otherwise block on the lock forever.
+        self._releasing: Dict[str, int] = {}
+        self._reclaimed: Set[str] = set()
+
+    def path_for(self, sha256: str, ext: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], f"{sha256}{ext.lower()}")
+
+    async def put_upload(self, file: UploadFile) -> StoredResume:
+        """
+        Stream an upload into the store. Uploads whose content is already stored cost no disk write.
+        The blob is claimed until settle() or release() is called for it.
+        """
+        data, sha256 = await read_upload(file)
+        ext = os.path.splitext(file.filename or "")[1]
+        return self.put(data, sha256, ext)
+
+    def put(self, data: bytes, sha256: str, ext: str) -> StoredResume:
+        path = self.path_for(sha256, ext)
+        with self._lock:
+            # Claimed before the existence check, so a concurrent release() cannot delete it in between
+            self._claims[path] = self._claims.get(path, 0) + 1
+            if path in self._releasing:
+                self._reclaimed.add(path)
+        if os.path.exists(path):
+            logger.info(f"Resume blob already stored: {path}")
+            return StoredResume(path=path, sha256=sha256, size=len(data), data=data, created=False)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._write_atomic(path, data)
+        logger.info(f"Resume blob stored: {path} ({len(data)} bytes)")
+        return StoredResume(path=path, sha256=sha256, size=len(data), data=data, created=True)
+
+    def _unclaim(self, path: str) -> None:
+        # Callers hold self._lock
+        count = self._claims.get(path, 0) - 1
+        if count > 0:
+            self._claims[path] = count
+        else:
+            self._claims.pop(path, None)
+
+    def claims(self, path: str) -> int:
+        with self._lock:
+            return self._claims.get(path, 0)
+
+    def settle(self, path: str) -> None:
+        """Drop the claim of a put() whose UserDetails row is committed; the row keeps the blob now."""
+        with self._lock:
+            self._unclaim(path)
+
+    def owns(self, path: str) -> bool:
+        return bool(path) and os.path.abspath(path).startswith(os.path.abspath(self.root) + os.sep)
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        partial_path = os.path.join(self.tmp_dir, f"{uuid.uuid4().hex}.part")
+        try:
+            with open(partial_path, "wb") as out:
+                out.write(data)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(partial_path, path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+    def read_artifact(self, blob_path: str, artifact: str) -> Optional[bytes]:
+        """Return the stored artifact of a blob, or None. Paths outside the store have no artifacts."""
+        if not self.owns(blob_path):
+            return None
+        try:
+            with open(f"{blob_path}.{artifact}", "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Resume artifact read failed: {e}")
+            return None
+
+    def write_artifact(self, blob_path: str, artifact: str, data: bytes) -> None:
+        if not self.owns(blob_path):
+            return
+        try:
+            self._write_atomic(f"{blob_path}.{artifact}", data)
+        except OSError as e:
+            logger.warning(f"Resume artifact write failed: {e}")
+
+    def get_or_build_artifact(self, blob_path: str, artifact: str, build: Callable[[], bytes]) -> bytes:
+        """Load an artifact of the blob, building and storing it on a miss."""
+        data = self.read_artifact(blob_path, artifact)
+        if data is not None:
+            logger.debug(f"Resume artifact hit: {os.path.basename(blob_path)}.{artifact}")
+            return data
+        data = build()
+        self.write_artifact(blob_path, artifact, data)
+        return data
+
+    @staticmethod
+    def ref_count(path: str, db: Session) -> int:
+        return db.scalar(select(func.count()).select_from(UserDetails).where(UserDetails.resume_location == path))
+
+    def _end_release(self, path: str) -> bool:
+        # Callers hold self._lock; returns whether the blob was put() again during the release
+        reclaimed = path in self._reclaimed
+        count = self._releasing[path] - 1
+        if count > 0:
+            self._releasing[path] = count
+        else:
+            del self._releasing[path]
+            self._reclaimed.discard(path)
+        return reclaimed
+
+    def release(self, path: str, db: Session, claimed: bool = True) -> bool:
+        """
+        Drop the claim of a failed put() (claimed=False when the caller holds none, e.g. after deleting a
+        user) and delete the blob and its artifacts if no user references it and no other upload claims it.
+        Returns True if it was deleted.
+        """
+        with self._lock:
+            if claimed:
+                self._unclaim(path)
+            if not self.owns(path) or self._claims.get(path):
+                return False
+            self._releasing[path] = self._releasing.get(path, 0) + 1
+        try:
+            referenced = self.ref_count(path, db) > 0
+        except BaseException:
+            with self._lock:
+                self._end_release(path)
+            raise
+        with self._lock:
+            # An upload that put() the blob during the query may have committed its row after the query
+            # read the table, even if it has settled its claim already, so it keeps the blob too
+            if self._end_release(path) or referenced or self._claims.get(path):
+                return False
+            for artifact_path in glob.glob(f"{glob.escape(path)}.*"):
+                os.remove(artifact_path)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                return False
+        logger.info(f"Unreferenced resume blob deleted: {path}")
+        return True
+
+
+resume_store = ResumeBlobStore(settings.UPLOAD_DIR)
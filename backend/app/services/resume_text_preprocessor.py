@@ -0,0 +1,200 @@
+import re
+import unicodedata
+from collections import Counter
+from typing import List, Optional
+
+from app.resume_parser import SECTION_HEADINGS
+
+# Bump when the cleanup below changes, so cached LLM extractions of the old text are not reused
+PREPROCESSOR_VERSION = "1"
+
+# Page breaks in extracted text; pdfplumber pages are joined with a form feed
+PAGE_BREAK = "\f"
+
+_INVISIBLE_RE = re.compile(r'[\u200b-\u200f\u2028\u2029\u2060\ufeff\u00ad]|[\x00-\x08\x0b\x0e-\x1f\x7f]')
+_SPACES_RE = re.compile(r'[ \t\r\v\u00a0\u1680\u2000-\u200a\u202f\u205f\u3000]+')
+_BULLET_RE = re.compile(r'^[\u2022\u25cf\u25aa\u25a0\u25e6\u25ba\u2023\u2043\u2219\u27a2\u2013\u2014*]\s*')
+_DIGITS_RE = re.compile(r'\d+')
+_BOILERPLATE_RE = re.compile(
+    r'^(?:'
+    r'(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?'  # "3", "Page 2", "Page 2 of 4", "2/4"
+    r'|-\s*\d{1,3}\s*-'                                # "- 2 -"
+    r'|(?:curriculum\s+vitae|resume|r[ée]sum[ée]|cv)'  # a bare document title
+    r'|references\s+(?:are\s+)?(?:available\s+)?(?:up)?on\s+request\.?'
+    r'|(?:private\s+(?:and|&)\s+)?confidential'
+    r'|[\W_]+'                                         # separator rules and stray bullets
+    r')$',
+    re.IGNORECASE
+)
+_HEADING_RE = re.compile(
+    r'^[ \t]*(?:' + '|'.join(re.escape(h) for headings in SECTION_HEADINGS.values()
+                             for h in sorted(headings, key=len, reverse=True)) + r')[ \t]*(?::|$)',
+    re.IGNORECASE | re.MULTILINE
+)
+# Lines this close to the top or bottom of a page are checked for running headers and footers
+_PAGE_EDGE_LINES = 3
+
+
+def _clean_line(line: str) -> str:
+    line = _SPACES_RE.sub(" ", line).strip()
+    return _BULLET_RE.sub("- ", line)
+
+
+def _running_key(line: str) -> str:
+    # Page numbers differ from page to page, so they are ignored in lines that mention the page
+    line = line.lower()
+    return _DIGITS_RE.sub("#", line) if "page" in line else line
+
+
+def _running_lines(pages: List[List[str]]) -> set:
+    """Lines repeated at the top or bottom of more than one page: running headers and footers."""
+    if len(pages) < 2:
+        return set()
+    seen = Counter()
+    for lines in pages:
+        content = [line for line in lines if line]
+        edges = content[:_PAGE_EDGE_LINES] + content[-_PAGE_EDGE_LINES:]
+        seen.update({_running_key(line) for line in edges})
+    return {line for line, pages_with_line in seen.items() if pages_with_line > 1}
+
+
+def preprocess_resume_text(text: str) -> str:
+    """
+    Shrink extracted resume text before it is sent to the LLM, without losing content.
+
+    Normalizes unicode (ligatures, odd spaces, invisible characters), collapses whitespace and
+    bullet glyphs, drops page numbers and boilerplate lines, keeps only the first copy of running
+    page headers and footers, and squeezes blank-line runs. Applying it twice changes nothing.
+    """
+    text = _INVISIBLE_RE.sub("", unicodedata.normalize("NFKC", text or ""))
+    pages = [[_clean_line(line) for line in page.split("\n")] for page in text.split(PAGE_BREAK)]
+    running = _running_lines(pages)
+    kept_running = set()
+    output: List[str] = []
+    for lines in pages:
+        for line in lines:
+            if line and _BOILERPLATE_RE.match(line):
+                continue
+            if line and running:
+                key = _running_key(line)
+                if key in running:
+                    if key in kept_running:
+                        continue
+                    kept_running.add(key)
+            if not line and (not output or not output[-1]):
+                continue
+            output.append(line)
+    return "\n".join(output).strip()
+
+
+def _split_long(text: str, max_chars: int) -> List[str]:
+    """Split text on paragraph, then line, then word boundaries into pieces of at most max_chars."""
+    for separator in ("\n\n", "\n", " "):
+        if separator not in text:
+            continue
+        pieces, current = [], ""
+        for part in text.split(separator):
+            candidate = f"{current}{separator}{part}" if current else part
+            if len(candidate) <= max_chars:
+                current = candidate
+                continue
+            if current:
+                pieces.append(current)
+            current = part
+        pieces.append(current)
+        if all(len(piece) <= max_chars for piece in pieces):
+            return pieces
+        return [small for piece in pieces for small in _split_long(piece, max_chars)]
+    return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+
+def chunk_resume_text(text: str, max_chars: int) -> List[str]:
+    """
+    Split a long resume into chunks of at most max_chars, cutting at section headings.
+
+    Whole sections are packed together greedily; a section that is too long on its own is split on
+    paragraph boundaries and each continuation repeats the section's heading line for context.
+    Text that already fits is returned as a single chunk.
+    """
+    if len(text) <= max_chars:
+        return [text]
+    starts = [match.start() for match in _HEADING_RE.finditer(text)]
+    bounds = [0] + [start for start in starts if start > 0] + [len(text)]
+    sections = [text[start:end].strip() for start, end in zip(bounds, bounds[1:])]
+
+    chunks: List[str] = []
+    current = ""
+    for section in filter(None, sections):
+        if len(section) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            heading, _, body = section.partition("\n")
+            if not _HEADING_RE.match(heading) or len(heading) > max_chars // 4:
+                heading, body = None, section
+            chunks.extend(_section_pieces(body, heading, max_chars))
+            continue
+        candidate = f"{current}\n\n{section}" if current else section
+        if len(candidate) <= max_chars:
+            current = candidate
+        else:
+            chunks.append(current)
+            current = section
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _section_pieces(body: str, heading: Optional[str], max_chars: int) -> List[str]:
+    if heading is None:
+        return _split_long(body, max_chars)
+    room = max_chars - len(heading) - 1
+    return [f"{heading}\n{piece}" for piece in _split_long(body, room)]
+
+
+def _entry_key(entry: dict, fields: tuple) -> tuple:
+    return tuple(str(entry.get(field) or "").strip().lower() for field in fields)
+
+
+def _merge_entries(entries: List[dict], fields: tuple) -> List[dict]:
+    """Drop entries repeated across chunks, filling fields one copy missed from the other."""
+    merged = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        key = _entry_key(entry, fields)
+        if key not in merged:
+            merged[key] = dict(entry)
+            continue
+        kept = merged[key]
+        for field, value in entry.items():
+            if kept.get(field) in (None, "") and value not in (None, ""):
+                kept[field] = value
+    return list(merged.values())
+
+
+def merge_resume_chunks(parts: List[dict]) -> dict:
+    """
+    Combine the extractions of a resume's chunks into one resume.
+    Scalars take the first non-empty value; skills, education and work experience are concatenated
+    in chunk order without duplicates. years_of_experience is recomputed during validation.
+    """
+    merged = {"name": None, "email": None, "phone": None, "education": [], "skills": [],
+              "work_experience": [], "years_of_experience": None}
+    skills_seen = set()
+    education, work_experience = [], []
+    for part in parts:
+        if not isinstance(part, dict):
+            raise ValueError("Extracted resume part must be a JSON object")
+        for field in ("name", "email", "phone"):
+            if not merged[field] and isinstance(part.get(field), str) and part[field].strip():
+                merged[field] = part[field]
+        for skill in part.get("skills") or []:
+            if isinstance(skill, str) and skill.strip().lower() not in skills_seen:
+                skills_seen.add(skill.strip().lower())
+                merged["skills"].append(skill)
+        education.extend(part.get("education") or [])
+        work_experience.extend(part.get("work_experience") or [])
+    merged["education"] = _merge_entries(education, ("degree", "school", "year"))
+    merged["work_experience"] = _merge_entries(work_experience, ("company", "title", "start_year"))
+    return merged
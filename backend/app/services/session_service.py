@@ -0,0 +1,179 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, UTC
+from typing import Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import SessionIdTable
+from app.models.base import utc_now
+
+logger = logging.getLogger('custom_logger')
+
+
+def _as_utc(value: datetime) -> datetime:
+    # expires_at is a naive column holding UTC
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+class SessionValidator:
+    """
+    Answers "is this session of this user valid right now?" with a short-lived in-process cache
+    in front of the SessionIdTable lookup.
+
+    Only valid sessions are cached, each until ttl_seconds pass or its expires_at arrives, whichever
+    comes first, so an expired session is never accepted and a new session is accepted at once.
+    Changing is_valid or expires_at through the ORM (or deleting the session) evicts it when the
+    change commits; changes made by other processes or by bulk UPDATEs are picked up when the
+    entry's TTL runs out.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[uuid.UUID, uuid.UUID], Tuple[float, datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self.invalidations = 0
+
+    def _cached(self, key: Tuple[uuid.UUID, uuid.UUID]) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            cached_until, expires_at = entry
+            if time.monotonic() >= cached_until or datetime.now(UTC) >= expires_at:
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def _remember(self, key: Tuple[uuid.UUID, uuid.UUID], expires_at: datetime) -> None:
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _key(user_id, session_id) -> Tuple[uuid.UUID, uuid.UUID]:
+        return uuid.UUID(str(user_id)), uuid.UUID(str(session_id))
+
+    @staticmethod
+    def _lookup(key: Tuple[uuid.UUID, uuid.UUID]):
+        # Served by ix_session_id_table_validation without touching the table
+        return select(SessionIdTable.expires_at).where(
+            SessionIdTable.user_id == key[0],
+            SessionIdTable.session_id == key[1],
+            SessionIdTable.is_valid == True,
+            SessionIdTable.expires_at > utc_now()
+        )
+
+    def _check_cache(self, key: Tuple[uuid.UUID, uuid.UUID]) -> bool:
+        if self._cached(key):
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def _record(self, key: Tuple[uuid.UUID, uuid.UUID], expires_at) -> bool:
+        if expires_at is None:
+            self.rejected += 1
+            return False
+        self._remember(key, _as_utc(expires_at))
+        return True
+
+    def validate(self, db: Session, user_id, session_id) -> bool:
+        """
+        Check that session_id belongs to user_id, is still marked valid and has not expired.
+
+        Raises:
+            ValueError: If user_id or session_id is not a UUID
+        """
+        key = self._key(user_id, session_id)
+        if self._check_cache(key):
+            return True
+        return self._record(key, db.scalar(self._lookup(key)))
+
+    async def avalidate(self, db: AsyncSession, user_id, session_id) -> bool:
+        """
+        Async variant of validate; a cache hit returns without awaiting the database.
+
+        Raises:
+            ValueError: If user_id or session_id is not a UUID
+        """
+        key = self._key(user_id, session_id)
+        if self._check_cache(key):
+            return True
+        return self._record(key, await db.scalar(self._lookup(key)))
+
+    def invalidate(self, session_id) -> None:
+        """Forget a session, e.g. after it was revoked; the next check goes to the database."""
+        session_id = uuid.UUID(str(session_id))
+        with self._lock:
+            stale = [key for key in self._entries if key[1] == session_id]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "rejected": self.rejected,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+session_validator = SessionValidator(
+    ttl_seconds=settings.SESSION_CACHE_TTL_SECONDS,
+    max_entries=settings.SESSION_CACHE_MAX_ENTRIES
+)
+
+
+# Session.info key holding the session ids to evict once the transaction commits
+_PENDING_EVICTIONS = "session_validator_evictions"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_evictions(session, flush_context):
+    """
+    Note the sessions whose validity this flush changed or deleted. They are evicted after commit:
+    evicting earlier lets a concurrent request re-cache the old row before the change is visible.
+    """
+    pending = session.info.setdefault(_PENDING_EVICTIONS, set())
+    for target in session.dirty:
+        if isinstance(target, SessionIdTable):
+            attrs = inspect(target).attrs
+            if attrs.is_valid.history.has_changes() or attrs.expires_at.history.has_changes():
+                pending.add(target.session_id)
+    pending.update(target.session_id for target in session.deleted if isinstance(target, SessionIdTable))
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_after_commit(session):
+    for session_id in session.info.pop(_PENDING_EVICTIONS, ()):
+        session_validator.invalidate(session_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_evictions(session):
+    session.info.pop(_PENDING_EVICTIONS, None)
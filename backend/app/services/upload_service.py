@@ -0,0 +1,72 @@
+import hashlib
+import logging
+import os
+from typing import Tuple
+
+from fastapi import UploadFile
+
+from app.constants.messages import ERROR_MESSAGES
+from app.core.config import settings
+
+logger = logging.getLogger('custom_logger')
+
+
+async def read_upload(file: UploadFile, max_bytes: int = None, chunk_size: int = None) -> Tuple[bytearray, str]:
+    """
+    Read an upload in chunks, hashing it on the way.
+
+    The upload is rejected as soon as it grows past max_bytes (or up front when the client sent a
+    larger Content-Length), so memory per upload never exceeds the limit.
+
+    Returns:
+        tuple: (the uploaded bytes, their SHA-256 hex digest)
+
+    Raises:
+        ValueError: If the upload is empty or larger than max_bytes
+    """
+    max_bytes = max_bytes or settings.MAX_UPLOAD_BYTES
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    if file.size is not None and file.size > max_bytes:
+        raise ValueError(ERROR_MESSAGES.FILE_TOO_LARGE)
+
+    digest = hashlib.sha256()
+    data = bytearray()
+    while chunk := await file.read(chunk_size):
+        if len(data) + len(chunk) > max_bytes:
+            raise ValueError(ERROR_MESSAGES.FILE_TOO_LARGE)
+        digest.update(chunk)
+        data += chunk
+    if not data:
+        raise ValueError(ERROR_MESSAGES.EMPTY_FILE)
+    logger.debug(f"Upload read: {file.filename} ({len(data)} bytes)")
+    return data, digest.hexdigest()
+
+
+async def save_upload_to_file(file: UploadFile, path: str, max_bytes: int, chunk_size: int = None) -> str:
+    """
+    Stream a large upload (e.g. a bulk zip) to path chunk by chunk without holding it in memory.
+
+    Returns:
+        str: The SHA-256 hex digest of the upload
+
+    Raises:
+        ValueError: If the upload is larger than max_bytes
+    """
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    if file.size is not None and file.size > max_bytes:
+        raise ValueError(ERROR_MESSAGES.FILE_TOO_LARGE)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError(ERROR_MESSAGES.FILE_TOO_LARGE)
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return digest.hexdigest()
@@ -0,0 +1,103 @@
+"""
+Event-loop concurrency benchmark for the database layer.
+
+Runs many concurrent "requests" on one event loop, as a single uvicorn worker would. Each request looks up
+a user and its session the way the routes do, then awaits a short pause standing in for SerpApi or the LLM.
+With the sync Session every query blocks the loop, so the requests queue behind each other; with the
+AsyncSession they overlap. Reports requests/sec and latency for both. Needs the Postgres database
+configured through the usual DB_* environment variables; the user it creates is deleted at the end.
+A slow query (pg_sleep) can be added to make the blocking visible on a fast local database.
+
+Usage: python benchmarks/bench_db_async.py [concurrency] [requests] [query_sleep_ms]   (default: 50 1000 5)
+"""
+import sys
+import os
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, UTC
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, func, select
+from app.database import SessionLocal, AsyncSessionLocal, async_engine
+from app.models.user import UserDetails, SessionIdTable
+
+# Time each request spends awaiting something other than the database
+EXTERNAL_AWAIT_SECONDS = 0.01
+
+
+def lookup(user_id: uuid.UUID, session_id: uuid.UUID, sleep_ms: int):
+    statement = select(UserDetails.current_job_title, UserDetails.skills).join(
+        SessionIdTable, SessionIdTable.user_id == UserDetails.id
+    ).where(
+        UserDetails.id == user_id,
+        SessionIdTable.session_id == session_id,
+        SessionIdTable.is_valid == True,
+        SessionIdTable.expires_at > datetime.now(UTC)
+    )
+    if sleep_ms:
+        statement = statement.add_columns(func.pg_sleep(sleep_ms / 1000))
+    return statement
+
+
+async def sync_request(ids, sleep_ms: int) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(lookup(*ids, sleep_ms)).first()
+        db.commit()
+        await asyncio.sleep(EXTERNAL_AWAIT_SECONDS)
+    finally:
+        db.close()
+
+
+async def async_request(ids, sleep_ms: int) -> None:
+    async with AsyncSessionLocal() as db:
+        (await db.execute(lookup(*ids, sleep_ms))).first()
+        await db.commit()
+        await asyncio.sleep(EXTERNAL_AWAIT_SECONDS)
+
+
+async def run(request, ids, concurrency: int, total: int, sleep_ms: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await request(ids, sleep_ms)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return total / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+
+async def main() -> None:
+    concurrency, total, sleep_ms = [int(arg) for arg in sys.argv[1:4]] + [50, 1000, 5][len(sys.argv[1:4]):]
+    db = SessionLocal()
+    user = UserDetails(name="bench", email=f"bench-{uuid.uuid4()}@example.com", resume_location="bench")
+    db.add(user)
+    db.flush()
+    session = SessionIdTable(user_id=user.id, session_token=str(uuid.uuid4()), is_valid=True,
+                             expires_at=datetime.now(UTC) + timedelta(hours=1))
+    db.add(session)
+    db.commit()
+    ids = (user.id, session.session_id)
+    try:
+        print(f"{'session':>8} {'req/s':>10} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, request in (("sync", sync_request), ("async", async_request)):
+            rate, p50, p95 = await run(request, ids, concurrency, total, sleep_ms)
+            print(f"{name:>8} {rate:>10,.0f} {p50 * 1000:>8.1f} {p95 * 1000:>8.1f}")
+    finally:
+        db.execute(delete(SessionIdTable).where(SessionIdTable.session_id == ids[1]))
+        db.execute(delete(UserDetails).where(UserDetails.id == ids[0]))
+        db.commit()
+        db.close()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
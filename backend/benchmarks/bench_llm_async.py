@@ -0,0 +1,98 @@
+"""
+Async vs sync LLM extraction benchmark against a local stub of the OpenAI chat completions API.
+
+The stub answers every request with a fixed resume JSON after a fixed delay, so the numbers show
+how many extractions a single worker can overlap rather than real model latency.
+
+The batch line packs LLM_BATCH_SIZE resumes per request and reports prompt size per resume.
+
+Usage: python benchmarks/bench_llm_async.py [num_requests] [latency_seconds]
+"""
+import sys
+import os
+import time
+import json
+import asyncio
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+import openai
+from app.services.extraction_cache_service import ExtractionCacheService
+from app.services.resume_llm_service import ResumeLLMService
+
+STUB_PORT = 8765
+prompt_chars = []
+RESUME_JSON = {
+    "name": "John Doe",
+    "email": "john.doe@example.com",
+    "phone": "555-123-4567",
+    "education": [{"degree": "BSc", "school": "MIT", "year": 2018}],
+    "skills": ["Python", "SQL"],
+    "work_experience": [{"company": "Google", "title": "Engineer", "start_year": 2018, "end_year": 2022, "description": "Backend"}],
+    "years_of_experience": 4
+}
+
+
+def start_stub_server(latency: float) -> None:
+    async def chat_completions(request):
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        prompt_chars.append(sum(len(message["content"]) for message in body["messages"]))
+        await asyncio.sleep(latency)
+        batched = prompt.count("### Resume ")
+        content = json.dumps({"resumes": [RESUME_JSON] * batched} if batched else RESUME_JSON)
+        return web.json_response({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        })
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", chat_completions)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", STUB_PORT).start())
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    time.sleep(0.5)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    start_stub_server(latency)
+    openai.api_base = f"http://127.0.0.1:{STUB_PORT}/v1"
+    service = ResumeLLMService(api_key="stub", cache=ExtractionCacheService(backend="none"))
+    texts = [f"Resume number {i}" for i in range(count)]
+
+    start = time.perf_counter()
+    for text in texts:
+        service.extract_resume_data(text)
+    sync_elapsed = time.perf_counter() - start
+    print(f"sync:  {count} extractions in {sync_elapsed:.2f}s")
+
+    async def run_async():
+        await asyncio.gather(*(service.aextract_resume_data(text) for text in texts))
+
+    start = time.perf_counter()
+    asyncio.run(run_async())
+    async_elapsed = time.perf_counter() - start
+    print(f"async: {count} extractions in {async_elapsed:.2f}s")
+
+    prompt_chars.clear()
+    single_chars = len(service._build_extraction_messages(texts[0])[-1]["content"])
+    start = time.perf_counter()
+    asyncio.run(service.aextract_resume_batch(texts, use_cache=False))
+    batch_elapsed = time.perf_counter() - start
+    print(f"batch: {count} extractions in {batch_elapsed:.2f}s over {len(prompt_chars)} requests, "
+          f"{sum(prompt_chars) / count:.0f} prompt chars per resume (single: {single_chars})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Bulk resume parsing benchmark.
+
+Runs every ResumeParser extractor over a batch of synthetic resumes and reports resumes/sec.
+Uses a blank spaCy pipeline with a sentencizer so it runs without the en_core_web_sm model.
+
+Usage: python benchmarks/bench_resume_parser.py [num_resumes]
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spacy
+from app.resume_parser import ResumeParser, ResumeSections
+
+RESUME_TEMPLATE = """Candidate {i}
+Email: candidate{i}@example.com
+Phone: +1 (555) 010-{i:04d}
+
+Summary
+Backend developer with {years} years of experience building REST APIs in Python, Java and SQL.
+
+Education:
+Bachelor of Science in Computer Science at State University, 2012.
+Master of Science in Data Science at Tech Institute, 2014.
+
+Skills: Python, Django, Flask, PostgreSQL, Redis, Docker, Kubernetes, AWS, Git, Jenkins
+
+Work Experience
+Worked as senior engineer at Acme Corp from Jan 2018 - Present on payment services.
+Worked as software engineer at Globex from Mar 2014 - Dec 2017 on data pipelines.
+{filler}
+
+Certifications
+AWS certified solutions architect 2019 https://aws.amazon.com/certification/{i}
+"""
+
+
+def build_resumes(count: int):
+    filler = " ".join(["Improved throughput of batch jobs and mentored junior developers."] * 20)
+    return [RESUME_TEMPLATE.format(i=i, years=3 + i % 10, filler=filler) for i in range(count)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    docs = list(nlp.pipe(build_resumes(count)))
+    parser = ResumeParser()
+
+    start = time.perf_counter()
+    for doc in docs:
+        sections = ResumeSections(doc)
+        experience = parser._extract_experience(sections)
+        parser._extract_email(sections.text)
+        parser._extract_phone(sections.text)
+        parser._extract_current_job_title(sections, experience)
+        parser._calculate_years_of_experience(sections)
+        parser._extract_skills(sections)
+        parser._extract_education(sections)
+        parser._extract_accolades(sections)
+    elapsed = time.perf_counter() - start
+    print(f"{count} resumes in {elapsed:.3f}s ({count / elapsed:.0f} resumes/sec)")
+
+
+if __name__ == "__main__":
+    main()
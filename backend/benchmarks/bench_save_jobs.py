@@ -0,0 +1,107 @@
+"""
+Bulk persistence benchmark for JobSearchService.save_jobs_to_db.
+
+Compares the previous one-ORM-object-per-job path against the Core INSERT executemany and COPY
+paths at several batch sizes, reporting rows/sec. Needs the Postgres database configured through
+the usual DB_* environment variables; everything it writes is deleted again at the end.
+
+Usage: python benchmarks/bench_save_jobs.py [sizes...]   (default: 100 1000 10000)
+"""
+import sys
+import os
+import time
+import uuid
+from datetime import datetime, UTC
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete
+from app.database import SessionLocal
+from app.models.job import JobsOffered, SessionJobs
+from app.models.user import UserDetails, SessionIdTable
+from app.services.job_search_service import JobSearchService
+
+
+def make_jobs(count: int) -> list:
+    # A fresh tag per batch keeps fingerprints unique, so every method measures inserts rather than upserts
+    tag = uuid.uuid4().hex[:8]
+    return [
+        {
+            "job_id": str(uuid.uuid4()),
+            "job_title": f"Software Engineer {tag} {i}",
+            "cmp_name": f"Company {i % 50}",
+            "city": "Seattle",
+            "state": "WA",
+            "country": "USA",
+            "description": "Build and run backend services in Python and PostgreSQL. " * 10,
+            "qualification_required": "BSc in Computer Science, 3+ years of experience",
+            "skills_required": ["Python", "SQL", "AWS", 'C "quoted"', "back\\slash"],
+            "salary_offered": "$120k - $150k",
+            "posted_date": datetime.now(UTC),
+            "is_active": True
+        }
+        for i in range(count)
+    ]
+
+
+def save_with_orm(jobs: list, db, session_id: str) -> None:
+    """The pre-bulk implementation: one JobsOffered object and one INSERT per job."""
+    for job in jobs:
+        db.add(JobsOffered(
+            jobid=job["job_id"],
+            session_id=session_id,
+            job_title=job["job_title"],
+            cmp_name=job["cmp_name"],
+            city=job["city"],
+            state=job["state"],
+            country=job["country"],
+            description=job["description"],
+            qualification_required=job["qualification_required"],
+            skills_required=job["skills_required"],
+            salary_offered=job["salary_offered"],
+            posted_date=job["posted_date"],
+            is_active=job["is_active"]
+        ))
+    db.commit()
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000]
+    service = JobSearchService()
+    db = SessionLocal()
+    user = UserDetails(name="bench", email=f"bench-{uuid.uuid4()}@example.com", resume_location="bench")
+    db.add(user)
+    db.flush()
+    search_session = SessionIdTable(user_id=user.id, session_token=str(uuid.uuid4()))
+    db.add(search_session)
+    db.commit()
+    session_id = str(search_session.session_id)
+    user_id = user.id
+
+    methods = {
+        "orm": lambda jobs: save_with_orm(jobs, db, session_id),
+        "insert": lambda jobs: service.save_jobs_to_db(jobs, db, session_id, method="insert"),
+        "copy": lambda jobs: service.save_jobs_to_db(jobs, db, session_id, method="copy"),
+    }
+    try:
+        print(f"{'rows':>7} " + " ".join(f"{name + ' rows/s':>14}" for name in methods))
+        for size in sizes:
+            rates = []
+            for save in methods.values():
+                jobs = make_jobs(size)
+                start = time.perf_counter()
+                save(jobs)
+                rates.append(size / (time.perf_counter() - start))
+                db.expunge_all()
+            print(f"{size:>7} " + " ".join(f"{rate:>14,.0f}" for rate in rates))
+    finally:
+        db.rollback()
+        db.execute(delete(SessionJobs).where(SessionJobs.session_id == session_id))
+        db.execute(delete(JobsOffered).where(JobsOffered.session_id == session_id))
+        db.execute(delete(SessionIdTable).where(SessionIdTable.session_id == session_id))
+        db.execute(delete(UserDetails).where(UserDetails.id == user_id))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import json
+import re
+import threading
+import pytest
+import openai
+from aiohttp import web
+from sqlalchemy import DateTime, event
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+
+def fake_resume(text: str) -> dict:
+    """The extraction the fake LLM returns for a resume whose first line is '<name>, <email>'."""
+    name, email = [part.strip() for part in text.strip().splitlines()[0].split(",")]
+    return {
+        "name": name,
+        "email": email,
+        "phone": None,
+        "education": [],
+        "skills": ["Python"],
+        "work_experience": [{"company": "Acme", "title": "Engineer", "start_year": 2018, "end_year": 2022, "description": ""}],
+        "years_of_experience": None
+    }
+
+
+class FakeLLMServer:
+    """
+    Local stand-in for the OpenAI chat completions API.
+
+    Single-resume prompts ("Resume:\\n...") get one extraction back, batched prompts ("### Resume N ###")
+    get {"resumes": [...]}. Every request body is kept in `requests`; set `respond` to override the answer.
+    `respond` gets the prompt and returns the content, or a (content, finish_reason) pair.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.respond = None
+        self.url = None
+        self._loop = None
+        self._runner = None
+
+    def _answer(self, prompt: str) -> str:
+        if self.respond is not None:
+            return self.respond(prompt)
+        batched = re.split(r"### Resume \d+ ###\n", prompt)
+        if len(batched) > 1:
+            texts = [part.rsplit("\n\nJSON:", 1)[0] for part in batched[1:]]
+            return json.dumps({"resumes": [fake_resume(text) for text in texts]})
+        text = prompt.split("Resume:\n", 1)[1].rsplit("\n\nJSON:", 1)[0]
+        return json.dumps(fake_resume(text))
+
+    async def _chat_completions(self, request):
+        body = await request.json()
+        self.requests.append(body)
+        content = self._answer(body["messages"][-1]["content"])
+        content, finish_reason = content if isinstance(content, tuple) else (content, "stop")
+        prompt_tokens = sum(len(message["content"]) for message in body["messages"]) // 4
+        return web.json_response({
+            "id": "fake", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": finish_reason, "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(content) // 4,
+                      "total_tokens": prompt_tokens + len(content) // 4}
+        })
+
+    def start(self) -> None:
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            app = web.Application()
+            app.router.add_post("/v1/chat/completions", self._chat_completions)
+            self._runner = web.AppRunner(app)
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, "127.0.0.1", 0)
+            self._loop.run_until_complete(site.start())
+            port = site._server.sockets[0].getsockname()[1]
+            self.url = f"http://127.0.0.1:{port}/v1"
+            started.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        started.wait(5)
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+@pytest.fixture
+def fake_llm_server(monkeypatch):
+    server = FakeLLMServer()
+    server.start()
+    monkeypatch.setattr(openai, "api_base", server.url)
+    monkeypatch.setattr(openai, "api_key", "test")
+    yield server
+    server.stop()
+
+
+def refused_by_asyncpg(statement, params=None) -> list:
+    """
+    The binds of statement that asyncpg cannot encode: timezone-aware datetimes for DateTime columns
+    without a timezone. Its timestamp codec subtracts a naive datetime(2000, 1, 1) from the value.
+    """
+    compiled = statement.compile(dialect=asyncpg_dialect(), column_keys=list(params or {}))
+    values = compiled.construct_params(params)
+    return [name for name, bind in compiled.binds.items()
+            if isinstance(bind.type, DateTime) and not bind.type.timezone
+            and getattr(values.get(name), "tzinfo", None) is not None]
+
+
+@pytest.fixture
+def asyncpg_binds():
+    """
+    Call with a sync engine to record, per executed statement, the binds asyncpg would refuse.
+    The list stays empty while every naive DateTime column gets a naive value.
+    """
+    refused = []
+
+    def watch(engine):
+        @event.listens_for(engine, "before_execute")
+        def check(conn, clauseelement, multiparams, params, execution_options):
+            for parameters in multiparams or [params]:
+                refused.extend(refused_by_asyncpg(clauseelement, parameters))
+        return refused
+
+    return watch
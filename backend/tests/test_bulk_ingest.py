@@ -0,0 +1,93 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import zipfile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models import UserDetails, Academics, Accolades, WorkExperience, SessionIdTable
+from app.core.config import settings
+from app.services import bulk_ingest_service
+from app.services.bulk_ingest_service import BulkIngestService, open_resume_source
+from app.services.resume_store import ResumeBlobStore
+
+
+async def fake_extract(path, data):
+    name, email = bytes(data).decode("utf-8").split(",")
+    if name == "broken":
+        raise ValueError("unreadable")
+    return {"name": name, "email": email, "skills": ["Python"], "academics": [],
+            "accolades": [], "work_experience": [{"company": "Acme", "position": "Engineer", "joining_year": 2020,
+                                                  "end_year": None, "description": ""}]}
+
+
+def make_session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for model in (UserDetails, SessionIdTable, Academics, Accolades, WorkExperience):
+        model.__table__.create(engine)
+    return sessionmaker(bind=engine)
+
+
+def stored_blobs(tmp_path):
+    root = tmp_path / "store"
+    return {os.path.join(dirpath, name) for dirpath, _, names in os.walk(root)
+            if os.path.relpath(dirpath, root) != "tmp" for name in names}
+
+
+def make_service(tmp_path, session_factory, **kwargs):
+    return BulkIngestService(session_factory=session_factory, workers=3, batch_size=2,
+                             checkpoint_path=str(tmp_path / "checkpoint.json"),
+                             store=ResumeBlobStore(str(tmp_path / "store")), extract=fake_extract, **kwargs)
+
+
+def test_directory_ingest_batches_skips_and_resumes(tmp_path):
+    source = tmp_path / "resumes"
+    (source / "nested").mkdir(parents=True)
+    for i in range(5):
+        (source / f"r{i}.txt").write_text(f"Person {i},p{i}@example.com")
+    (source / "nested" / "dup.txt").write_text("Someone Else,p0@example.com")
+    (source / "nested" / "bad.txt").write_text("broken,x@example.com")
+    (source / "notes.md").write_text("ignored")
+    session_factory = make_session_factory()
+
+    progress = asyncio.run(make_service(tmp_path, session_factory).run(str(source))).to_dict()
+    assert progress["status"] == "completed"
+    assert (progress["seen"], progress["created"], progress["skipped"], progress["failed"]) == (7, 5, 1, 1)
+    with session_factory() as db:
+        assert db.query(UserDetails).count() == 5
+        assert db.query(SessionIdTable).count() == 5
+        assert db.query(WorkExperience).count() == 5
+        # Only the created users' blobs stay; the duplicate's and the unreadable file's are released
+        locations = {user.resume_location for user in db.query(UserDetails)}
+    assert stored_blobs(tmp_path) == locations
+
+    # The rerun only retries the file that failed
+    progress = asyncio.run(make_service(tmp_path, session_factory).run(str(source))).to_dict()
+    assert (progress["created"], progress["skipped"], progress["failed"]) == (0, 6, 1)
+
+
+def test_zip_source_lists_resumes_only(tmp_path):
+    archive_path = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("b.txt", "B,b@example.com")
+        archive.writestr("a/a.pdf", "%PDF")
+        archive.writestr("readme.md", "ignored")
+    with open_resume_source(str(archive_path)) as files:
+        assert [name for name, _ in files] == ["a/a.pdf", "b.txt"]
+        assert files[1][1]() == b"B,b@example.com"
+
+
+def test_finished_jobs_are_evicted_after_ttl_and_over_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_INGEST_JOB_TTL_SECONDS", 100)
+    monkeypatch.setattr(settings, "BULK_INGEST_MAX_FINISHED_JOBS", 2)
+    jobs = {}
+    for job_id, finished_at in (("running", None), ("old", 800.0), ("a", 950.0), ("b", 960.0), ("c", 970.0)):
+        service = make_service(tmp_path, None)
+        service.progress.finished_at = finished_at
+        jobs[job_id] = service
+    monkeypatch.setattr(bulk_ingest_service, "bulk_ingest_jobs", jobs)
+
+    assert bulk_ingest_service.evict_finished_jobs(now=1000.0) == 2
+    assert set(jobs) == {"running", "b", "c"}
@@ -0,0 +1,91 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# app.database builds its (unused here) engine URL at import time
+os.environ.setdefault("DB_PORT", "5432")
+
+from datetime import datetime, UTC
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+import app.database as database
+from app.core.config import settings
+from app.models.cache import JobSearchCache
+
+
+def test_pool_metrics_record_waits_and_timeouts(tmp_path, monkeypatch):
+    metrics = database.PoolMetrics()
+    monkeypatch.setattr(database, "pool_metrics", metrics)
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=database.InstrumentedQueuePool,
+                           pool_size=1, max_overflow=0, pool_timeout=0.05)
+    database._instrument(engine)
+
+    first = engine.connect()
+    first.execute(text("SELECT 1"))
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    stats = metrics.stats(engine.pool)
+    assert (stats["checked_out"], stats["checkouts"], stats["timeouts"], stats["connects"]) == (1, 1, 1, 1)
+
+    first.close()
+    with engine.connect():
+        pass
+    stats = metrics.stats(engine.pool)
+    assert (stats["checked_out"], stats["idle"], stats["checkouts"], stats["connects"]) == (0, 1, 2, 1)
+
+
+def test_release_connection_refuses_unsaved_changes(tmp_path, monkeypatch):
+    metrics = database.PoolMetrics()
+    monkeypatch.setattr(database, "pool_metrics", metrics)
+    engine = create_engine(f"sqlite:///{tmp_path / 'release.db'}", poolclass=database.InstrumentedQueuePool)
+    database._instrument(engine)
+    JobSearchCache.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+
+    db.execute(text("SELECT 1"))
+    assert metrics.stats(engine.pool)["checked_out"] == 1
+    database.release_connection(db)
+    assert metrics.stats(engine.pool)["checked_out"] == 0
+
+    db.add(JobSearchCache(cache_key="key", job_title="engineer", response={}, fetched_at=datetime.now(UTC)))
+    with pytest.raises(RuntimeError):
+        database.release_connection(db)
+    db.flush()
+    with pytest.raises(RuntimeError):
+        database.release_connection(db)
+    db.commit()
+    database.release_connection(db)
+    assert db.get(JobSearchCache, "key") is not None
+    db.close()
+
+
+def test_engine_options_follow_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", False)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    options = database._engine_options()
+    assert options["poolclass"] is database.InstrumentedQueuePool
+    assert options["pool_size"] == 7
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+    # PgBouncer does the pooling and rejects startup options
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    options = database._engine_options()
+    assert options["poolclass"] is NullPool
+    assert "connect_args" not in options
+
+
+def test_async_engine_options_use_asyncpg_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", False)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    options = database._engine_options(use_async=True)
+    assert options["poolclass"] is database.InstrumentedAsyncQueuePool
+    assert options["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+
+    # Without a session-pinned server connection asyncpg must not cache prepared statements
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    connect_args = database._engine_options(use_async=True)["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.cache import TTLCache
+from app.models.cache import ResumeExtractionCache
+from app.services.extraction_cache_service import ExtractionCacheService
+
+
+def test_ttl_cache_evicts_lru_and_expired_entries():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    cache.set("d", 4, ttl_seconds=0)
+    time.sleep(0.01)
+    assert cache.get("d") is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_make_key_depends_on_text_model_and_prompt_version():
+    key = ExtractionCacheService.make_key("resume", "gpt-3.5-turbo", "1")
+    assert key == ExtractionCacheService.make_key("resume", "gpt-3.5-turbo", "1")
+    assert key != ExtractionCacheService.make_key("resume", "gpt-4", "1")
+    assert key != ExtractionCacheService.make_key("resume", "gpt-3.5-turbo", "2")
+
+
+def test_db_tier_survives_a_cold_memory_tier():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    ResumeExtractionCache.__table__.create(engine)
+    session_factory = sessionmaker(bind=engine)
+    cache = ExtractionCacheService(backend="db", session_factory=session_factory)
+    cache.set("key", {"name": "John Doe", "skills": ["python"]}, "gpt-3.5-turbo", "1")
+
+    cache.memory.clear()
+    cached = cache.get("key")
+    assert cached == {"name": "John Doe", "skills": ["python"]}
+    cached["skills"].append("mutated")
+    assert cache.get("key")["skills"] == ["python"]
+    with session_factory() as db:
+        assert db.get(ResumeExtractionCache, "key").hit_count == 1
+
+
+def test_none_backend_never_caches():
+    cache = ExtractionCacheService(backend="none")
+    cache.set("key", {"name": "x"}, "m", "1")
+    assert cache.get("key") is None
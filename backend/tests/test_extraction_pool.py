@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+import pytest
+from app.services.extraction_pool import ExtractionPool
+
+
+def square(x):
+    return x * x
+
+
+def crash():
+    os._exit(1)
+
+
+def hang():
+    time.sleep(30)
+
+
+def make_pool(**kwargs):
+    options = {"max_workers": 2, "max_pending": 4, "task_timeout": 10, "preload_nlp": False}
+    options.update(kwargs)
+    return ExtractionPool(**options)
+
+
+def test_tasks_run_in_worker_processes():
+    pool = make_pool()
+
+    async def main():
+        return await asyncio.gather(*(pool.run(square, i) for i in range(8)))
+
+    try:
+        assert asyncio.run(main()) == [i * i for i in range(8)]
+        assert pool.stats()["completed"] == 8
+    finally:
+        pool.shutdown()
+
+
+def test_crashing_task_fails_alone_and_pool_recovers():
+    pool = make_pool()
+
+    async def main():
+        with pytest.raises(ValueError):
+            await pool.run(crash)
+        return await pool.run(square, 3)
+
+    try:
+        assert asyncio.run(main()) == 9
+        assert pool.stats()["crashes"] == 2
+        assert pool.stats()["failed"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_hung_task_times_out():
+    pool = make_pool(max_workers=1, task_timeout=1)
+
+    async def main():
+        with pytest.raises(ValueError):
+            await pool.run(hang)
+        return await pool.run(square, 4)
+
+    try:
+        started = time.perf_counter()
+        assert asyncio.run(main()) == 16
+        assert time.perf_counter() - started < 15
+        assert pool.stats()["timeouts"] == 1
+    finally:
+        pool.shutdown()
@@ -0,0 +1,35 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.job_match_service import JobMatchService, normalize_skill
+
+
+def test_normalize_skill():
+    assert normalize_skill(" Node.js ") == "node.js"
+    assert normalize_skill("C++") == "c++"
+    assert normalize_skill(None) == ""
+
+
+def test_rank_jobs_orders_by_score():
+    jobs = [
+        {"job_id": "a", "skills_required": ["Java", "Spring"]},
+        {"job_id": "b", "skills_required": ["Python", "SQL"]},
+        {"job_id": "c", "skills_required": ["5+ years of Python experience", "Docker"]},
+        {"job_id": "d", "skills_required": []},
+    ]
+    ranked = JobMatchService(["python", "SQL", "docker"]).rank_jobs(jobs)
+
+    assert [job["job_id"] for job in ranked][:2] == ["b", "c"]
+    assert ranked[0]["matched_on"] == ["python", "sql"]
+    assert set(ranked[1]["matched_on"]) == {"docker", "python"}
+    scores = {job["job_id"]: job["match_score"] for job in ranked}
+    assert scores["a"] == 0.0
+    assert scores["d"] == 0.0
+    assert 0.0 < scores["b"] <= 100.0
+
+
+def test_score_jobs_without_user_skills():
+    scores, matched_on = JobMatchService(None).score_jobs([{"skills_required": ["python"]}])
+    assert scores.tolist() == [0.0]
+    assert matched_on == [[]]
@@ -0,0 +1,131 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import csv
+import uuid
+from datetime import datetime, UTC
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from app.models.job import JobsOffered, SessionJobs
+from app.services.job_search_cache_service import JobSearchCacheService
+from app.services.job_search_service import JobSearchService, job_fingerprint, _copy_value, _copy_buffer
+
+
+def make_job(**overrides) -> dict:
+    job = {"job_title": "Software Engineer", "cmp_name": "Acme Inc", "city": "Austin", "state": "TX",
+           "country": "USA", "description": "Build APIs in Python.", "qualification_required": "BS",
+           "skills_required": ["Python"], "salary_offered": None, "posted_date": None, "is_active": True}
+    job.update(overrides)
+    return job
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    return JobSearchService(cache=JobSearchCacheService(backend="none"))
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    JobsOffered.__table__.create(engine)
+    SessionJobs.__table__.create(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+
+
+def test_fingerprint_ignores_case_whitespace_and_punctuation():
+    fingerprint = job_fingerprint(make_job())
+    assert fingerprint == job_fingerprint(make_job(job_title="  software   ENGINEER ", cmp_name="ACME, Inc.",
+                                                   city="austin", description="build  apis in\npython"))
+    assert fingerprint == job_fingerprint({**make_job(), "salary_offered": "$100k", "is_active": False})
+    assert fingerprint != job_fingerprint(make_job(city="Dallas"))
+    assert fingerprint != job_fingerprint(make_job(description="Build APIs in Go."))
+
+
+def test_repeats_within_a_batch_collapse_onto_one_row(service, db, asyncpg_binds):
+    session_id = str(uuid.uuid4())
+    refused = asyncpg_binds(db.get_bind())
+    jobs = [make_job(posted_date=datetime(2024, 5, 1, tzinfo=UTC)), make_job(job_title="software engineer "),
+            make_job(job_title="Data Engineer")]
+
+    job_ids = service.save_jobs_to_db(jobs, db, session_id)
+
+    assert job_ids[0] == job_ids[1] != job_ids[2]
+    assert [job["job_id"] for job in jobs] == job_ids
+    assert db.query(JobsOffered).count() == 2
+    assert db.query(SessionJobs).count() == 2
+    # posted_date is stored as naive UTC, so the insert also works through asyncpg
+    assert refused == []
+
+
+def test_a_second_session_links_to_the_stored_row(service, db):
+    first_session, second_session = str(uuid.uuid4()), str(uuid.uuid4())
+    [stored_id] = service.save_jobs_to_db([make_job(skills_required=["Python"])], db, first_session)
+
+    [job_id] = service.save_jobs_to_db([make_job(cmp_name="acme inc.", skills_required=["Python", "SQL"])],
+                                       db, second_session)
+
+    assert job_id == stored_id
+    job = db.query(JobsOffered).one()
+    assert str(job.session_id) == first_session
+    assert job.skills_required == ["Python", "SQL"]
+    linked = db.execute(select(SessionJobs.session_id, SessionJobs.jobid)).all()
+    assert sorted((str(session), str(jobid)) for session, jobid in linked) == sorted(
+        [(first_session, stored_id), (second_session, stored_id)])
+
+
+def test_rows_are_written_in_key_order(service, db):
+    batches = {}
+
+    @event.listens_for(db.get_bind(), "before_execute")
+    def record(conn, clauseelement, multiparams, params, execution_options):
+        if multiparams and getattr(clauseelement, "table", None) is not None:
+            batches[clauseelement.table.name] = multiparams
+
+    jobs = [make_job(job_title=f"Engineer {i}") for i in range(20)]
+    service.save_jobs_to_db(jobs, db, str(uuid.uuid4()))
+
+    # Every writer locks overlapping rows in the same order, so concurrent saves cannot deadlock
+    fingerprints = [row["fingerprint"] for row in batches["jobs_offered"]]
+    assert fingerprints == sorted(fingerprints) and len(fingerprints) == 20
+    jobids = [row["jobid"] for row in batches["session_jobs"]]
+    assert jobids == sorted(jobids) and len(jobids) == 20
+
+
+@pytest.mark.parametrize("value, field", [
+    (None, r'\N'),
+    (r'\N', r'"\N"'),
+    ("", '""'),
+    ('say "hi", then leave', '"say ""hi"", then leave"'),
+    ("C:\\temp\\new", '"C:\\temp\\new"'),
+    ("line one\nline two", '"line one\nline two"'),
+    (True, '"t"'),
+    (False, '"f"'),
+    (datetime(2024, 5, 1, 9, 30, tzinfo=UTC), '"2024-05-01T09:30:00+00:00"'),
+    ([], '"{}"'),
+    (["C++", "a,b", 'say "x"', "back\\slash", None, "NULL"],
+     '"{""C++"",""a,b"",""say \\""x\\"""",""back\\\\slash"",NULL,""NULL""}"'),
+])
+def test_copy_value_quotes_everything_but_null(value, field):
+    assert _copy_value(value) == field
+
+
+def test_copy_buffer_keeps_adversarial_rows_intact():
+    columns = ["job_title", "description", "skills_required", "salary_offered"]
+    rows = [
+        {"job_title": 'Engineer, "Platform"', "description": "multi\nline,\r\nwith \\N inside",
+         "skills_required": ["Go", "C#"], "salary_offered": None},
+        {"job_title": r"\N", "description": "", "skills_required": None, "salary_offered": "$1,000"},
+    ]
+    buffer = _copy_buffer(rows, columns).getvalue()
+
+    # Only real NULLs are written as a bare \N
+    assert buffer.count(",\\N") == 2
+    parsed = list(csv.reader(buffer.splitlines(keepends=True)))
+    assert parsed == [
+        ['Engineer, "Platform"', "multi\nline,\r\nwith \\N inside", '{"Go","C#"}', "\\N"],
+        ["\\N", "", "\\N", "$1,000"],
+    ]
@@ -0,0 +1,99 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from aiohttp import web
+from app.core.config import settings
+from app.services.job_search_cache_service import JobSearchCacheService
+from app.services.job_search_service import JobSearchService, close_http_session
+
+
+def _fake_serpapi_app(requests_seen, latency=0.0):
+    async def search(request):
+        query = request.query
+        requests_seen.append(dict(query))
+        await asyncio.sleep(latency)
+        page = int(query.get("next_page_token", "0"))
+        if query["q"] == "broken":
+            return web.json_response({"error": "Invalid API key"})
+        body = {
+            "jobs_results": [
+                {"title": f"{query['q']} {page}-{i}", "company_name": "Acme",
+                 "location": f"{query['location']}, CA, USA", "description": "Skills: python, sql"}
+                for i in range(2)
+            ]
+        }
+        if page < 4:
+            body["next_page_token"] = str(page + 1)
+        return web.json_response(body)
+
+    app = web.Application()
+    app.router.add_get("/search.json", search)
+    return app
+
+
+async def _with_fake_serpapi(monkeypatch, scenario, latency=0.0):
+    requests_seen = []
+    runner = web.AppRunner(_fake_serpapi_app(requests_seen, latency))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    monkeypatch.setattr(settings, "SERPAPI_BASE_URL", f"http://127.0.0.1:{port}/search.json")
+    try:
+        return await scenario(JobSearchService(cache=JobSearchCacheService(backend="none"))), requests_seen
+    finally:
+        await close_http_session()
+        await runner.cleanup()
+
+
+def test_pages_follow_next_page_token(monkeypatch):
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    saved_pages = []
+
+    async def save_page(page_jobs):
+        saved_pages.append(len(page_jobs))
+
+    async def scenario(service):
+        return await service.asearch_jobs("session", "Engineer", "Austin", num_pages=3, on_page=save_page)
+
+    jobs, requests_seen = asyncio.run(_with_fake_serpapi(monkeypatch, scenario))
+    assert [job["job_title"] for job in jobs] == [f"Engineer {p}-{i}" for p in range(3) for i in range(2)]
+    assert jobs[0]["city"] == "Austin"
+    assert saved_pages == [2, 2, 2]
+    # No request is made past the last page asked for
+    assert [r.get("next_page_token") for r in requests_seen] == [None, "1", "2"]
+
+
+def test_queries_run_concurrently_and_errors_stop_paging(monkeypatch):
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+
+    async def scenario(service):
+        return await service.asearch_many("session", [("Engineer", "Austin"), ("broken", "Austin"), ("Analyst", "Boston")], num_pages=2)
+
+    jobs, requests_seen = asyncio.run(_with_fake_serpapi(monkeypatch, scenario))
+    assert len(jobs) == 8
+    assert jobs[0]["job_title"] == "Engineer 0-0"
+    assert jobs[-1]["job_title"] == "Analyst 1-1"
+    assert len(requests_seen) == 5
+
+
+def test_next_page_is_fetched_while_the_page_is_saved(monkeypatch):
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    latency, save_seconds, pages = 0.2, 0.2, 4
+
+    async def save_page(page_jobs):
+        # Stands in for save_jobs_to_db running off the loop
+        await asyncio.to_thread(time.sleep, save_seconds)
+
+    async def scenario(service):
+        start = time.perf_counter()
+        await service.asearch_jobs("session", "Engineer", "Austin", num_pages=pages, on_page=save_page)
+        return time.perf_counter() - start
+
+    elapsed, requests_seen = asyncio.run(_with_fake_serpapi(monkeypatch, scenario, latency))
+    assert len(requests_seen) == pages
+    # Back to back this takes pages * (latency + save_seconds) = 1.6s; overlapped, each save hides the next fetch
+    assert elapsed < pages * (latency + save_seconds) - (pages - 2) * min(latency, save_seconds)
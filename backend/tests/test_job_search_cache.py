@@ -0,0 +1,91 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models.cache import JobSearchCache
+from app.services.job_search_cache_service import JobSearchCacheService
+
+
+def _counting_fetch(calls):
+    async def fetch():
+        calls.append(1)
+        return {"jobs_results": [{"title": f"job {len(calls)}"}]}
+    return fetch
+
+
+def test_key_normalizes_title_and_location():
+    key = JobSearchCacheService.make_key("Software  Engineer", "Austin, TX", None)
+    assert key == JobSearchCacheService.make_key(" software engineer", "austin,  tx", "")
+    assert key != JobSearchCacheService.make_key("software engineer", "austin, tx", "token")
+
+
+def test_fresh_hits_skip_fetch():
+    cache = JobSearchCacheService(backend="memory")
+    calls = []
+
+    async def run():
+        first = await cache.get_or_fetch("Engineer", "Austin", None, _counting_fetch(calls))
+        second = await cache.get_or_fetch("engineer", "austin", None, _counting_fetch(calls))
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_stale_page_is_served_while_refreshing():
+    cache = JobSearchCacheService(backend="memory", fresh_seconds=0, stale_seconds=60)
+    calls = []
+
+    async def run():
+        await cache.get_or_fetch("Engineer", "Austin", None, _counting_fetch(calls))
+        stale = await cache.get_or_fetch("Engineer", "Austin", None, _counting_fetch(calls))
+        await asyncio.gather(*cache._refreshing.values())
+        return stale
+
+    stale = asyncio.run(run())
+    assert stale["jobs_results"][0]["title"] == "job 1"
+    assert len(calls) == 2
+    assert cache.stats()["stale_hits"] == 1
+    assert cache.stats()["refreshes"] == 1
+
+
+def test_error_pages_are_not_cached():
+    cache = JobSearchCacheService(backend="memory")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return {"error": "quota exceeded"}
+
+    async def run():
+        await cache.get_or_fetch("Engineer", "Austin", None, fetch)
+        await cache.get_or_fetch("Engineer", "Austin", None, fetch)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_db_tier_prunes_stale_rows_and_caps_row_count():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    JobSearchCache.__table__.create(engine)
+    session_factory = sessionmaker(bind=engine)
+    cache = JobSearchCacheService(backend="db", fresh_seconds=60, stale_seconds=600, max_entries=2, prune_every=4,
+                                  session_factory=session_factory)
+    now = time.time()
+    cache._set_in_db(cache.make_key("stale", None, None), "stale", None, None, {"jobs_results": []}, now - 601)
+    for title in ("first", "second", "third"):
+        cache._set_in_db(cache.make_key(title, None, None), title, None, None, {"jobs_results": []}, now)
+        now += 1
+
+    with session_factory() as db:
+        assert sorted(db.query(JobSearchCache.job_title).all()) == [("second",), ("third",)]
+    assert cache.stats()["db_pruned_rows"] == 2
+    assert cache.stats()["db_last_pruned_at"] is not None
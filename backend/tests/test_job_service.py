@@ -0,0 +1,109 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import JobsOffered
+from app.models.job import JOB_SEARCH_DOCUMENT
+from app.services.job_service import parse_job_fields, decode_cursor, stream_jobs_page, search_stored_jobs, _search_query
+
+
+def make_sessions(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    path = tmp_path / "jobs.db"
+    engine = create_engine(f"sqlite:///{path}")
+    JobsOffered.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    start = datetime(2024, 1, 1)
+    for i in range(7):
+        # Two jobs share each date, and the last ones have none
+        posted = start + timedelta(days=i // 2) if i < 5 else None
+        db.add(JobsOffered(jobid=uuid.uuid4(), job_title=f"Engineer {i}", cmp_name="Acme",
+                           city="Seattle" if i % 2 else "Austin", country="USA", posted_date=posted,
+                           description="long text", skills_required=["Python"]))
+    db.commit()
+    expected = [(job.posted_date, job.jobid) for job in db.query(JobsOffered)]
+    expected.sort(key=lambda job: (job[0] is not None, job[0] or datetime.min, job[1]), reverse=True)
+    return async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{path}")), [str(jobid) for _, jobid in expected]
+
+
+def fetch(sessions, fields, filters, limit, cursor=None):
+    async def run():
+        return b"".join([chunk async for chunk in stream_jobs_page(sessions, fields, filters, limit, cursor)])
+    return json.loads(asyncio.run(run()))
+
+
+def test_pages_walk_every_job_once_newest_first(tmp_path):
+    sessions, expected = make_sessions(tmp_path)
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = fetch(sessions, parse_job_fields(None), {}, 2, cursor)
+        seen += [job["jobid"] for job in page["jobs"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+    assert pages == 4
+
+
+def test_filters_and_projection(tmp_path):
+    sessions, _ = make_sessions(tmp_path)
+    page = fetch(sessions, parse_job_fields("job_title, city"), {"city": "Seattle", "state": None}, 10)
+    assert len(page["jobs"]) == 3
+    assert all(set(job) == {"jobid", "job_title", "city"} and job["city"] == "Seattle" for job in page["jobs"])
+    assert page["next_cursor"] is None
+    assert "description" not in parse_job_fields(None)
+
+
+def test_bad_fields_and_cursors_are_rejected():
+    with pytest.raises(ValueError):
+        parse_job_fields("job_title,password")
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_search_ranks_title_matches_first_and_follows_updates(tmp_path):
+    sessions, _ = make_sessions(tmp_path)
+    from sqlalchemy import update
+
+    async def run():
+        async with sessions() as db:
+            db.add_all([
+                JobsOffered(jobid=uuid.uuid4(), job_title="Data Engineer", city="Austin",
+                            description="Build pipelines in Python and Spark"),
+                JobsOffered(jobid=uuid.uuid4(), job_title="Spark Developer", city="Seattle",
+                            qualification_required="3 years of Spark"),
+            ])
+            await db.commit()
+            ranked = await search_stored_jobs(db, "spark", ["job_title"], {}, 10)
+            in_seattle = await search_stored_jobs(db, "Spark", ["job_title"], {"city": "Seattle"}, 10)
+            both_words = await search_stored_jobs(db, "python pipelines!", ["job_title"], {}, 10)
+            await db.execute(update(JobsOffered).where(JobsOffered.job_title == "Data Engineer")
+                             .values(description="Build dashboards"))
+            await db.commit()
+            after_update = await search_stored_jobs(db, "pipelines", ["job_title"], {}, 10)
+            return ranked, in_seattle, both_words, after_update
+
+    ranked, in_seattle, both_words, after_update = asyncio.run(run())
+    assert [job["job_title"] for job in ranked] == ["Spark Developer", "Data Engineer"]
+    assert ranked[0]["rank"] > ranked[1]["rank"]
+    assert [job["job_title"] for job in in_seattle] == ["Spark Developer"]
+    assert [job["job_title"] for job in both_words] == ["Data Engineer"]
+    assert after_update == []
+
+
+def test_search_uses_the_gin_indexed_document_on_postgres():
+    from sqlalchemy.dialects import postgresql
+    sql = str(_search_query("postgresql", "python -java", ["job_title"], {}, 20).compile(dialect=postgresql.dialect()))
+    assert f"({JOB_SEARCH_DOCUMENT}) @@ websearch_to_tsquery('english'" in sql
+    assert "ORDER BY rank DESC" in sql
+    with pytest.raises(ValueError):
+        asyncio.run(search_stored_jobs(None, "  ?! ", [], {}, 20))
@@ -0,0 +1,50 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from app.services.llm_rate_limiter import TokenBucketRateLimiter, estimate_tokens, parse_reset_duration
+
+
+def test_estimate_and_reset_parsing():
+    messages = [{"role": "system", "content": "x" * 40}, {"role": "user", "content": "y" * 400}]
+    assert estimate_tokens(messages, 512) == 110 + 8 + 512
+    assert parse_reset_duration("6m0s") == 360
+    assert parse_reset_duration("20ms") == 0.02
+    assert parse_reset_duration("1.5") == 1.5
+    assert parse_reset_duration(None) is None
+
+
+def test_token_budget_paces_calls_in_arrival_order():
+    # 6000 tokens/min refills 100 tokens per second
+    limiter = TokenBucketRateLimiter(requests_per_minute=6000, tokens_per_minute=6000)
+    order = []
+
+    async def call(name, tokens):
+        await limiter.acquire(tokens)
+        order.append(name)
+
+    async def main():
+        await call("drain", 6000)
+        await asyncio.gather(call("big", 40), call("small", 1))
+
+    started = time.monotonic()
+    asyncio.run(main())
+    elapsed = time.monotonic() - started
+    assert order == ["drain", "big", "small"]
+    assert 0.35 < elapsed < 2
+    stats = limiter.stats()
+    assert stats["acquired"] == 3 and stats["waited"] == 2 and stats["queue_depth"] == 0
+
+
+def test_rate_limit_response_pauses_and_slows_the_limiter():
+    limiter = TokenBucketRateLimiter(requests_per_minute=6000, tokens_per_minute=600000)
+    limiter.on_rate_limited({"x-ratelimit-reset-requests": "300ms", "x-ratelimit-remaining-tokens": "10"})
+    assert limiter.rate_factor == 0.5
+    assert limiter.stats()["available_tokens"] < 100
+    waited = limiter.acquire_sync(1)
+    assert 0.2 < waited < 1
+    limiter.on_success(1)
+    assert limiter.rate_factor == 0.55
+    assert limiter.stats()["rate_limited"] == 1
@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from datetime import datetime, timedelta, UTC
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models import UserDetails, Academics, Accolades, WorkExperience, SessionIdTable
+from app.services.profile_service import get_user_profile, aget_user_profile, parse_profile_fields
+
+
+def make_db(url="sqlite://"):
+    engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for model in (UserDetails, SessionIdTable, Academics, Accolades, WorkExperience):
+        model.__table__.create(engine)
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    db = sessionmaker(bind=engine)()
+    user = UserDetails(name="Jane Roe", email="jane@example.com", resume_location="resume.pdf", skills=["Python"])
+    db.add(user)
+    db.flush()
+    session = SessionIdTable(user_id=user.id, session_token="token", is_valid=True,
+                             expires_at=datetime.now(UTC) + timedelta(days=1))
+    db.add(session)
+    db.add_all([
+        Academics(user_id=user.id, school_name="MIT", degree="BSc", school_year=2015),
+        Accolades(user_id=user.id, acco_url="https://example.com/award"),
+        WorkExperience(user_id=user.id, company="Acme", position="Engineer", joining_year=2018),
+        WorkExperience(user_id=user.id, company="Initech", position="Intern", joining_year=2016),
+    ])
+    db.commit()
+    ids = (str(user.id), str(session.session_id))
+    db.expunge_all()
+    statements.clear()
+    return db, ids, statements
+
+
+def test_profile_loads_each_requested_collection_with_one_query():
+    db, (user_id, session_id), statements = make_db()
+    fields = [field for field in parse_profile_fields(None) if field != "matched_jobs"]
+
+    profile = get_user_profile(db, user_id, session_id, fields)
+    assert profile["name"] == "Jane Roe"
+    assert [job["company"] for job in profile["work_experience"]] == ["Acme", "Initech"]
+    assert profile["academics"][0]["school_name"] == "MIT"
+    assert profile["accolades"][0]["acco_url"] == "https://example.com/award"
+    # User plus session check, then one selectin query per collection
+    assert len(statements) == 4
+    assert "session_id_table" in statements[0]
+
+
+def test_profile_returns_only_requested_fields():
+    db, (user_id, session_id), statements = make_db()
+
+    profile = get_user_profile(db, user_id, session_id, parse_profile_fields("skills, name"))
+    assert profile == {"id": user_id, "skills": ["Python"], "name": "Jane Roe"}
+    assert len(statements) == 1
+    assert "resume_location" not in statements[0]
+
+
+def test_profile_requires_a_valid_session():
+    db, (user_id, _), _ = make_db()
+    assert get_user_profile(db, user_id, "00000000-0000-0000-0000-000000000000", ["name"]) is None
+    with pytest.raises(ValueError):
+        parse_profile_fields("name,password")
+
+
+def test_async_profile_matches_the_sync_one(tmp_path, asyncpg_binds):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    path = tmp_path / "profile.db"
+    db, (user_id, session_id), _ = make_db(f"sqlite:///{path}")
+    fields = [field for field in parse_profile_fields(None) if field != "matched_jobs"]
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    refused = asyncpg_binds(engine.sync_engine)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def run():
+        async with sessions() as async_db:
+            return await aget_user_profile(async_db, user_id, session_id, fields)
+
+    assert asyncio.run(run()) == get_user_profile(db, user_id, session_id, fields)
+    assert refused == []
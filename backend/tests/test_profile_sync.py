@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models import UserDetails, Academics, Accolades, WorkExperience, SessionIdTable
+from app.services.profile_sync_service import save_profile
+
+PROFILE = {
+    "contact_no": "555 0100",
+    "current_job_title": "Engineer",
+    "years_of_exp": 5.0,
+    "skills": ["Python", "SQL"],
+    "academics": [{"school_name": "MIT", "degree": "BSc", "school_year": 2015, "school_type": "under_grad"}],
+    "accolades": [{"acco_url": "https://example.com/award", "acco_start_year": 2020, "acco_end_year": None}],
+    "work_experience": [
+        {"company": "Acme", "position": "Engineer", "joining_year": 2018, "end_year": None, "description": "Billing"},
+        {"company": "Initech", "position": "Intern", "joining_year": 2016, "end_year": 2017, "description": ""},
+    ]
+}
+
+
+def make_db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for model in (UserDetails, SessionIdTable, Academics, Accolades, WorkExperience):
+        model.__table__.create(engine)
+    writes = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record_writes(conn, cursor, statement, parameters, context, executemany):
+        if statement.split(None, 1)[0] in ("INSERT", "UPDATE", "DELETE"):
+            writes.append(statement)
+
+    db = sessionmaker(bind=engine)()
+    user = UserDetails(name="Jane Roe", email="jane@example.com", resume_location="resume.pdf")
+    db.add(user)
+    db.commit()
+    writes.clear()
+    return db, user, writes
+
+
+def test_unchanged_analysis_writes_nothing():
+    db, user, writes = make_db()
+    first = save_profile(db, user, PROFILE)
+    assert (first["inserted"], first["updated"], first["deleted"]) == (4, 0, 0)
+    assert user.parsed_date is not None
+
+    writes.clear()
+    assert save_profile(db, user, copy.deepcopy(PROFILE)) == {"inserted": 0, "updated": 0, "deleted": 0, "user_columns": 0}
+    assert writes == []
+
+
+def test_changed_analysis_only_touches_changed_rows():
+    db, user, writes = make_db()
+    save_profile(db, user, PROFILE)
+    ids = {row.company: row.id for row in db.query(WorkExperience)}
+
+    profile = copy.deepcopy(PROFILE)
+    profile["work_experience"][0]["end_year"] = 2024
+    profile["work_experience"].append(
+        {"company": "Globex", "position": "Lead", "joining_year": 2024, "end_year": None, "description": ""})
+    profile["academics"] = []
+    profile["skills"] = ["Python", "SQL", "Go"]
+    writes.clear()
+
+    counts = save_profile(db, user, profile)
+    assert counts == {"inserted": 1, "updated": 1, "deleted": 1, "user_columns": 1}
+    assert not any(statement.startswith("DELETE FROM work_experience") for statement in writes)
+    rows = {row.company: row for row in db.query(WorkExperience)}
+    assert rows["Acme"].id == ids["Acme"] and rows["Acme"].end_year == 2024
+    assert rows["Initech"].id == ids["Initech"]
+    assert "Globex" in rows
+    assert db.query(Academics).count() == 0
+    assert db.query(Accolades).count() == 1
@@ -0,0 +1,177 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import json
+from types import SimpleNamespace
+import openai
+import app.services.resume_llm_service as resume_llm_service
+from app.core.config import settings
+from app.services.extraction_cache_service import ExtractionCacheService
+from app.services.resume_llm_service import ResumeLLMService
+
+RESUME_JSON = {
+    "name": "John Doe",
+    "email": "john.doe@example.com",
+    "phone": None,
+    "education": [],
+    "skills": ["Python"],
+    "work_experience": [{"company": "Google", "title": "Engineer", "start_year": 2018, "end_year": 2022, "description": ""}],
+    "years_of_experience": None
+}
+
+
+def _response(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message={"content": content})])
+
+
+def _service():
+    return ResumeLLMService(api_key="test", cache=ExtractionCacheService(backend="memory"))
+
+
+def test_async_extraction_retries_rate_limits(monkeypatch):
+    calls = []
+
+    async def fake_acreate(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise openai.error.RateLimitError("slow down")
+        return _response(json.dumps(RESUME_JSON))
+
+    monkeypatch.setattr(openai.ChatCompletion, "acreate", fake_acreate)
+    monkeypatch.setattr(settings, "OPENAI_RETRY_BACKOFF_SECONDS", 0)
+    service = _service()
+
+    data = asyncio.run(service.aextract_resume_data("resume text"))
+    assert data["name"] == "John Doe"
+    assert len(calls) == 2
+    # The second call for the same text is served from the cache
+    asyncio.run(service.aextract_resume_data("resume text"))
+    assert len(calls) == 2
+
+
+def test_async_calls_respect_concurrency_limit(monkeypatch):
+    in_flight = []
+    peak = []
+
+    async def fake_acreate(**kwargs):
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.pop()
+        return _response("answer")
+
+    monkeypatch.setattr(openai.ChatCompletion, "acreate", fake_acreate)
+    monkeypatch.setattr(settings, "OPENAI_MAX_CONCURRENCY", 2)
+    monkeypatch.setattr(resume_llm_service, "_llm_semaphore", None)
+    service = _service()
+
+    async def run():
+        return await asyncio.gather(*(service.aask_question("resume", f"q{i}") for i in range(6)))
+
+    assert asyncio.run(run()) == ["answer"] * 6
+    assert max(peak) == 2
+    monkeypatch.setattr(resume_llm_service, "_llm_semaphore", None)
+
+
+def test_batched_extraction_packs_resumes_into_fewer_requests(fake_llm_server, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_BATCH_SIZE", 4)
+    service = _service()
+    texts = [f"Person {i}, p{i}@example.com\nBackend engineer" for i in range(8)]
+
+    results = asyncio.run(service.aextract_resume_batch(texts))
+    assert [result["email"] for result in results] == [f"p{i}@example.com" for i in range(8)]
+    assert len(fake_llm_server.requests) == 2
+    # The instructions and schema are sent once per request, not once per resume
+    batched_prompt = fake_llm_server.requests[0]["messages"][-1]["content"]
+    assert batched_prompt.count("Rules:") == 1
+
+    # Cached and repeated resumes cost no further requests
+    assert asyncio.run(service.aextract_resume_batch(texts[:3] + texts[:1]))[3]["name"] == "Person 0"
+    assert len(fake_llm_server.requests) == 2
+
+
+def test_batched_extraction_retries_resumes_missing_from_the_answer(fake_llm_server):
+    def drop_last_resume(prompt):
+        if "### Resume" in prompt:
+            return json.dumps({"resumes": [RESUME_JSON, RESUME_JSON]})
+        return json.dumps(dict(RESUME_JSON, name="Retried"))
+    fake_llm_server.respond = drop_last_resume
+
+    results = asyncio.run(_service().aextract_resume_batch(["a", "b", "c"]))
+    assert [result["name"] for result in results] == ["Retried"] * 3
+    assert len(fake_llm_server.requests) == 4
+
+
+def test_batcher_groups_concurrent_requests(fake_llm_server):
+    batcher = resume_llm_service.ResumeExtractionBatcher(_service(), max_batch=3, max_wait_seconds=0.05)
+
+    async def main():
+        extractions = [asyncio.ensure_future(batcher.extract(f"Person {i}, p{i}@example.com")) for i in range(5)]
+        await asyncio.sleep(0)
+        # The full batch of 3 was sent right away and is held until it finishes
+        assert len(batcher._running) == 1
+        return await asyncio.gather(*extractions)
+
+    results = asyncio.run(main())
+    assert [result["name"] for result in results] == [f"Person {i}" for i in range(5)]
+    assert len(fake_llm_server.requests) == 2
+    assert not batcher._running
+
+
+def _part_answer(part: str) -> dict:
+    """What the fake LLM extracts from one chunk of LONG_RESUME."""
+    answer = {"name": None, "email": None, "phone": None, "education": [], "skills": [], "work_experience": []}
+    if "jane@example.com" in part:
+        answer.update(name="Jane Roe", email="jane@example.com")
+    for i in range(6):
+        if f"Company {i}:" in part:
+            answer["work_experience"].append({"company": f"Company {i}", "title": "Engineer",
+                                              "start_year": 2010 + i, "end_year": 2011 + i, "description": None})
+            answer["skills"].append("Python")
+    if "MIT" in part:
+        answer["education"].append({"degree": "BSc", "school": "MIT", "year": 2009})
+    return answer
+
+
+LONG_RESUME = "\n\n".join([
+    "Jane Roe, jane@example.com",
+    "Experience\n" + "\n\n".join(f"Company {i}: built   services and data pipelines " * 4 + "\t" for i in range(6)),
+    "Education\nMIT BSc 2009",
+])
+
+
+def test_long_resume_is_extracted_in_chunks_and_merged(fake_llm_server, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CHUNK_MAX_CHARS", 400)
+    fake_llm_server.respond = lambda prompt: json.dumps(_part_answer(prompt.split("Resume part:\n", 1)[1]))
+
+    data = asyncio.run(_service().aextract_resume_data(LONG_RESUME))
+    assert data["name"] == "Jane Roe"
+    assert [job["company"] for job in data["work_experience"]] == [f"Company {i}" for i in range(6)]
+    assert data["education"][0]["school"] == "MIT"
+    assert data["skills"] == ["Python"]
+    assert len(fake_llm_server.requests) > 1
+    for request in fake_llm_server.requests:
+        part = request["messages"][-1]["content"].split("Resume part:\n", 1)[1]
+        assert "   " not in part and "\t" not in part
+        assert request["max_tokens"] < settings.LLM_EXTRACTION_MAX_TOKENS
+
+
+def test_truncated_extraction_is_split_and_retried(fake_llm_server, monkeypatch):
+    monkeypatch.setattr(resume_llm_service, "_MIN_CHUNK_CHARS", 200)
+
+    def respond(prompt):
+        if "Resume part:\n" not in prompt:
+            return '{"name": "Jane Roe", "work_experience": [{"company": "Comp', "length"
+        return json.dumps(_part_answer(prompt.split("Resume part:\n", 1)[1]))
+    fake_llm_server.respond = respond
+
+    data = _service().extract_resume_data(LONG_RESUME)
+    assert data["email"] == "jane@example.com"
+    assert len(data["work_experience"]) == 6
+    # One cut-off answer for the whole resume, then requests for pieces of at most half its size
+    first, *parts = [request["messages"][-1]["content"] for request in fake_llm_server.requests]
+    assert "Resume:\n" in first and len(parts) > 1
+    resume_length = len(resume_llm_service.preprocess_resume_text(LONG_RESUME))
+    assert all(len(part.split("Resume part:\n", 1)[1]) <= resume_length // 2 + len("\n\nJSON:") for part in parts)
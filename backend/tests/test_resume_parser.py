@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spacy
+from app.resume_parser import ResumeParser, ResumeSections, KeywordMatcher
+
+SAMPLE_RESUME = """John Doe
+Email: john.doe@example.com
+
+Education:
+Bachelor of Science in Computer Science, MIT, 2018.
+
+Skills: Python, SQL, docker
+
+Work Experience
+Worked as engineer at Google 2018-2022. Jan 2019 - Present worked on backend systems.
+
+Certifications
+AWS certified 2020 https://aws.amazon.com/certification
+"""
+
+
+def _sections(text: str) -> ResumeSections:
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return ResumeSections(nlp(text))
+
+
+def test_sentences_are_split_into_sections():
+    sections = _sections(SAMPLE_RESUME)
+    assert sections.has_section("education")
+    assert sections.has_section("skills")
+    assert [text for text, _ in sections.get("skills")] == ["Skills: Python, SQL, docker"]
+    assert len(sections.get("experience")) == 2
+    assert all(lower == text.lower() for text, lower in sections.sentences)
+
+
+def test_extractors_only_read_their_section():
+    parser = ResumeParser()
+    sections = _sections(SAMPLE_RESUME)
+    education = parser._extract_education(sections)
+    accolades = parser._extract_accolades(sections)
+    experience = parser._extract_experience(sections)
+    assert [edu["degree_type"] for edu in education] == ["bachelor"]
+    assert [acc["url"] for acc in accolades] == ["https://aws.amazon.com/certification"]
+    assert experience[0]["company"] == "google"
+
+
+def test_missing_heading_falls_back_to_whole_resume():
+    sections = _sections("Jane Roe. Worked as analyst at Acme 2015-2019.")
+    assert not sections.has_section("experience")
+    assert len(ResumeParser()._extract_experience(sections)) == 1
+
+
+def test_keyword_matcher_uses_word_boundaries_and_nested_keywords():
+    matcher = KeywordMatcher(["java", "rest", "rest api", "C++"])
+    assert matcher.find_all("javascript, rest api and c++") == {"rest", "rest api", "c++"}
+    assert matcher.first("senior rest api java developer") == "java"
+    assert matcher.first("nothing relevant") is None
+
+
+def test_years_are_extracted_as_full_years():
+    sections = _sections(SAMPLE_RESUME)
+    education = ResumeParser()._extract_education(sections)
+    assert education[0]["year"] == 2018
@@ -0,0 +1,41 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# app.database builds its (unused here) engine URL at import time
+os.environ.setdefault("DB_PORT", "5432")
+
+import asyncio
+import io
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import create_engine
+from app.models import UserDetails, SessionIdTable
+from app.services import resume_service
+from app.services.resume_store import ResumeBlobStore
+
+
+def test_upload_creates_user_and_session_with_naive_utc_times(tmp_path, monkeypatch, asyncpg_binds):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    path = tmp_path / "upload.db"
+    setup = create_engine(f"sqlite:///{path}")
+    for model in (UserDetails, SessionIdTable):
+        model.__table__.create(setup)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    refused = asyncpg_binds(engine.sync_engine)
+    monkeypatch.setattr(resume_service, "resume_store", ResumeBlobStore(str(tmp_path / "resumes")))
+
+    async def parse(fn, file_location, data):
+        return {"name": "Jane Roe", "email": "jane@example.com"}
+
+    monkeypatch.setattr(resume_service.extraction_pool, "run", parse)
+
+    async def run():
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            upload = UploadFile(io.BytesIO(b"Jane Roe\njane@example.com\n"), filename="resume.txt")
+            return await resume_service.upload_resume_service(upload, db, use_llm=False)
+
+    result = asyncio.run(run())
+    assert result["user_id"] and result["session_id"]
+    # created_at, updated_at and expires_at are naive columns; asyncpg refuses aware values for them
+    assert refused == []
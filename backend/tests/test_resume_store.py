@@ -0,0 +1,142 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import hashlib
+import io
+import threading
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models import UserDetails
+from app.services.resume_llm_service import extract_text_from_file
+from app.services.resume_store import ResumeBlobStore
+from app.services.upload_service import read_upload
+
+CONTENT = b"John Doe\njohn@example.com\n" * 1000
+
+
+def make_upload(content: bytes, filename: str = "resume.txt") -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename=filename)
+
+
+def test_read_upload_hashes_in_chunks():
+    data, sha256 = asyncio.run(read_upload(make_upload(CONTENT), chunk_size=4096))
+    assert data == CONTENT
+    assert sha256 == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_read_upload_rejects_oversized_file():
+    with pytest.raises(ValueError):
+        asyncio.run(read_upload(make_upload(b"x" * 10000), max_bytes=4096, chunk_size=1024))
+
+
+def test_identical_uploads_share_one_sharded_blob(tmp_path):
+    store = ResumeBlobStore(str(tmp_path))
+    first = asyncio.run(store.put_upload(make_upload(CONTENT, "resume.txt")))
+    second = asyncio.run(store.put_upload(make_upload(CONTENT, "other-name.TXT")))
+    sha256 = hashlib.sha256(CONTENT).hexdigest()
+    assert first.path == second.path == os.path.join(str(tmp_path), sha256[:2], sha256[2:4], f"{sha256}.txt")
+    assert first.created and not second.created
+    assert os.listdir(tmp_path / "tmp") == []
+    assert extract_text_from_file(first.path, first.data) == CONTENT.decode("utf-8")
+
+
+def test_release_deletes_only_unreferenced_blobs(tmp_path):
+    engine = create_engine("sqlite://")
+    UserDetails.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    store = ResumeBlobStore(str(tmp_path))
+    stored = store.put(CONTENT, hashlib.sha256(CONTENT).hexdigest(), ".txt")
+
+    db.add(UserDetails(name="John Doe", email="john@example.com", resume_location=stored.path))
+    db.commit()
+    store.settle(stored.path)
+    assert store.ref_count(stored.path, db) == 1
+    assert not store.release(stored.path, db, claimed=False)
+    assert os.path.exists(stored.path)
+
+    db.query(UserDetails).delete()
+    db.commit()
+    assert store.release(stored.path, db, claimed=False)
+    assert not os.path.exists(stored.path)
+
+
+def test_failed_upload_keeps_a_blob_a_concurrent_upload_still_needs(tmp_path):
+    engine = create_engine("sqlite://")
+    UserDetails.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    store = ResumeBlobStore(str(tmp_path))
+    sha256 = hashlib.sha256(CONTENT).hexdigest()
+
+    # Upload A stores the blob, upload B of the same bytes finds it, then A fails before B commits
+    failing = store.put(CONTENT, sha256, ".txt")
+    concurrent = store.put(CONTENT, sha256, ".txt")
+    assert failing.created and not concurrent.created
+    assert not store.release(failing.path, db)
+    assert os.path.exists(concurrent.path)
+
+    db.add(UserDetails(name="John Doe", email="john@example.com", resume_location=concurrent.path))
+    db.commit()
+    store.settle(concurrent.path)
+    assert store.claims(concurrent.path) == 0
+    assert os.path.exists(concurrent.path)
+
+    # Without a concurrent upload, a failed one removes the blob it created
+    other = store.put(b"other resume", hashlib.sha256(b"other resume").hexdigest(), ".txt")
+    assert store.release(other.path, db)
+    assert not os.path.exists(other.path)
+
+
+def test_release_queries_references_without_holding_the_lock(tmp_path, monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    UserDetails.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    store = ResumeBlobStore(str(tmp_path))
+    sha256 = hashlib.sha256(CONTENT).hexdigest()
+    failing = store.put(CONTENT, sha256, ".txt")
+    ref_count = ResumeBlobStore.ref_count
+
+    def ref_count_during_upload(path, session):
+        # Another request on the same thread uploads the same file and commits while the query runs
+        concurrent = store.put(CONTENT, sha256, ".txt")
+        count = ref_count(path, session)
+        db.add(UserDetails(name="John Doe", email="john@example.com", resume_location=concurrent.path))
+        db.commit()
+        store.settle(concurrent.path)
+        return count
+
+    monkeypatch.setattr(store, "ref_count", ref_count_during_upload)
+    released = []
+    worker = threading.Thread(target=lambda: released.append(store.release(failing.path, db)), daemon=True)
+    worker.start()
+    worker.join(5)
+    assert not worker.is_alive()
+    assert released == [False]
+    assert os.path.exists(failing.path)
+    assert not store._releasing and not store._reclaimed
+
+
+def test_artifacts_are_built_once_and_released_with_the_blob(tmp_path):
+    engine = create_engine("sqlite://")
+    UserDetails.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    store = ResumeBlobStore(str(tmp_path))
+    stored = store.put(CONTENT, hashlib.sha256(CONTENT).hexdigest(), ".txt")
+    builds = []
+
+    def build():
+        builds.append(1)
+        return b"extracted text"
+
+    assert store.get_or_build_artifact(stored.path, "test-v1.txt", build) == b"extracted text"
+    assert store.get_or_build_artifact(stored.path, "test-v1.txt", build) == b"extracted text"
+    assert len(builds) == 1
+    # Files outside the store are never cached
+    assert store.read_artifact(str(tmp_path.parent / "resume.pdf"), "test-v1.txt") is None
+
+    assert store.release(stored.path, db)
+    assert not os.path.exists(f"{stored.path}.test-v1.txt")
@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.resume_text_preprocessor import chunk_resume_text, merge_resume_chunks, preprocess_resume_text
+
+PAGE_ONE = (
+    "Jane Roe | Senior Engineer\n"
+    "jane.roe@example.com   ·   +1 555 0100\n"
+    "\n\n\n"
+    "WORK EXPERIENCE\n"
+    "Acme Corp\t\tStaff Engineer   2019 - 2023\n"
+    "• Built the billing platform in Python\n"
+    "●  Led a team of ﬁve\n"
+    "Page 1 of 2"
+)
+PAGE_TWO = (
+    "Jane Roe | Senior Engineer\n"
+    "EDUCATION\n"
+    "MIT  BSc Computer Science 2015\n"
+    "__________________\n"
+    "References available upon request\n"
+    "Page 2 of 2"
+)
+
+
+def test_preprocess_strips_layout_noise_but_keeps_content():
+    text = preprocess_resume_text(PAGE_ONE + "\f" + PAGE_TWO)
+    assert text == (
+        "Jane Roe | Senior Engineer\n"
+        "jane.roe@example.com · +1 555 0100\n"
+        "\n"
+        "WORK EXPERIENCE\n"
+        "Acme Corp Staff Engineer 2019 - 2023\n"
+        "- Built the billing platform in Python\n"
+        "- Led a team of five\n"
+        "EDUCATION\n"
+        "MIT BSc Computer Science 2015"
+    )
+    assert preprocess_resume_text(text) == text
+
+
+def test_preprocess_only_dedupes_lines_repeated_at_page_edges():
+    body = "Python\nProject A\nSQL\nProject B\nAWS\nProject C\nPython"
+    text = preprocess_resume_text(f"{body}\f{body}")
+    # "Python" heads and ends both pages, so only its first copy survives; inner lines are untouched
+    assert text.count("Python") == 1
+    assert text.count("Project B") == 2
+
+
+def test_chunks_cut_at_section_headings_and_fit_the_limit():
+    sections = [
+        "Jane Roe, jane@example.com",
+        "Experience\n" + "\n\n".join(f"Company {i}: built services and pipelines for {i} years" for i in range(12)),
+        "Education\nMIT BSc 2015",
+        "Skills\nPython, SQL, AWS",
+    ]
+    text = "\n\n".join(sections)
+    chunks = chunk_resume_text(text, 300)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    assert chunks[0].startswith("Jane Roe")
+    # Continuations of the oversized Experience section carry its heading
+    experience_chunks = [chunk for chunk in chunks if "Company" in chunk]
+    assert len(experience_chunks) > 1
+    assert all(chunk.startswith("Experience\n") for chunk in experience_chunks)
+    assert any(chunk.startswith("Education") and "Skills" in chunk for chunk in chunks)
+    for i in range(12):
+        assert sum(f"Company {i}:" in chunk for chunk in chunks) == 1
+    assert chunk_resume_text("short resume", 300) == ["short resume"]
+
+
+def test_merge_combines_chunk_extractions():
+    job = {"company": "Acme", "title": "Engineer", "start_year": 2019, "end_year": None, "description": None}
+    merged = merge_resume_chunks([
+        {"name": "Jane Roe", "email": "jane@example.com", "phone": None, "skills": ["Python", "SQL"],
+         "education": [], "work_experience": [job]},
+        {"name": None, "email": None, "phone": "555 0100", "skills": ["python", "AWS"],
+         "education": [{"degree": "BSc", "school": "MIT", "year": 2015}],
+         "work_experience": [dict(job, end_year=2023, description="Billing")]},
+    ])
+    assert merged["name"] == "Jane Roe"
+    assert merged["phone"] == "555 0100"
+    assert merged["skills"] == ["Python", "SQL", "AWS"]
+    assert merged["education"] == [{"degree": "BSc", "school": "MIT", "year": 2015}]
+    assert merged["work_experience"] == [dict(job, end_year=2023, description="Billing")]
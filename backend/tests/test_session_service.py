@@ -0,0 +1,164 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# app.database builds its (unused here) engine URL at import time
+os.environ.setdefault("DB_PORT", "5432")
+
+import asyncio
+import time
+from datetime import datetime, timedelta, UTC
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import get_async_db
+from app.models import UserDetails, SessionIdTable
+from app.services import session_service
+from app.services.session_service import SessionValidator
+from app.api.v1.dependencies import require_valid_session
+
+
+def make_db(url="sqlite://"):
+    engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    for model in (UserDetails, SessionIdTable):
+        model.__table__.create(engine)
+    selects = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            selects.append(statement)
+
+    db = sessionmaker(bind=engine)()
+    user = UserDetails(name="Jane Roe", email="jane@example.com", resume_location="resume.pdf")
+    db.add(user)
+    db.flush()
+    session = SessionIdTable(user_id=user.id, session_token="token", is_valid=True,
+                             expires_at=datetime.now(UTC) + timedelta(days=1))
+    db.add(session)
+    db.commit()
+    ids = (user.id, session.session_id)
+    selects.clear()
+    return db, session, ids, selects
+
+
+def test_valid_sessions_are_served_from_the_cache(monkeypatch):
+    db, session, (user_id, session_id), selects = make_db()
+    validator = SessionValidator(ttl_seconds=60, max_entries=10)
+
+    assert validator.validate(db, user_id, session_id)
+    assert validator.validate(db, str(user_id), str(session_id))
+    assert len(selects) == 1
+    assert (validator.hits, validator.misses) == (1, 1)
+    # Another user's id with this session is not accepted
+    assert not validator.validate(db, "00000000-0000-0000-0000-000000000000", session_id)
+
+
+def test_cached_sessions_respect_expires_at_and_ttl():
+    db, session, (user_id, session_id), selects = make_db()
+    validator = SessionValidator(ttl_seconds=0.05, max_entries=10)
+    assert validator.validate(db, user_id, session_id)
+    time.sleep(0.06)
+    assert validator.validate(db, user_id, session_id)
+    assert len(selects) == 2
+
+    validator = SessionValidator(ttl_seconds=60, max_entries=10)
+    validator._remember((user_id, session_id), datetime.now(UTC) - timedelta(seconds=1))
+    assert validator.validate(db, user_id, session_id)
+    assert validator.misses == 1
+
+
+def test_revoking_a_session_evicts_it(monkeypatch):
+    db, session, (user_id, session_id), selects = make_db()
+    validator = SessionValidator(ttl_seconds=60, max_entries=10)
+    monkeypatch.setattr(session_service, "session_validator", validator)
+    assert validator.validate(db, user_id, session_id)
+
+    session.is_valid = False
+    db.flush()
+    # Not committed yet, so the cached entry stays
+    assert validator.invalidations == 0
+    db.commit()
+    assert not validator.validate(db, user_id, session_id)
+    assert validator.invalidations == 1
+
+
+def test_rolled_back_changes_and_deletes(monkeypatch):
+    db, session, (user_id, session_id), selects = make_db()
+    validator = SessionValidator(ttl_seconds=60, max_entries=10)
+    monkeypatch.setattr(session_service, "session_validator", validator)
+    assert validator.validate(db, user_id, session_id)
+
+    session.is_valid = False
+    db.flush()
+    db.rollback()
+    assert validator.invalidations == 0
+    assert validator.validate(db, user_id, session_id)
+
+    db.delete(session)
+    db.flush()
+    assert validator.invalidations == 0
+    db.commit()
+    assert validator.invalidations == 1
+    assert not validator.validate(db, user_id, session_id)
+
+
+class Body(BaseModel):
+    user_id: str
+    session_id: str
+
+
+def async_sessions(tmp_path):
+    """A file database seeded through the sync session, and an aiosqlite session factory on the same file."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    path = tmp_path / "sessions.db"
+    db, session, ids, _ = make_db(f"sqlite:///{path}")
+    return async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{path}"), expire_on_commit=False), ids
+
+
+def test_async_validation_shares_the_cache(tmp_path, asyncpg_binds):
+    sessions, (user_id, session_id) = async_sessions(tmp_path)
+    refused = asyncpg_binds(sessions.kw["bind"].sync_engine)
+    validator = SessionValidator(ttl_seconds=60, max_entries=10)
+
+    async def run():
+        async with sessions() as db:
+            return [await validator.avalidate(db, user_id, session_id),
+                    await validator.avalidate(db, user_id, session_id),
+                    await validator.avalidate(db, session_id, session_id)]
+
+    assert asyncio.run(run()) == [True, True, False]
+    assert (validator.hits, validator.misses, validator.rejected) == (1, 2, 1)
+    # expires_at is compared with naive UTC, which asyncpg can encode
+    assert refused == []
+
+
+def test_dependency_reads_ids_from_query_or_body(tmp_path, monkeypatch):
+    sessions, (user_id, session_id) = async_sessions(tmp_path)
+    monkeypatch.setattr(session_service, "session_validator", SessionValidator(ttl_seconds=60, max_entries=10))
+    app = FastAPI()
+
+    @app.get("/things/{user_id}", dependencies=[Depends(require_valid_session)])
+    def read(user_id: str, session_id: str):
+        return {"ok": True}
+
+    @app.post("/things", dependencies=[Depends(require_valid_session)])
+    def write(body: Body):
+        return {"user_id": body.user_id}
+
+    async def override_get_async_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    client = TestClient(app)
+    ids = {"user_id": str(user_id), "session_id": str(session_id)}
+
+    assert client.get(f"/things/{user_id}", params={"session_id": ids["session_id"]}).status_code == 200
+    assert client.post("/things", json=ids).json() == {"user_id": ids["user_id"]}
+    assert client.post("/things", json=dict(ids, session_id="not-a-uuid")).status_code == 400
+    assert client.get(f"/things/{user_id}", params={"session_id": str(user_id)}).status_code == 400